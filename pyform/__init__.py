@@ -7,3 +7,6 @@ __version__ = get_versions()["version"]
 del get_versions
 
 from pyform.returnseries import ReturnSeries, CashSeries
+from pyform.config import get_option, set_option
+from pyform.returnpanel import ReturnPanel
+from pyform.util.calendar import Calendar
@@ -1,3 +1,4 @@
 # flake8: noqa
 
 from pyform.analysis.returns import table_calendar_return
+from pyform.analysis.peers import rank_peers
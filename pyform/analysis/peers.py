@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Union
+
+# group of each fund: a Series or dict keyed by fund name, or one label per column
+Groups = Union[pd.Series, Dict, Sequence]
+
+
+def _group_codes(columns: pd.Index, groups: Optional[Groups]) -> np.ndarray:
+    """Gets the group of each column as an integer code, -1 for no group."""
+
+    if groups is None:
+        return np.zeros(len(columns), dtype=np.int64)
+
+    if isinstance(groups, dict):
+        groups = pd.Series(groups)
+
+    if isinstance(groups, pd.Series):
+        labels = groups.reindex(columns)
+    else:
+        labels = pd.Series(list(groups))
+        if len(labels.index) != len(columns):
+            raise ValueError(
+                "Groups should have one label per column: "
+                f"columns={len(columns)}, groups={len(labels.index)}"
+            )
+
+    codes, _ = pd.factorize(labels)
+
+    return codes.astype(np.int64)
+
+
+def _rank_chunk(
+    values: np.ndarray, codes: np.ndarray, ascending: bool, method: str, pct: bool
+) -> np.ndarray:
+    """Ranks each row of values within the groups of columns, in one sort."""
+
+    rows, cols = values.shape
+    num_groups = codes.max() + 1
+
+    # sort every row by group, then by value, with missing values last
+    key = values if ascending else -values
+    order = np.lexsort((key, np.broadcast_to(codes, key.shape)), axis=-1)
+    key = np.take_along_axis(key, order, axis=1)
+    group = codes[order]
+
+    # position within the group, groups take the same columns on every row
+    starts = np.searchsorted(np.sort(codes), np.arange(num_groups))
+    ordinal = np.arange(cols) - starts[group]
+
+    # runs of tied values share a rank, and never span rows or groups
+    new_run = np.ones((rows, cols), dtype=bool)
+    new_run[:, 1:] = (key[:, 1:] != key[:, :-1]) | (group[:, 1:] != group[:, :-1])
+
+    run = np.cumsum(new_run.ravel()) - 1
+    first = ordinal.ravel()[new_run.ravel()][run]
+
+    if method == "average":
+        ranks = first + (np.bincount(run)[run] - 1) / 2 + 1
+    else:
+        ranks = first + 1.0
+
+    ranks = ranks.reshape(rows, cols)
+    valid = ~np.isnan(key)
+
+    if pct:
+        flat = np.arange(rows)[:, None] * num_groups + group
+        counts = np.bincount(
+            flat.ravel(), weights=valid.ravel(), minlength=rows * num_groups
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ranks = ranks / counts[flat]
+
+    ranks[~valid] = np.nan
+
+    result = np.empty((rows, cols))
+    np.put_along_axis(result, order, ranks, axis=1)
+
+    return result
+
+
+def rank_peers(
+    metric: pd.DataFrame,
+    groups: Optional[Groups] = None,
+    ascending: Optional[bool] = False,
+    method: Optional[str] = "average",
+    pct: Optional[bool] = False,
+    chunksize: Optional[int] = 256,
+) -> pd.DataFrame:
+    """Ranks funds against their peers on each date
+
+    Takes a (dates x funds) metric matrix, e.g. trailing returns or rolling Sharpe
+    ratios of a universe from ``ReturnPanel``, and ranks each fund within its
+    group on every date. Each block of dates is ranked with one sort along
+    the fund axis, so memory stays bounded by ``chunksize`` rows at a time.
+
+    Args:
+        metric: metric of each fund, one row per date and one column per fund.
+            Missing values are not ranked.
+        groups: peer group of each fund, as a Series or dict keyed by fund name,
+            or one label per column. Funds without a group are not ranked.
+            Defaults to None, which ranks all funds in one group.
+        ascending: whether the lowest value ranks first, e.g. for volatility.
+            Defaults to False, i.e. the highest value ranks first.
+        method: {'average', 'min'}. rank of tied values, 'average' is the same
+            as pandas, 'min' gives all of them the best rank. Defaults to
+            "average".
+        pct: whether to return percentile ranks, i.e. rank divided by the
+            number of ranked funds in the group, from above 0 for the first to 1
+            for the last. Defaults to False.
+        chunksize: number of dates ranked at a time. Defaults to 256.
+
+    Raises:
+        ValueError: when method is not supported, or groups do not match the
+            columns
+
+    Returns:
+        pd.DataFrame: rank of each fund on each date, starting from 1, with the
+            same index and columns as metric
+    """
+
+    if method not in ["average", "min"]:
+        raise ValueError("Method should be one of 'average' or 'min'")
+
+    codes = _group_codes(metric.columns, groups)
+    values = metric.to_numpy(dtype=np.float64)
+
+    # funds without a group form a group of their own, with nothing to rank
+    values = np.where(codes >= 0, values, np.nan)
+    codes = codes + 1
+
+    result = np.empty(values.shape)
+
+    if values.size > 0:
+        for start in range(0, values.shape[0], chunksize):
+            chunk = slice(start, start + chunksize)
+            result[chunk] = _rank_chunk(values[chunk], codes, ascending, method, pct)
+
+    return pd.DataFrame(result, index=metric.index, columns=metric.columns)
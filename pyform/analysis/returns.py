@@ -1,10 +1,14 @@
-import calendar
+from calendar import month_abbr
 import pandas as pd
+from typing import Optional
 from pyform import ReturnSeries
+from pyform.util.calendar import Calendar
 
 
 def table_calendar_return(
-    return_series: ReturnSeries, use_month_abbr: bool = True
+    return_series: ReturnSeries,
+    use_month_abbr: bool = True,
+    calendar: Optional[Calendar] = None,
 ) -> pd.DataFrame:
     """Create calendar like monthly return table
 
@@ -12,11 +16,22 @@ def table_calendar_return(
         return_series: A return series. Should be of minimum monthly frequency
         use_month_abbr: Whether to use 3 letter month abbreviations instead of numerical
           month. Defaults to True.
+        calendar: A calendar with years, e.g. fiscal months or a 4-4-5 calendar, to
+          tabulate the returns of its periods instead of calendar months. Periods
+          are numbered within each year. Defaults to None.
+
+    Raises:
+        ValueError: when calendar does not have years
 
     Returns:
-        pd.DataFrame: DataFrame with columns: Year, Jan, Feb, ..., Dec, Total
+        pd.DataFrame: DataFrame with columns: Year, Jan, Feb, ..., Dec, Total. With
+          a calendar: Year, 1, 2, ..., Total, where Year is the year the (fiscal)
+          year ends in.
     """
 
+    if calendar is not None:
+        return _table_period_return(return_series, calendar)
+
     # create monthly and annual returns for output rows
     monthly = return_series.to_month()
     annual = return_series.to_year()
@@ -37,7 +52,36 @@ def table_calendar_return(
 
     if use_month_abbr:
         months = [*range(1, 13)]
-        month_abbr_map = {month: calendar.month_abbr[month] for month in months}
+        month_abbr_map = {month: month_abbr[month] for month in months}
         output = output.rename(columns=month_abbr_map)
 
     return output
+
+
+def _table_period_return(
+    return_series: ReturnSeries, calendar: Calendar
+) -> pd.DataFrame:
+    """Create calendar like return table, for the periods of a calendar"""
+
+    if calendar.years is None:
+        raise ValueError(f"Calendar should have years: calendar={calendar}")
+
+    periods = return_series.to_period(calendar, "geometric")
+    annual = return_series.to_period(calendar.years, "geometric")
+
+    # year of each period, and the number of the period within the year
+    year_ids = calendar.years.bucket_ids(periods.index)
+    first = calendar.edges.searchsorted(calendar.years.edges[year_ids], side="right")
+
+    periods["Year"] = calendar.years.labels[year_ids].year
+    periods["Period"] = calendar.bucket_ids(periods.index) - first + 2
+    annual["Year"] = annual.index.year
+
+    # Pivot period data
+    periods = periods.pivot(index="Year", columns="Period", values=periods.columns[0])
+    periods.columns.name = None
+
+    # Rename annual column, and merge with periods
+    annual = annual.rename(columns={annual.columns[0]: "Total"})
+
+    return periods.merge(annual, how="left", on="Year")
@@ -0,0 +1,371 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+import os
+import time
+import pickle
+import hashlib
+import sqlite3
+import inspect
+import contextlib
+import threading
+import functools
+import multiprocessing.util
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from pyform.config import get_option
+
+# cache of the process, recreated when the cache options change
+_cache = dict()
+
+
+class ResultCache:
+    """A persistent cache of results, stored in a sqlite database.
+
+    Results are pickled and stored by key. When the stored results grow beyond
+    ``max_size`` bytes, the least recently used ones are evicted. Each process and
+    thread opens its own connection, and writes are serialized by sqlite, so
+    worker processes can share one cache file safely.
+
+    Lookups only read the database, so readers in different processes do not
+    wait on each other. Hits, misses and access times are counted in memory, and
+    written in one batch with the next result stored, every ``flush_every``
+    lookups, or when the process exits.
+
+    Args:
+        path: path to the sqlite database file, created if it does not exist
+        max_size: maximum total size of stored results, in bytes.
+            Defaults to 1GB.
+    """
+
+    # lookups counted in memory before they are written
+    flush_every = 100
+
+    def __init__(self, path: str, max_size: int = 2 ** 30):
+
+        self.path = path
+        self.max_size = max_size
+        self._local = threading.local()
+
+        # lookups not written yet, of the process they were counted in
+        self._lock = threading.Lock()
+        self._reads = self._new_reads()
+
+        # forked worker processes drop finalizers of the parent, register again
+        self._flush_at_exit()
+        multiprocessing.util.register_after_fork(self, ResultCache._flush_at_exit)
+
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, accessed REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats ("
+                "name TEXT PRIMARY KEY, value INTEGER)"
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO stats VALUES (?, 0)",
+                [("hits",), ("misses",), ("evictions",)],
+            )
+
+    def _flush_at_exit(self):
+        """Writes lookups not written yet when the process exits."""
+
+        multiprocessing.util.Finalize(None, self.flush, exitpriority=10)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Gets the connection of the current process and thread, connections are
+        not shared with forked processes.
+        """
+
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Opens a write transaction, which holds the database lock until it is
+        committed, so concurrent writers do not interleave.
+        """
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        conn.execute("COMMIT")
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Gets a result from the cache.
+
+        Args:
+            key: key of the result
+
+        Returns:
+            Tuple[bool, Any]: whether the result is found, and the result
+        """
+
+        row = (
+            self._connect()
+            .execute("SELECT value FROM entries WHERE key = ?", (key,))
+            .fetchone()
+        )
+
+        with self._lock:
+
+            reads = self._get_reads()
+
+            if row is None:
+                reads["misses"] += 1
+            else:
+                reads["hits"] += 1
+                reads["accessed"][key] = time.time()
+
+            due = reads["hits"] + reads["misses"] >= self.flush_every
+
+        if due:
+            self.flush()
+
+        if row is None:
+            return False, None
+
+        return True, pickle.loads(row[0])
+
+    @staticmethod
+    def _new_reads() -> Dict:
+        """Creates an empty count of lookups."""
+
+        return {"pid": os.getpid(), "hits": 0, "misses": 0, "accessed": dict()}
+
+    def _get_reads(self) -> Dict:
+        """Gets lookups not written yet. A forked process starts from none."""
+
+        if self._reads["pid"] != os.getpid():
+            self._reads = self._new_reads()
+
+        return self._reads
+
+    def _take_reads(self) -> Dict:
+        """Takes lookups not written yet, to write them."""
+
+        with self._lock:
+            reads = self._get_reads()
+            self._reads = self._new_reads()
+
+        return reads
+
+    def _write_reads(self, conn: sqlite3.Connection, reads: Dict):
+        """Writes counts and access times of lookups, in a write transaction."""
+
+        conn.executemany(
+            "UPDATE entries SET accessed = MAX(accessed, ?) WHERE key = ?",
+            [(accessed, key) for key, accessed in reads["accessed"].items()],
+        )
+        conn.executemany(
+            "UPDATE stats SET value = value + ? WHERE name = ?",
+            [(reads["hits"], "hits"), (reads["misses"], "misses")],
+        )
+
+    def flush(self):
+        """Writes counts and access times of lookups made so far."""
+
+        reads = self._take_reads()
+
+        if reads["hits"] == 0 and reads["misses"] == 0:
+            return
+
+        with self._transaction() as conn:
+            self._write_reads(conn, reads)
+
+    def put(self, key: str, value: Any):
+        """Stores a result in the cache, evicting least recently used results when
+        the cache is full. Results larger than the cache are not stored.
+
+        Args:
+            key: key of the result
+            value: result, which should be picklable
+        """
+
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if len(blob) > self.max_size:
+            log.info(f"Result is larger than cache: key={key}, size={len(blob)}")
+            return
+
+        reads = self._take_reads()
+
+        with self._transaction() as conn:
+
+            # access times are written first, so eviction sees recent lookups
+            self._write_reads(conn, reads)
+
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+
+            excess = conn.execute("SELECT SUM(size) FROM entries").fetchone()[0]
+            excess -= self.max_size
+
+            if excess <= 0:
+                return
+
+            evicted = []
+            for old_key, size in conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed"
+            ):
+                if excess <= 0:
+                    break
+                evicted.append((old_key,))
+                excess -= size
+
+            conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+            conn.execute(
+                "UPDATE stats SET value = value + ? WHERE name = 'evictions'",
+                (len(evicted),),
+            )
+
+    def clear(self):
+        """Removes all results and resets statistics"""
+
+        self._take_reads()
+
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("UPDATE stats SET value = 0")
+
+    def stats(self) -> Dict[str, int]:
+        """Gets statistics of the cache, shared by all processes using it.
+
+        Returns:
+            Dict[str, int]: statistics of the cache
+
+                * hits: number of results served from the cache
+                * misses: number of results not found in the cache
+                * evictions: number of results evicted to make room
+                * entries: number of results stored
+                * size: total size of results stored, in bytes
+        """
+
+        self.flush()
+
+        conn = self._connect()
+        stats = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        entries, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+
+        return {**stats, "entries": entries, "size": size}
+
+
+def get_cache() -> Optional[ResultCache]:
+    """Gets the result cache set by the 'cache' and 'cache_size' options.
+
+    Returns:
+        Optional[ResultCache]: the result cache, None if caching is disabled
+    """
+
+    path, max_size = get_option("cache"), get_option("cache_size")
+
+    if path is None:
+        return None
+
+    if _cache.get("options") != (path, max_size):
+        _cache["cache"] = ResultCache(path, max_size)
+        _cache["options"] = (path, max_size)
+
+    return _cache["cache"]
+
+
+def call_arguments(func: Callable, obj, args: tuple, kwargs: dict) -> Dict:
+    """Binds the arguments of a method call, including default ones.
+
+    Returns:
+        Dict: value of each argument, by name, without self
+    """
+
+    bound = inspect.signature(func).bind(obj, *args, **kwargs)
+    bound.apply_defaults()
+
+    return {k: v for k, v in bound.arguments.items() if k != "self"}
+
+
+def result_key(func: Callable, obj, arguments: Dict) -> str:
+    """Computes the cache key of a method call on a return series.
+
+    The key covers the package version, the method, the series, its benchmarks
+    and risk free rates, each by the fingerprint of its data and its date range,
+    all arguments including default ones, and the 'result_type', 'backend' and
+    'sessions_per_year' options, which change the type, rounding and
+    annualization of results.
+
+    Args:
+        func: method called
+        obj: the pyform.ReturnSeries the method is called on
+        arguments: arguments of the call, as bound by ``call_arguments``
+
+    Returns:
+        str: cache key
+    """
+
+    import pyform
+
+    parts = (
+        pyform.__version__,
+        func.__qualname__,
+        obj.name,
+        obj.key,
+        sorted((name, bm.key) for name, bm in obj.benchmark.items()),
+        sorted((name, rf.key) for name, rf in obj.risk_free.items()),
+        sorted(arguments.items()),
+        get_option("result_type"),
+        get_option("backend"),
+        get_option("sessions_per_year"),
+    )
+
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def cached(func: Callable) -> Callable:
+    """Decorates a method of pyform.ReturnSeries, so its results are served from
+    the result cache when the 'cache' option is set.
+
+    Calls with ``seed=None`` are random, and are not cached.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+
+        cache = get_cache()
+
+        if cache is None:
+            return func(self, *args, **kwargs)
+
+        arguments = call_arguments(func, self, args, kwargs)
+
+        if "seed" in arguments and arguments["seed"] is None:
+            return func(self, *args, **kwargs)
+
+        key = result_key(func, self, arguments)
+        found, result = cache.get(key)
+
+        if not found:
+            result = func(self, *args, **kwargs)
+            cache.put(key, result)
+
+        return result
+
+    return wrapper
@@ -0,0 +1,84 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+from typing import Any
+
+# Package wide options, and their default values
+_options = {
+    "backend": "numpy",
+    "cache": None,
+    "cache_size": 2 ** 30,
+    "result_type": "frame",
+    "sessions_per_year": 252,
+}
+
+# Allowed values for options that only accept a fixed set of values
+_choices = {
+    "backend": ["numpy", "numba"],
+    "result_type": ["frame", "table"],
+}
+
+
+def get_option(key: str) -> Any:
+    """Gets the value of a package option.
+
+    Args:
+        key: name of the option
+
+    Raises:
+        KeyError: when option does not exist
+
+    Returns:
+        Any: value of the option
+    """
+
+    try:
+        return _options[key]
+    except KeyError:
+        raise KeyError(f"Option does not exist: key={key}")
+
+
+def set_option(key: str, value: Any):
+    """Sets the value of a package option.
+
+    Available options are:
+
+        * backend: {'numpy', 'numba'}. Backend used to run the compounding,
+            cumulative and rolling kernels. 'numba' requires the optional
+            dependency numba, and falls back to 'numpy' when numba is not
+            installed. Defaults to 'numpy'.
+        * cache: path to a sqlite file to cache results of ReturnSeries ``get_*``
+            methods in. Results are keyed by the data and date range of the
+            series, its benchmarks and risk free rates, and all arguments, so
+            unchanged inputs are served from the cache across runs and processes.
+            Defaults to None, which disables caching.
+        * cache_size: maximum size of cached results, in bytes. Least recently
+            used results are evicted beyond it. Defaults to 1GB.
+        * result_type: {'frame', 'table'}. Type of the long format results of
+            ReturnSeries ``get_*`` methods. 'table' returns a
+            ``pyform.result.ResultTable``, which concatenates cheaply across many
+            series and converts to the DataFrame with ``to_frame``.
+            Defaults to 'frame'.
+        * sessions_per_year: number of trading sessions in a year, used to
+            annualize intraday series. Defaults to 252.
+
+    Args:
+        key: name of the option
+        value: value of the option
+
+    Raises:
+        KeyError: when option does not exist
+        ValueError: when value is not allowed for the option
+    """
+
+    if key not in _options:
+        raise KeyError(f"Option does not exist: key={key}")
+
+    if key in _choices and value not in _choices[key]:
+        raise ValueError(
+            f"Option value should be one of {_choices[key]}: key={key}, value={value}"
+        )
+
+    log.info(f"Setting option. key={key}, value={value}")
+    _options[key] = value
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Sequence
+from pyform.config import get_option
+
+
+def _as_column(values: Any) -> Any:
+    """Converts a column of results to a numpy array, with the dtype pandas would
+    give it. Scalars are kept as is, and shared by all rows.
+    """
+
+    if np.ndim(values) == 0:
+        return values
+
+    array = np.asarray(values)
+
+    if array.dtype.kind == "U":
+        return array.astype(object)
+
+    if array.dtype == object and any(
+        isinstance(value, (pd.Timestamp, np.datetime64)) for value in array
+    ):
+        return pd.to_datetime(array).to_numpy()
+
+    return array
+
+
+class ResultTable:
+    """Long format results, held column by column in numpy arrays.
+
+    Columns with the same value on every row, such as the field and the meta data
+    set by arguments, are held as one scalar. Tables of many series concatenate
+    with one array concatenation per column, and the pandas DataFrame is only
+    built when ``to_frame`` is called.
+
+    Args:
+        columns: values of each column, by column name. Either a sequence with one
+            value per row, or a scalar shared by all rows.
+    """
+
+    def __init__(self, columns: Dict[str, Any]):
+
+        self._columns = {name: _as_column(values) for name, values in columns.items()}
+
+        lengths = {len(v) for v in self._columns.values() if np.ndim(v) == 1}
+
+        if len(lengths) > 1:
+            raise ValueError(f"Columns should have the same length: lengths={lengths}")
+
+        self._length = lengths.pop() if lengths else 0
+
+    def __len__(self) -> int:
+
+        return self._length
+
+    def __repr__(self) -> str:
+
+        return f"ResultTable(rows={len(self)}, columns={self.columns})"
+
+    @property
+    def columns(self) -> List[str]:
+        """List[str]: names of the columns"""
+
+        return list(self._columns.keys())
+
+    def column(self, name: str) -> np.ndarray:
+        """Gets the values of a column.
+
+        Args:
+            name: name of the column
+
+        Returns:
+            np.ndarray: one value per row
+        """
+
+        values = self._columns[name]
+
+        if np.ndim(values) == 0:
+            return np.full(len(self), values, dtype=object if values is None else None)
+
+        return values
+
+    @classmethod
+    def concat(cls, tables: Sequence["ResultTable"]) -> "ResultTable":
+        """Concatenates tables, e.g. results of many series.
+
+        Columns are ordered by first appearance. A column missing from a table is
+        NaN on its rows, and a scalar column stays scalar if it has the same value
+        in all tables.
+
+        Args:
+            tables: tables to concatenate
+
+        Returns:
+            ResultTable: concatenated table
+        """
+
+        tables = [table for table in tables if len(table) > 0]
+        names = list(dict.fromkeys(name for t in tables for name in t.columns))
+        columns = dict()
+
+        for name in names:
+
+            values = [t._columns.get(name, np.nan) for t in tables]
+
+            if all(np.ndim(v) == 0 for v in values) and len(set(map(repr, values))) < 2:
+                columns[name] = values[0]
+                continue
+
+            parts = [
+                t.column(name) if name in t._columns else np.full(len(t), np.nan)
+                for t in tables
+            ]
+
+            if len({part.dtype for part in parts}) > 1:
+                parts = [part.astype(object) for part in parts]
+
+            columns[name] = np.concatenate(parts)
+
+        result = cls(columns)
+        result._length = sum(len(t) for t in tables)
+
+        return result
+
+    def to_frame(self) -> pd.DataFrame:
+        """Converts the table to a long format pandas DataFrame, with one row per
+        result, the same as returned by the ``get_*`` methods of ReturnSeries.
+
+        Returns:
+            pd.DataFrame: results
+        """
+
+        return pd.DataFrame(
+            data={name: self.column(name) for name in self.columns},
+            index=pd.RangeIndex(len(self)),
+        )
+
+
+def make_result(data: Dict[str, Any]):
+    """Makes the result of a ``get_*`` method, in the type set by the
+    'result_type' option.
+
+    Args:
+        data: values of each column, by column name, as lists or scalars
+
+    Returns:
+        Union[pd.DataFrame, ResultTable]: results
+    """
+
+    if get_option("result_type") == "table":
+        return ResultTable(data)
+
+    return pd.DataFrame(data=data)
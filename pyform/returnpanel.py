@@ -0,0 +1,403 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Union
+from pyform.timeseries import TimeSeries
+from pyform.returnseries import ReturnSeries
+from pyform.returns.compound import panel_to_period
+from pyform.returns.correlation import calc_blocked_matrix
+from pyform.returns.portfolio import Weights, calc_portfolio
+from pyform.returns.tail import (
+    calc_var,
+    calc_cvar,
+    calc_rolling_var,
+    calc_rolling_cvar,
+)
+from pyform.returns.trailing import (
+    TRAILING_HORIZONS,
+    Horizon,
+    calc_trailing_returns,
+)
+from pyform.util.calendar import Calendar
+from pyform.util.freq import is_lower_freq
+
+
+class ReturnPanel(TimeSeries):
+    """A panel of return series that's datetime indexed and has one column of
+    returns data per series.
+
+    Series do not need to cover the same dates, dates a series has no data for
+    are NaN.
+
+       Args:
+           df: a dataframe with datetime index, or a 'date'/'datetime' column, and
+               one column per series
+    """
+
+    def __init__(self, df: pd.DataFrame):
+
+        super().__init__(df)
+
+        self.names = self.series.columns.tolist()
+
+    @classmethod
+    def from_series(cls, series: List[ReturnSeries]):
+        """Creates a return panel from return series
+
+        Args:
+            series: return series to put in the panel. Each series is named by its
+                ``name``.
+
+        Returns:
+            pyform.ReturnPanel: a ReturnPanel object
+        """
+
+        df = pd.concat(
+            [s.series.iloc[:, 0].rename(s.name) for s in series], axis=1, sort=True
+        )
+
+        return cls(df)
+
+    @classmethod
+    def from_files(
+        cls,
+        paths: Union[str, List[str]],
+        workers: Optional[int] = None,
+        executor: Optional[str] = None,
+        sheet_name: Union[str, int] = 0,
+        date_format: Optional[str] = None,
+        dtype: Optional[Dict] = None,
+        usecols: Optional[List[str]] = None,
+    ):
+        """Creates a return panel from many csv and Excel files, read concurrently
+
+        Each file holds one return series, see ``ReturnSeries.read_many``. Files
+        that cannot be read are logged and skipped.
+
+        Args:
+            paths: a glob pattern, e.g. "data/*.csv", or a list of paths
+            workers: number of threads or processes reading files. Defaults to
+                None, which uses the default of ``concurrent.futures``.
+            executor: {'thread', 'process'}. Defaults to None, which uses threads
+                when all files are csv files, and processes otherwise.
+            sheet_name: the index or name of the sheet to read in Excel files.
+                Defaults to 0.
+            date_format: format of the dates, e.g. "%Y-%m-%d". Defaults to None,
+                which detects the format from a sample of the dates of each file.
+            dtype: data type of columns, e.g. {"SPY": "float64"}. Defaults to None,
+                which infers data types.
+            usecols: columns to read, including the date column. Defaults to None,
+                which reads all columns.
+
+        Returns:
+            pyform.ReturnPanel: a ReturnPanel object
+        """
+
+        series = ReturnSeries.read_many(
+            paths, workers, executor, sheet_name, date_format, dtype, usecols
+        )
+
+        return cls.from_series(list(series.values()))
+
+    def get_series(self, name: str) -> ReturnSeries:
+        """Gets one series of the panel
+
+        Args:
+            name: name of the series
+
+        Returns:
+            pyform.ReturnSeries: the series, over the dates it has data for
+        """
+
+        return ReturnSeries(self.series[[name]].dropna(), name)
+
+    def to_period(self, freq: Union[str, Calendar], method: str) -> pd.DataFrame:
+        """Converts all return series to a different (and lower) frequency.
+
+        Args:
+            freq: frequency to convert the return series to.
+                Available options can be found `here <https://tinyurl.com/t78g6bh>`_.
+                A ``pyform.Calendar`` converts to its periods.
+            method: compounding method when converting to lower frequency.
+
+                * 'geometric': geometric compounding ``(1+r1) * (1+r2) - 1``
+                * 'arithmetic': arithmetic compounding ``r1 + r2``
+                * 'continuous': continous compounding ``exp(r1+r2) - 1``
+
+        Returns:
+            pd.DataFrame: return series in desired frequency. Periods a series has
+                no returns for are NaN.
+        """
+
+        if isinstance(freq, Calendar):
+            return freq.to_period(self.series, method, empty=np.nan)
+
+        # Use businessness days for all return series
+        if freq == "D":
+            freq = "B"
+
+        if freq == self.freq:
+            return self.series
+
+        # make sure it's not converting to a higher frequency
+        try:
+            assert is_lower_freq(freq, self.freq)
+        except AssertionError:
+            raise ValueError(
+                "Cannot convert to higher frequency. "
+                f"target={freq}, current={self.freq}"
+            )
+
+        return panel_to_period(self.series, freq, method)
+
+    def get_corr_matrix(
+        self,
+        freq: Optional[str] = "M",
+        compound_method: Optional[str] = "geometric",
+        block_size: Optional[int] = 1000,
+        workers: Optional[int] = None,
+        out: Optional[str] = None,
+        min_periods: Optional[int] = 2,
+    ) -> pd.DataFrame:
+        """Calculates pearson correlation matrix of all series in the panel
+
+        For every pair of series, only periods where both have returns are used.
+        The matrix is computed tile by tile, so memory stays bounded for large
+        panels, see ``pyform.returns.correlation.calc_blocked_matrix``.
+
+        Args:
+            freq: Returns are converted to the same frequency before correlation
+                is compuated. Defaults to "M".
+            compound_method: {'geometric', 'arithmetic', 'continuous'}.
+                Defaults to "geometric".
+            block_size: number of series in each tile. Defaults to 1000.
+            workers: number of processes to compute tiles with. Defaults to None,
+                which computes all tiles in the current process.
+            out: path of a file to write the matrix to, as a memory mapped array.
+                Defaults to None, which keeps the matrix in memory.
+            min_periods: minimum number of common periods for a pair to have a
+                correlation. Defaults to 2.
+
+        Returns:
+            pd.DataFrame: correlation matrix, with series names as index and columns
+        """
+
+        ret = self.to_period(freq=freq, method=compound_method)
+        matrix = calc_blocked_matrix(
+            ret,
+            kind="correlation",
+            block_size=block_size,
+            workers=workers,
+            out=out,
+            min_periods=min_periods,
+        )
+
+        return pd.DataFrame(matrix, index=self.names, columns=self.names, copy=False)
+
+    def get_cov_matrix(
+        self,
+        freq: Optional[str] = "M",
+        compound_method: Optional[str] = "geometric",
+        block_size: Optional[int] = 1000,
+        workers: Optional[int] = None,
+        out: Optional[str] = None,
+        min_periods: Optional[int] = 2,
+    ) -> pd.DataFrame:
+        """Calculates covariance matrix of all series in the panel
+
+        For every pair of series, only periods where both have returns are used.
+        The matrix is computed tile by tile, so memory stays bounded for large
+        panels, see ``pyform.returns.correlation.calc_blocked_matrix``.
+
+        Args:
+            freq: Returns are converted to the same frequency before covariance
+                is compuated. Defaults to "M".
+            compound_method: {'geometric', 'arithmetic', 'continuous'}.
+                Defaults to "geometric".
+            block_size: number of series in each tile. Defaults to 1000.
+            workers: number of processes to compute tiles with. Defaults to None,
+                which computes all tiles in the current process.
+            out: path of a file to write the matrix to, as a memory mapped array.
+                Defaults to None, which keeps the matrix in memory.
+            min_periods: minimum number of common periods for a pair to have a
+                covariance. Defaults to 2.
+
+        Returns:
+            pd.DataFrame: covariance matrix, with series names as index and columns
+        """
+
+        ret = self.to_period(freq=freq, method=compound_method)
+        matrix = calc_blocked_matrix(
+            ret,
+            kind="covariance",
+            block_size=block_size,
+            workers=workers,
+            out=out,
+            min_periods=min_periods,
+        )
+
+        return pd.DataFrame(matrix, index=self.names, columns=self.names, copy=False)
+
+    def get_trailing_table(
+        self,
+        as_of: Optional[str] = None,
+        horizons: Optional[Sequence[Union[str, Horizon]]] = TRAILING_HORIZONS,
+        method: Optional[str] = "geometric",
+    ) -> pd.DataFrame:
+        """Computes trailing returns of all series over many horizons, as of a date
+
+        All horizons of all series are evaluated from one prefix sum array, see
+        ``pyform.returns.trailing.calc_trailing_returns``.
+
+        Args:
+            as_of: date the horizons end on. Defaults to None, which uses the end
+                date of the panel.
+            horizons: labels of the horizons, e.g. '3M', 'YTD', '5Y', 'ITD', or
+                horizons resolved with ``pyform.returns.trailing.resolve_horizons``.
+                Horizons longer than a year are annualized. Defaults to
+                ["1M", "3M", "YTD", "1Y", "3Y", "5Y", "10Y", "ITD"].
+            method: method to use when compounding return. Defaults to "geometric".
+
+        Returns:
+            pd.DataFrame: trailing returns, in decimals, with one row per series and
+                one column per horizon. A horizon is missing for a series that
+                started after the horizon.
+        """
+
+        if as_of is None:
+            as_of = self.end
+
+        return calc_trailing_returns(self.series, as_of, horizons, method)
+
+    def get_var(
+        self,
+        freq: Optional[str] = None,
+        level: Optional[float] = 0.95,
+        compound_method: Optional[str] = "geometric",
+    ) -> pd.Series:
+        """Computes historical value at risk of all series in the panel
+
+        Args:
+            freq: Returns are converted to the same frequency before value at risk
+                is computed. Defaults to None, which uses the frequency of the panel.
+            level: confidence level. Defaults to 0.95.
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+
+        Returns:
+            pd.Series: value at risk of each series, as a return in decimals,
+                indexed by series name
+        """
+
+        ret = self.series if freq is None else self.to_period(freq, compound_method)
+
+        return calc_var(ret, level).rename("value at risk")
+
+    def get_cvar(
+        self,
+        freq: Optional[str] = None,
+        level: Optional[float] = 0.95,
+        compound_method: Optional[str] = "geometric",
+    ) -> pd.Series:
+        """Computes historical conditional value at risk of all series in the panel
+
+        Args:
+            freq: Returns are converted to the same frequency before conditional
+                value at risk is computed. Defaults to None, which uses the
+                frequency of the panel.
+            level: confidence level. Defaults to 0.95.
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+
+        Returns:
+            pd.Series: conditional value at risk of each series, as a return in
+                decimals, indexed by series name
+        """
+
+        ret = self.series if freq is None else self.to_period(freq, compound_method)
+
+        return calc_cvar(ret, level).rename("conditional value at risk")
+
+    def get_rolling_var(
+        self,
+        window: Optional[int] = 252,
+        freq: Optional[str] = None,
+        level: Optional[float] = 0.95,
+        compound_method: Optional[str] = "geometric",
+    ) -> pd.DataFrame:
+        """Computes rolling historical value at risk of all series in the panel
+
+        Args:
+            window: the rolling window. Defaults to 252.
+            freq: Returns are converted to the same frequency before value at risk
+                is computed. Defaults to None, which uses the frequency of the panel.
+            level: confidence level. Defaults to 0.95.
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+
+        Returns:
+            pd.DataFrame: rolling value at risk, one column per series. Windows a
+                series has missing returns in are NaN.
+        """
+
+        ret = self.series if freq is None else self.to_period(freq, compound_method)
+
+        return calc_rolling_var(ret, window, level)
+
+    def get_rolling_cvar(
+        self,
+        window: Optional[int] = 252,
+        freq: Optional[str] = None,
+        level: Optional[float] = 0.95,
+        compound_method: Optional[str] = "geometric",
+    ) -> pd.DataFrame:
+        """Computes rolling historical conditional value at risk of all series in the
+        panel
+
+        Args:
+            window: the rolling window. Defaults to 252.
+            freq: Returns are converted to the same frequency before conditional
+                value at risk is computed. Defaults to None, which uses the
+                frequency of the panel.
+            level: confidence level. Defaults to 0.95.
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+
+        Returns:
+            pd.DataFrame: rolling conditional value at risk, one column per series.
+                Windows a series has missing returns in are NaN.
+        """
+
+        ret = self.series if freq is None else self.to_period(freq, compound_method)
+
+        return calc_rolling_cvar(ret, window, level)
+
+    def get_portfolio(
+        self,
+        weights: Weights,
+        rebalance: Optional[Union[str, Calendar]] = None,
+        name: Optional[str] = "portfolio",
+    ) -> ReturnSeries:
+        """Combines series of the panel into a portfolio with drifting weights
+
+        See ``pyform.returns.portfolio.calc_portfolio``.
+
+        Args:
+            weights: target weights, adding up to 1. Either static weights, as a
+                dict or Series by series name, or a DataFrame schedule with one row
+                of weights per date they apply from.
+            rebalance: frequency to rebalance to the targets at, e.g. "M", "Q" or
+                "Y", or a ``pyform.Calendar``. Defaults to None, which only
+                rebalances on the dates of the weights schedule.
+            name: name of the portfolio. Defaults to "portfolio".
+
+        Returns:
+            pyform.ReturnSeries: returns of the portfolio
+        """
+
+        returns, _ = calc_portfolio(self.series, weights, rebalance)
+
+        return ReturnSeries(returns.rename(name).to_frame(), name)
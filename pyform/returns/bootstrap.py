@@ -0,0 +1,214 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+import math
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+from pyform.returns.kernels import log_compound
+from pyform.returns.metrics import annualize_ret
+
+
+def bootstrap_indices(
+    n: int,
+    samples: int,
+    block_size: Optional[float] = None,
+    method: str = "stationary",
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Builds the resample index matrix of a block bootstrap.
+
+    Blocks of consecutive periods are resampled, so serial correlation of returns
+    within a block is preserved.
+
+    Args:
+        n: number of periods in the series
+        samples: number of resamples
+        block_size: block size for 'block', mean block size for 'stationary'.
+            Defaults to None, which uses ``n ** (1 / 3)``.
+        method: {'stationary', 'block'}. Defaults to "stationary".
+
+            * stationary: stationary bootstrap of Politis and Romano. Blocks have
+                geometrically distributed lengths, and wrap around the end of the
+                series.
+            * block: moving block bootstrap, with blocks of a fixed size
+
+        seed: seed of the random number generator. Defaults to None.
+
+    Raises:
+        ValueError: when method is not supported
+
+    Returns:
+        np.ndarray: (samples, n) matrix of positions into the series
+    """
+
+    if method not in ["stationary", "block"]:
+        raise ValueError("Method should be one of 'stationary' or 'block'")
+
+    if block_size is None:
+        block_size = n ** (1 / 3)
+
+    rng = np.random.RandomState(seed)
+    positions = np.arange(n)
+
+    if method == "block":
+
+        size = min(max(int(round(block_size)), 1), n)
+        blocks = math.ceil(n / size)
+
+        starts = rng.randint(0, n - size + 1, size=(samples, blocks))
+        indices = starts[:, :, np.newaxis] + np.arange(size)
+
+        return indices.reshape(samples, -1)[:, :n]
+
+    # a new block starts at each period with probability 1 / block_size
+    new_block = rng.random_sample((samples, n)) < 1 / max(block_size, 1)
+    new_block[:, 0] = True
+    starts = rng.randint(0, n, size=(samples, n))
+
+    # position where the current block started, and where it started from
+    block_start = np.maximum.accumulate(np.where(new_block, positions, 0), axis=1)
+    origin = np.take_along_axis(starts, block_start, axis=1)
+
+    return (origin + positions - block_start) % n
+
+
+def calc_bootstrap_stats(
+    returns: np.ndarray,
+    indices: np.ndarray,
+    samples_per_year: float,
+    method: str = "geometric",
+    ddof: int = 1,
+    excess: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """Computes annualized return, volatility and Sharpe ratio of every resample,
+    with reductions along the resample axis.
+
+    Args:
+        returns: 1-d array of returns
+        indices: (samples, n) resample index matrix, see ``bootstrap_indices``
+        samples_per_year: number of samples per year, used for annualization
+        method: {'geometric', 'arithmetic', 'continuous'}. method used to
+            compound returns. Defaults to "geometric".
+        ddof: delta degrees of freedom of volatility. Defaults to 1.
+        excess: 1-d array of excess returns over the risk free rate, resampled
+            with the same indices as returns. Defaults to None, which uses
+            returns.
+
+    Returns:
+        Dict[str, np.ndarray]: statistic of every resample, keyed by
+            'annualized return', 'annualized volatility' and 'sharpe ratio'
+    """
+
+    years = indices.shape[1] / samples_per_year
+
+    def ann_ret(values):
+        # geometric compounding is done in log space, so it is a plain sum
+        if method == "geometric":
+            total = log_compound(values[indices], lambda logs: logs.sum(axis=1))
+        elif method == "arithmetic":
+            total = values[indices].sum(axis=1)
+        else:
+            total = np.expm1(values[indices].sum(axis=1))
+        return annualize_ret(total, years, method)
+
+    ann_vol = returns[indices].std(axis=1, ddof=ddof) * math.sqrt(samples_per_year)
+    ann_excess = ann_ret(returns if excess is None else excess)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = ann_excess / ann_vol
+
+    return {
+        "annualized return": ann_ret(returns),
+        "annualized volatility": ann_vol,
+        "sharpe ratio": sharpe,
+    }
+
+
+def _bootstrap_chunk(args) -> Dict[str, np.ndarray]:
+    """Computes statistics of one chunk of resamples, in a worker process."""
+
+    return calc_bootstrap_stats(*args)
+
+
+def calc_bootstrap_ci(
+    returns: np.ndarray,
+    samples_per_year: float,
+    method: str = "geometric",
+    ddof: int = 1,
+    excess: Optional[np.ndarray] = None,
+    samples: int = 1000,
+    block_size: Optional[float] = None,
+    bootstrap: str = "stationary",
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    chunk_size: int = 1000,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Computes percentile confidence intervals of annualized return, volatility
+    and Sharpe ratio by block bootstrap.
+
+    The resample index matrix is built once, and statistics are computed for
+    chunks of resamples at a time, optionally across processes.
+
+    Args:
+        returns: 1-d array of returns
+        samples_per_year: number of samples per year, used for annualization
+        method: {'geometric', 'arithmetic', 'continuous'}. method used to
+            compound returns. Defaults to "geometric".
+        ddof: delta degrees of freedom of volatility. Defaults to 1.
+        excess: 1-d array of excess returns over the risk free rate, for Sharpe
+            ratio. Defaults to None, which uses returns.
+        samples: number of resamples. Defaults to 1000.
+        block_size: (mean) block size, see ``bootstrap_indices``.
+        bootstrap: {'stationary', 'block'}. Defaults to "stationary".
+        confidence: confidence level of the intervals. Defaults to 0.95.
+        seed: seed of the random number generator. Defaults to None.
+        chunk_size: number of resamples computed at a time. Defaults to 1000.
+        workers: number of processes computing chunks. Defaults to None, which
+            computes all chunks in the current process.
+
+    Returns:
+        pd.DataFrame: one row per statistic, with columns
+
+            * value: statistic of the original series
+            * lower: lower bound of the confidence interval
+            * upper: upper bound of the confidence interval
+    """
+
+    returns = np.asarray(returns, dtype=np.float64)
+    if excess is not None:
+        excess = np.asarray(excess, dtype=np.float64)
+
+    n = returns.shape[0]
+    indices = bootstrap_indices(n, samples, block_size, bootstrap, seed)
+
+    chunks = [
+        (returns, indices[i : i + chunk_size], samples_per_year, method, ddof, excess)
+        for i in range(0, samples, chunk_size)
+    ]
+
+    if workers is None or workers <= 1 or len(chunks) == 1:
+        results = [_bootstrap_chunk(chunk) for chunk in chunks]
+    else:
+        log.info(f"Computing bootstrap. chunks={len(chunks)}, workers={workers}")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_bootstrap_chunk, chunks))
+
+    point = calc_bootstrap_stats(
+        returns, np.arange(n)[np.newaxis], samples_per_year, method, ddof, excess
+    )
+
+    tail = (1 - confidence) / 2 * 100
+    rows = dict()
+
+    for field in point.keys():
+        values = np.concatenate([result[field] for result in results])
+        lower, upper = np.nanpercentile(values, [tail, 100 - tail])
+        rows[field] = [point[field][0], lower, upper]
+
+    return pd.DataFrame.from_dict(
+        rows, orient="index", columns=["value", "lower", "upper"]
+    )
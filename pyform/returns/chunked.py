@@ -0,0 +1,374 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from pyform.returns.compound import _check_method, compound_values, series_to_period
+from pyform.returns.metrics import annualize_ret, calc_ann_vol
+from pyform.util.dataframe import detect_date_format, set_date_index
+from pyform.util.freq import (
+    calc_index_samples_per_year,
+    calc_timedelta_in_years,
+    infer_freq,
+)
+
+# a path to a csv file or binary store, or chunks of a time indexed dataframe
+Source = Union[str, Iterable[pd.DataFrame]]
+
+
+def iter_csv_chunks(
+    path: str,
+    chunksize: int = 1_000_000,
+    date_format: Optional[str] = None,
+    dtype: Optional[Dict] = None,
+    usecols: Optional[List[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Reads a csv file in chunks of rows, each with a datetime index.
+
+    The date format is detected once, from the first chunk, and used for the
+    rest of the file.
+
+    Args:
+        path: path to the csv file, with a 'date' or 'datetime' column
+        chunksize: number of rows in each chunk. Defaults to 1,000,000.
+        date_format: format of the dates, e.g. "%Y-%m-%d". Defaults to None, which
+            detects the format from the first chunk.
+        dtype: data type of columns, e.g. {"SPY": "float64"}. Defaults to None,
+            which infers data types.
+        usecols: columns to read, including the date column. Defaults to None,
+            which reads all columns.
+
+    Yields:
+        pd.DataFrame: chunk of the file
+    """
+
+    reader = pd.read_csv(path, chunksize=chunksize, dtype=dtype, usecols=usecols)
+
+    for chunk in reader:
+
+        if date_format is None:
+            for col in ["datetime", "date"]:
+                if col in chunk:
+                    date_format = detect_date_format(chunk[col])
+                    break
+
+        yield set_date_index(chunk, date_format)
+
+
+def csv_to_store(
+    path: str,
+    out: str,
+    chunksize: int = 1_000_000,
+    date_format: Optional[str] = None,
+    usecols: Optional[List[str]] = None,
+) -> np.memmap:
+    """Converts a csv file of returns to a binary store, chunk by chunk.
+
+    The store is a ``.npy`` file holding a structured array, with a 'datetime'
+    field and one float64 field per series. Reading it back with
+    ``iter_store_chunks`` skips text and date parsing, which dominates the cost of
+    reading large csv files.
+
+    Args:
+        path: path to the csv file, with a 'date' or 'datetime' column
+        out: path of the ``.npy`` file to write
+        chunksize: number of rows in each chunk. Defaults to 1,000,000.
+        date_format: format of the dates, e.g. "%Y-%m-%d". Defaults to None, which
+            detects the format from the first chunk.
+        usecols: columns to read, including the date column. Defaults to None,
+            which reads all columns.
+
+    Returns:
+        np.memmap: the store, as a memory mapped structured array
+    """
+
+    # count rows first, from the first column only, so the store can be sized
+    rows = sum(
+        len(chunk.index)
+        for chunk in pd.read_csv(path, chunksize=chunksize, usecols=[0])
+    )
+
+    store, position = None, 0
+
+    for chunk in iter_csv_chunks(path, chunksize, date_format, usecols=usecols):
+
+        if store is None:
+            dtype = [("datetime", "datetime64[ns]")]
+            dtype += [(str(col), np.float64) for col in chunk.columns]
+            store = np.lib.format.open_memmap(
+                out, mode="w+", dtype=np.dtype(dtype), shape=(rows,)
+            )
+
+        end = position + len(chunk.index)
+        store["datetime"][position:end] = chunk.index.values
+        for col in chunk.columns:
+            store[str(col)][position:end] = chunk[col].to_numpy(dtype=np.float64)
+        position = end
+
+    store.flush()
+
+    return store
+
+
+def iter_store_chunks(path: str, chunksize: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """Reads a binary store written by ``csv_to_store`` in chunks of rows.
+
+    The store is memory mapped, so only the chunk being read is loaded.
+
+    Args:
+        path: path to the ``.npy`` file
+        chunksize: number of rows in each chunk. Defaults to 1,000,000.
+
+    Yields:
+        pd.DataFrame: chunk of the store, with a datetime index
+    """
+
+    store = np.load(path, mmap_mode="r")
+    columns = [name for name in store.dtype.names if name != "datetime"]
+
+    for start in range(0, store.shape[0], chunksize):
+
+        records = store[start : start + chunksize]
+        index = pd.DatetimeIndex(np.asarray(records["datetime"]), name="datetime")
+
+        yield pd.DataFrame(
+            data={col: np.asarray(records[col]) for col in columns}, index=index
+        )
+
+
+def iter_chunks(
+    source: Source, chunksize: int = 1_000_000, date_format: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """Iterates over chunks of a source of returns, checking they are in index order.
+
+    Args:
+        source: path to a csv file, or to a ``.npy`` store written by
+            ``csv_to_store``, or an iterable of time indexed DataFrames
+        chunksize: number of rows in each chunk read from a file.
+            Defaults to 1,000,000.
+        date_format: format of the dates in a csv file. Defaults to None, which
+            detects the format from the first chunk.
+
+    Raises:
+        ValueError: when rows are not in index order
+
+    Yields:
+        pd.DataFrame: chunk of the source
+    """
+
+    if isinstance(source, str):
+        if source.lower().endswith(".npy"):
+            source = iter_store_chunks(source, chunksize)
+        else:
+            source = iter_csv_chunks(source, chunksize, date_format)
+
+    last = None
+
+    for chunk in source:
+
+        if chunk.empty:
+            continue
+
+        if not chunk.index.is_monotonic_increasing or (
+            last is not None and chunk.index[0] < last
+        ):
+            raise ValueError(f"Rows are not in index order: near={chunk.index[0]}")
+
+        last = chunk.index[-1]
+
+        yield chunk
+
+
+def iter_ret_to_period(
+    source: Source,
+    freq: str,
+    method: str,
+    chunksize: int = 1_000_000,
+    date_format: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """Converts return series streamed from a source to a lower frequency.
+
+    Chunks are converted as they are read, the same way as
+    ``ReturnSeries.to_period``, with the frequency of the series inferred from
+    the first chunk, see ``series_to_period``. The last period of a chunk may
+    continue in the next chunk, so its partial state, one row with the return of
+    the period so far (its sum for continuous compounding), is carried over and
+    compounded with the next chunk. The periods yielded match those of the whole
+    series converted in memory up to rounding, and memory is bounded by the chunk
+    size, however long a period is.
+
+    Args:
+        source: path to a csv file, or to a ``.npy`` store written by
+            ``csv_to_store``, or an iterable of time indexed DataFrames in index
+            order
+        freq: frequency to convert the return series to.
+            Available options can be found `here <https://tinyurl.com/t78g6bh>`_.
+        method: compounding method when converting to lower frequency.
+
+            * 'geometric': geometric compounding ``(1+r1) * (1+r2) - 1``
+            * 'arithmetic': arithmetic compounding ``r1 + r2``
+            * 'continuous': continous compounding ``exp(r1+r2) - 1``
+
+        chunksize: number of rows in each chunk read from a file.
+            Defaults to 1,000,000.
+        date_format: format of the dates in a csv file. Defaults to None, which
+            detects the format from the first chunk.
+
+    Raises:
+        ValueError: when method is not supported, rows are not in index order, or
+            converting to a higher frequency
+
+    Yields:
+        pd.DataFrame: return series in desired frequency, for the periods
+            completed so far
+    """
+
+    _check_method(method)
+
+    chunks = iter_chunks(source, chunksize, date_format)
+    first = next(chunks, None)
+
+    if first is None:
+        return
+
+    chunks = itertools.chain([first], chunks)
+    series_freq = infer_freq(first)
+
+    def convert(df):
+        return series_to_period(df, freq, method, series_freq)
+
+    # a series already in the frequency is not converted, chunks are complete
+    if convert(first) is first:
+        yield from chunks
+        return
+
+    carry = None
+
+    for chunk in chunks:
+
+        if carry is not None:
+            chunk = pd.concat([carry, chunk])
+
+        result = convert(chunk)
+
+        # the last period is completed by a later chunk, its return so far is
+        # carried as one row, dated within the period
+        partial = result.iloc[-1].to_numpy(dtype=np.float64)
+        if method == "continuous":
+            partial = np.log1p(partial)
+
+        carry = pd.DataFrame([partial], index=chunk.index[-1:], columns=chunk.columns)
+
+        if len(result.index) > 1:
+            yield result.iloc[:-1]
+
+    if carry is not None:
+        yield convert(carry)
+
+
+def chunked_ret_to_period(
+    source: Source,
+    freq: str,
+    method: str,
+    chunksize: int = 1_000_000,
+    date_format: Optional[str] = None,
+) -> pd.DataFrame:
+    """Converts return series streamed from a source to a lower frequency.
+
+    See ``iter_ret_to_period``, only the converted series is held in memory.
+
+    Returns:
+        pd.DataFrame: return series in desired frequency
+    """
+
+    return pd.concat(
+        list(iter_ret_to_period(source, freq, method, chunksize, date_format))
+    )
+
+
+def calc_chunked_stats(
+    source: Source,
+    freq: str = "M",
+    method: str = "sample",
+    compound_method: str = "geometric",
+    chunksize: int = 1_000_000,
+    date_format: Optional[str] = None,
+) -> pd.DataFrame:
+    """Computes total return, annualized return and annualized volatility of return
+    series streamed from a source, in one pass.
+
+    Total return is compounded from the total return of each chunk, carried
+    across chunks, so it matches the in-memory result up to rounding. Volatility is
+    computed from the series converted to ``freq`` by ``iter_ret_to_period``,
+    and annualized the same way as ``ReturnSeries.get_ann_vol``, by session for
+    intraday series. Series are measured over the full date range of the source.
+
+    Args:
+        source: path to a csv file, or to a ``.npy`` store written by
+            ``csv_to_store``, or an iterable of time indexed DataFrames in index
+            order
+        freq: frequency of returns to compute volatility with. Defaults to "M".
+        method: {'sample', 'population'}. method used to compute volatility.
+            Defaults to "sample".
+        compound_method: method to use when compounding return. Defaults to
+            "geometric".
+        chunksize: number of rows in each chunk read from a file.
+            Defaults to 1,000,000.
+        date_format: format of the dates in a csv file. Defaults to None, which
+            detects the format from the first chunk.
+
+    Raises:
+        ValueError: when method is not supported, or rows are not in index order
+
+    Returns:
+        pd.DataFrame: one row per series, indexed by series name, with columns
+            total return, annualized return and annualized volatility
+    """
+
+    _check_method(compound_method)
+
+    state = {"total": None, "start": None, "end": None}
+
+    # total returns of chunks add up, or compound geometrically, also when they
+    # were compounded continuously
+    combine = "arithmetic" if compound_method == "arithmetic" else "geometric"
+
+    def tap(chunks):
+        # accumulates the native returns as they stream to the conversion
+        for chunk in chunks:
+
+            total = compound_values(chunk.to_numpy(dtype=np.float64), compound_method)
+            if state["total"] is not None:
+                total = compound_values(np.vstack([state["total"], total]), combine)
+
+            state["total"] = total
+            state["start"] = (
+                chunk.index[0] if state["start"] is None else state["start"]
+            )
+            state["end"] = chunk.index[-1]
+
+            yield chunk
+
+    chunks = iter_chunks(source, chunksize, date_format)
+    ret = chunked_ret_to_period(tap(chunks), freq, compound_method)
+
+    tot_ret = state["total"]
+
+    years = calc_timedelta_in_years(state["start"], state["end"])
+    samples_per_year = calc_index_samples_per_year(
+        ret.index, state["start"], state["end"]
+    )
+
+    return pd.DataFrame(
+        data={
+            "total return": tot_ret,
+            "annualized return": annualize_ret(tot_ret, years, compound_method),
+            "annualized volatility": [
+                calc_ann_vol(ret[col], method, samples_per_year) for col in ret.columns
+            ],
+        },
+        index=ret.columns,
+    )
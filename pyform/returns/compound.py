@@ -1,6 +1,158 @@
-import math
+import numpy as np
 import pandas as pd
-from typing import Callable
+from typing import Callable, Optional, Union
+from pandas.tseries.frequencies import to_offset
+from pyform.returns.kernels import (
+    as_float_array,
+    get_kernel,
+    log_compound,
+    run_kernel,
+)
+from pyform.util.freq import is_intraday, is_lower_freq
+
+# array like inputs accepted by compound_values and cumseries_values
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame]
+
+
+def _check_method(method: str):
+    """Checks compounding method is supported.
+
+    Raises:
+        ValueError: when method is not supported.
+    """
+
+    if method not in ["arithmetic", "geometric", "continuous"]:
+        raise ValueError(
+            "Method should be one of 'geometric', 'arithmetic' or 'continuous'"
+        )
+
+
+def _compound_sums(values: np.ndarray, method: str, total: Callable):
+    """Compounds returns with a sum over rows, e.g. a group or rolling sum, in
+    log space for geometric compounding, see ``log_compound``.
+    """
+
+    if method == "geometric":
+        return log_compound(values, total)
+
+    result = total(values)
+
+    return np.expm1(result) if method == "continuous" else result
+
+
+def _as_columns(values: ArrayLike, axis: int) -> np.ndarray:
+    """Converts values to a 2-d float64 array, with the axis to compound along
+    as axis 0, i.e. one series per column.
+    """
+
+    if isinstance(values, (pd.Series, pd.DataFrame)):
+        array = values.to_numpy(dtype=np.float64)
+    else:
+        array = np.asarray(values, dtype=np.float64)
+
+    if array.ndim == 1:
+        return array.reshape(-1, 1)
+
+    if array.ndim != 2:
+        raise ValueError(f"Values should be 1-d or 2-d: ndim={array.ndim}")
+
+    if axis not in [0, 1]:
+        raise ValueError(f"Axis should be 0 or 1: axis={axis}")
+
+    return np.ascontiguousarray(array if axis == 0 else array.T)
+
+
+def compound_values(
+    values: ArrayLike, method: str, axis: int = 0, skipna: bool = True
+) -> Union[float, np.ndarray, pd.Series]:
+    """Compounds returns held in a numpy array, pandas Series or DataFrame.
+
+    Values are compounded on the raw float64 array by the kernels selected by the
+    ``backend`` option, without creating a python object per element. Geometric
+    compounding is done as ``expm1(sum(log1p(r)))`` for numerical stability over
+    long horizons.
+
+    Args:
+        values: returns, in decimals. A 1-d array or Series is one series, a 2-d
+            array or DataFrame holds many series.
+        method: {'geometric', 'arithmetic', 'continuous'}. compounding method.
+        axis: axis of a 2-d input to compound along. 0 compounds each column,
+            1 compounds each row. Defaults to 0.
+        skipna: whether to skip missing values. If False, a series with any
+            missing value compounds to NaN. Defaults to True.
+
+    Raises:
+        ValueError: when method, axis or the dimension of values is not supported.
+
+    Returns:
+        Union[float, np.ndarray, pd.Series]: total compounded return. A float for
+            1-d input, an array for 2-d array input, and a Series labelled by
+            columns (axis=0) or index (axis=1) for DataFrame input.
+    """
+
+    _check_method(method)
+    array = _as_columns(values, axis)
+
+    result = np.asarray(run_kernel(f"compound_{method}", array), dtype=np.float64)
+    result = result.reshape(-1)
+
+    if not skipna:
+        result[np.isnan(array).any(axis=0)] = np.nan
+
+    if isinstance(values, pd.DataFrame):
+        labels = values.columns if axis == 0 else values.index
+        return pd.Series(result, index=labels)
+
+    if array.shape[1] == 1 and np.ndim(values) == 1:
+        return float(result[0])
+
+    return result
+
+
+def cumseries_values(
+    values: ArrayLike, method: str, axis: int = 0, skipna: bool = True
+) -> ArrayLike:
+    """Creates cumulative index series from returns held in a numpy array, pandas
+    Series or DataFrame.
+
+    Args:
+        values: returns, in decimals. A 1-d array or Series is one series, a 2-d
+            array or DataFrame holds many series.
+        method: {'geometric', 'arithmetic', 'continuous'}. compounding method.
+        axis: axis of a 2-d input to compound along. 0 compounds down each column,
+            1 compounds across each row. Defaults to 0.
+        skipna: whether to skip missing values. Missing values stay missing in the
+            output either way. If True, compounding continues after them, if
+            False, everything after a missing value is missing. Defaults to True.
+
+    Raises:
+        ValueError: when method, axis or the dimension of values is not supported.
+
+    Returns:
+        ArrayLike: cumulative index series, in decimals, of the same type and shape
+            as values.
+    """
+
+    _check_method(method)
+    array = _as_columns(values, axis)
+
+    result = run_kernel(f"cumseries_{method}", array)
+
+    if not skipna:
+        result[np.logical_or.accumulate(np.isnan(array), axis=0)] = np.nan
+
+    if np.ndim(values) == 1:
+        result = result.reshape(-1)
+    elif axis == 1:
+        result = result.T
+
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+
+    if isinstance(values, pd.DataFrame):
+        return pd.DataFrame(result, index=values.index, columns=values.columns)
+
+    return result
 
 
 def compound_geometric(returns: pd.Series) -> float:
@@ -17,7 +169,7 @@ def compound_geometric(returns: pd.Series) -> float:
         float: total compounded return
     """
 
-    return (1 + returns).prod() - 1
+    return compound_values(returns, "geometric")
 
 
 def compound_arithmetic(returns: pd.Series) -> float:
@@ -34,7 +186,7 @@ def compound_arithmetic(returns: pd.Series) -> float:
         float: total compounded return
     """
 
-    return sum(returns)
+    return compound_values(returns, "arithmetic")
 
 
 def compound_continuous(returns: pd.Series) -> float:
@@ -51,7 +203,7 @@ def compound_continuous(returns: pd.Series) -> float:
         float: total compounded return
     """
 
-    return math.exp(sum(returns)) - 1
+    return compound_values(returns, "continuous")
 
 
 def compound(method: str) -> Callable:
@@ -72,10 +224,7 @@ def compound(method: str) -> Callable:
             compound it according to the method specified.
     """
 
-    if method not in ["arithmetic", "geometric", "continuous"]:
-        raise ValueError(
-            "Method should be one of 'geometric', 'arithmetic' or 'continuous'"
-        )
+    _check_method(method)
 
     compound = {
         "arithmetic": compound_arithmetic,
@@ -103,7 +252,7 @@ def cumseries_geometric(returns: pd.Series) -> pd.Series:
         returns: pandas series of cumulative index, in decimals.
     """
 
-    return (1 + returns).cumprod() - 1
+    return cumseries_values(returns, "geometric")
 
 
 def cumseries_arithmetic(returns: pd.Series) -> pd.Series:
@@ -123,10 +272,10 @@ def cumseries_arithmetic(returns: pd.Series) -> pd.Series:
         returns: pandas series of cumulative index, in decimals.
     """
 
-    return returns.cumsum()
+    return cumseries_values(returns, "arithmetic")
 
 
-def cumseries_continuous(returns: pd.Series) -> float:
+def cumseries_continuous(returns: pd.Series) -> pd.Series:
     """Performs continuous compounding to create cumulative index series.
 
     e.g. if there are 3 returns r1, r2, r3,
@@ -143,7 +292,7 @@ def cumseries_continuous(returns: pd.Series) -> float:
         returns: pandas series of cumulative index, in decimals.
     """
 
-    return returns.cumsum().apply(lambda x: math.exp(x) - 1)
+    return cumseries_values(returns, "continuous")
 
 
 def cumseries(method: str) -> Callable:
@@ -165,10 +314,7 @@ def cumseries(method: str) -> Callable:
             method specified.
     """
 
-    if method not in ["arithmetic", "geometric", "continuous"]:
-        raise ValueError(
-            "Method should be one of 'geometric', 'arithmetic' or 'continuous'"
-        )
+    _check_method(method)
 
     cumseries = {
         "arithmetic": cumseries_arithmetic,
@@ -179,6 +325,44 @@ def cumseries(method: str) -> Callable:
     return cumseries[method]
 
 
+def cumseries_frame(
+    df: pd.DataFrame, method: str, step: Optional[int] = 1
+) -> pd.DataFrame:
+    """Creates cumulative index series for every column of a wide DataFrame at once.
+
+    The index is computed on the raw 2-d array by ``cumseries_values``, and one
+    DataFrame is built for the result.
+
+    Args:
+        df: a time indexed pandas dataframe of returns, one column per series.
+            Missing values are left in place, and do not break the compounding of
+            the values after them.
+        method: compounding method.
+
+            * 'geometric': geometric compounding
+            * 'arithmetic': arithmetic compounding
+            * 'continuous': continous compounding
+
+        step: only keep every step-th row of the result, useful to reduce the
+            number of points when charting. The last row is always kept.
+            Defaults to 1.
+
+    Raises:
+        ValueError: when method is not supported.
+
+    Returns:
+        pd.DataFrame: cumulative index series, in decimals.
+    """
+
+    result = cumseries_values(df, method)
+
+    rows = np.arange(0, len(result.index), step)
+    if len(rows) > 0 and rows[-1] != len(result.index) - 1:
+        rows = np.append(rows, len(result.index) - 1)
+
+    return result.iloc[rows]
+
+
 def ret_to_period(df: pd.DataFrame, freq: str, method: str):
     """Converts return series to a different (and lower) frequency.
 
@@ -196,3 +380,190 @@ def ret_to_period(df: pd.DataFrame, freq: str, method: str):
         pd.DataFrame: return series in desired frequency
     """
     return df.groupby(pd.Grouper(freq=freq)).agg(compound(method))
+
+
+def bars_to_period(df: pd.DataFrame, freq: str, method: str) -> pd.DataFrame:
+    """Converts intraday return series to bars or daily returns, vectorized.
+
+    Each timestamp is mapped to its bar with a binary search over the int64 bar
+    boundaries, and returns in each bar are summed for all rows at once with
+    ``np.bincount`` (of ``log1p`` returns for geometric compounding), instead of
+    compounding each bar with a python call. Bars are labelled by their start,
+    the same as ``ret_to_period``. Unlike ``ret_to_period``, only bars with data
+    are returned, so nights, weekends and holidays do not add bars of 0 returns,
+    which would count as sessions when the bars are annualized.
+
+    Args:
+        df: a time indexed pandas dataframe, sorted by time
+        freq: frequency of the bars, a fixed frequency such as "S", "5T", "H" or
+            "D", or business days "B". Other frequencies are converted by
+            ``ret_to_period``.
+        method: compounding method when converting to lower frequency.
+
+            * 'geometric': geometric compounding ``(1+r1) * (1+r2) - 1``
+            * 'arithmetic': arithmetic compounding ``r1 + r2``
+            * 'continuous': continous compounding ``exp(r1+r2) - 1``
+
+    Raises:
+        ValueError: when method is not supported.
+
+    Returns:
+        pd.DataFrame: return series in desired frequency
+    """
+
+    _check_method(method)
+
+    offset = to_offset(freq)
+
+    if df.empty:
+        return ret_to_period(df, freq, method)
+
+    first, last = df.index[0], df.index[-1]
+
+    if isinstance(offset, pd.offsets.Tick):
+        labels = pd.date_range(first.floor(offset), last, freq=offset)
+    elif isinstance(offset, pd.offsets.BusinessDay) and offset.n == 1:
+        labels = pd.date_range(offset.rollback(first.normalize()), last, freq=offset)
+    else:
+        return ret_to_period(df, freq, method)
+
+    ids = np.searchsorted(labels.asi8, df.index.asi8, side="right") - 1
+
+    def total(x):
+        sums = np.empty((len(labels), x.shape[1]))
+        for col in range(x.shape[1]):
+            available = ~np.isnan(x[:, col])
+            sums[:, col] = np.bincount(
+                ids[available], weights=x[available, col], minlength=len(labels)
+            )
+        return sums
+
+    result = _compound_sums(df.to_numpy(dtype=np.float64), method, total)
+
+    # bars without any timestamp are outside of trading sessions
+    has_data = np.bincount(ids, minlength=len(labels)) > 0
+
+    return pd.DataFrame(
+        data=result[has_data],
+        index=labels[has_data].rename(df.index.name),
+        columns=df.columns,
+    )
+
+
+def panel_to_period(df: pd.DataFrame, freq: str, method: str) -> pd.DataFrame:
+    """Converts a panel of return series to a different (and lower) frequency.
+
+    Unlike ``ret_to_period``, all series are compounded at once with vectorized
+    group sums (of ``log1p`` returns for geometric compounding), and periods in
+    which a series has no returns are NaN rather than 0. This suits a panel of
+    many series with different inception dates.
+
+    Args:
+        df: a time indexed pandas dataframe, one column per series
+        freq: frequency to convert the return series to.
+            Available options can be found `here <https://tinyurl.com/t78g6bh>`_.
+        method: compounding method when converting to lower frequency.
+
+            * 'geometric': geometric compounding ``(1+r1) * (1+r2) - 1``
+            * 'arithmetic': arithmetic compounding ``r1 + r2``
+            * 'continuous': continous compounding ``exp(r1+r2) - 1``
+
+    Raises:
+        ValueError: when method is not supported.
+
+    Returns:
+        pd.DataFrame: return series in desired frequency
+    """
+
+    _check_method(method)
+
+    def total(x):
+        frame = pd.DataFrame(x, index=df.index, columns=df.columns)
+        return frame.groupby(pd.Grouper(freq=freq)).sum(min_count=1)
+
+    return _compound_sums(df.to_numpy(dtype=np.float64), method, total)
+
+
+def series_to_period(
+    df: pd.DataFrame, freq: str, method: str, series_freq: str
+) -> pd.DataFrame:
+    """Converts a return series of a known frequency to a different (and lower)
+    frequency, as ``ReturnSeries.to_period`` does.
+
+    Daily returns are business day returns, a series already in the desired
+    frequency is returned as is, intraday series are aggregated to bars with data
+    by ``bars_to_period``, and other series are converted by ``ret_to_period``.
+
+    Args:
+        df: a time indexed pandas dataframe, sorted by time
+        freq: frequency to convert the return series to.
+            Available options can be found `here <https://tinyurl.com/t78g6bh>`_.
+        method: compounding method when converting to lower frequency.
+
+            * 'geometric': geometric compounding ``(1+r1) * (1+r2) - 1``
+            * 'arithmetic': arithmetic compounding ``r1 + r2``
+            * 'continuous': continous compounding ``exp(r1+r2) - 1``
+
+        series_freq: frequency of the series, as inferred by ``infer_freq``
+
+    Raises:
+        ValueError: when converting to a higher frequency, or method is not
+            supported.
+
+    Returns:
+        pd.DataFrame: return series in desired frequency
+    """
+
+    # Use businessness days for all return series
+    if freq == "D":
+        freq = "B"
+
+    if freq == series_freq:
+        return df
+
+    # make sure it's not converting to a higher frequency
+    # e.g. trying to convert a monthly series into daily
+    if not is_lower_freq(freq, series_freq):
+        raise ValueError(
+            "Cannot convert to higher frequency. "
+            f"target={freq}, current={series_freq}"
+        )
+
+    # intraday series are aggregated to bars on their int64 timestamps
+    if is_intraday(series_freq):
+        return bars_to_period(df, freq, method)
+
+    return ret_to_period(df, freq, method)
+
+
+def rolling_compound(df: pd.DataFrame, window: int, method: str) -> pd.DataFrame:
+    """Compounds returns over a rolling window.
+
+    Windows are computed by the compiled or vectorized kernels selected by the
+    ``backend`` option, instead of calling back into python for every window.
+
+    Args:
+        df: a time indexed pandas dataframe of returns
+        window: number of periods in the rolling window
+        method: compounding method.
+
+            * 'geometric': geometric compounding ``(1+r1) * (1+r2) - 1``
+            * 'arithmetic': arithmetic compounding ``r1 + r2``
+            * 'continuous': continous compounding ``exp(r1+r2) - 1``
+
+    Raises:
+        ValueError: when method is not supported.
+
+    Returns:
+        pd.DataFrame: rolling compounded returns. The first ``window - 1`` rows
+            are NaN.
+    """
+
+    _check_method(method)
+
+    kernel = get_kernel(f"rolling_{method}")
+
+    return pd.DataFrame(
+        data={col: kernel(as_float_array(df[col]), window) for col in df.columns},
+        index=df.index,
+    )
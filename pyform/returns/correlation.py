@@ -0,0 +1,239 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Optional, Tuple, Union
+
+# centered values and availability mask, opened by each worker process
+_worker_data = dict()
+
+
+def _prepare(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Centers each column by its mean and zero fills missing values.
+
+    Centering keeps the one pass sums precise, and zero filled values drop out of
+    the matrix multiplies, so pairwise complete sums come from plain products.
+
+    Args:
+        values: (n, k) array, with missing values marked as NaN
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: centered values and availability mask, both
+            float64 arrays of shape (n, k)
+    """
+
+    available = ~np.isnan(values)
+
+    with np.errstate(invalid="ignore"):
+        center = np.nanmean(values, axis=0)
+
+    centered = np.where(available, values - center, 0.0)
+
+    return centered, available.astype(np.float64)
+
+
+def _tile(
+    centered: np.ndarray,
+    mask: np.ndarray,
+    rows: Tuple[int, int],
+    cols: Tuple[int, int],
+    kind: str,
+    ddof: int,
+    min_periods: int,
+) -> np.ndarray:
+    """Computes one tile of the pairwise complete correlation or covariance matrix.
+
+    Args:
+        centered: centered values, as produced by ``_prepare``
+        mask: availability mask, as produced by ``_prepare``
+        rows: start and end column of the series on the rows of the tile
+        cols: start and end column of the series on the columns of the tile
+        kind: {'correlation', 'covariance'}
+        ddof: delta degrees of freedom
+        min_periods: minimum number of common observations, pairs with fewer
+            observations are NaN
+
+    Returns:
+        np.ndarray: tile of the matrix
+    """
+
+    x, mx = centered[:, rows[0] : rows[1]], mask[:, rows[0] : rows[1]]
+    y, my = centered[:, cols[0] : cols[1]], mask[:, cols[0] : cols[1]]
+
+    count = mx.T @ my
+    sum_x, sum_y = x.T @ my, mx.T @ y
+    sum_xy = x.T @ y
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+
+        result = (sum_xy - sum_x * sum_y / count) / (count - ddof)
+
+        if kind == "correlation":
+            var_x = ((x ** 2).T @ my - sum_x ** 2 / count) / (count - ddof)
+            var_y = (mx.T @ (y ** 2) - sum_y ** 2 / count) / (count - ddof)
+            result /= np.sqrt(var_x * var_y)
+
+    result[count < max(min_periods, ddof + 1)] = np.nan
+
+    return result
+
+
+def _worker_tile(
+    paths: Tuple[str, str],
+    rows: Tuple[int, int],
+    cols: Tuple[int, int],
+    kind: str,
+    ddof: int,
+    min_periods: int,
+):
+    """Computes one tile in a worker process, from the memory mapped input.
+
+    Input is opened once per process, on the first tile it computes.
+    """
+
+    if _worker_data.get("paths") != paths:
+        _worker_data["centered"] = np.load(paths[0], mmap_mode="r")
+        _worker_data["mask"] = np.load(paths[1], mmap_mode="r")
+        _worker_data["paths"] = paths
+
+    tile = _tile(
+        _worker_data["centered"],
+        _worker_data["mask"],
+        rows,
+        cols,
+        kind,
+        ddof,
+        min_periods,
+    )
+
+    return rows, cols, tile
+
+
+def calc_blocked_matrix(
+    df: Union[pd.DataFrame, np.ndarray],
+    kind: str = "correlation",
+    block_size: int = 1000,
+    workers: Optional[int] = None,
+    out: Optional[str] = None,
+    ddof: int = 1,
+    min_periods: int = 2,
+) -> np.ndarray:
+    """Computes pairwise complete correlation or covariance matrix of many series,
+    tile by tile.
+
+    Series are split in blocks of ``block_size`` columns, and the matrix is filled
+    one (block, block) tile at a time with matrix multiplies on the centered,
+    masked values. The centered values and availability mask of all series are
+    held once, as (periods, series) arrays, memory mapped for worker processes.
+    Beyond them, only the tiles in flight are held: one at a time in the current
+    process, or up to two per worker. With ``out``, the (series, series) matrix
+    itself stays on disk. For every pair, only periods where both series are
+    available are used, so series with different inception dates are supported.
+
+    Args:
+        df: (periods, series) DataFrame or array of returns, with missing values
+            marked as NaN
+        kind: {'correlation', 'covariance'}. Defaults to "correlation".
+        block_size: number of series in each block. Defaults to 1000.
+        workers: number of processes to compute tiles with. Input is shared with
+            the processes through memory mapped files. Defaults to None, which
+            computes all tiles in the current process.
+        out: path of a file to write the matrix to, as a memory mapped array. Use
+            this when the matrix does not fit in memory. Defaults to None, which
+            keeps the matrix in memory.
+        ddof: delta degrees of freedom. Defaults to 1.
+        min_periods: minimum number of common periods for a pair to have a value,
+            otherwise it is NaN. Defaults to 2.
+
+    Raises:
+        ValueError: when kind is not supported
+
+    Returns:
+        np.ndarray: (series, series) matrix. A ``np.memmap`` backed by ``out`` if
+            out is given.
+    """
+
+    if kind not in ["correlation", "covariance"]:
+        raise ValueError("Kind should be one of 'correlation' or 'covariance'")
+
+    if isinstance(df, pd.DataFrame):
+        values = df.to_numpy(dtype=np.float64)
+    else:
+        values = np.asarray(df, dtype=np.float64)
+
+    k = values.shape[1]
+    centered, mask = _prepare(values)
+    del values
+
+    if out is None:
+        result = np.empty((k, k))
+    else:
+        result = np.lib.format.open_memmap(
+            out, mode="w+", dtype=np.float64, shape=(k, k)
+        )
+
+    # upper triangle of tiles, the lower triangle is its transpose
+    blocks = [(i, min(i + block_size, k)) for i in range(0, k, block_size)]
+    tiles = [(rows, cols) for n, rows in enumerate(blocks) for cols in blocks[n:]]
+
+    def write(rows, cols, tile):
+        result[rows[0] : rows[1], cols[0] : cols[1]] = tile
+        result[cols[0] : cols[1], rows[0] : rows[1]] = tile.T
+
+    if workers is None or workers <= 1:
+
+        for rows, cols in tiles:
+            write(
+                rows, cols, _tile(centered, mask, rows, cols, kind, ddof, min_periods)
+            )
+
+    else:
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            centered_path = os.path.join(tmp, "centered.npy")
+            mask_path = os.path.join(tmp, "mask.npy")
+            np.save(centered_path, centered)
+            np.save(mask_path, mask)
+            del centered, mask
+
+            log.info(f"Computing matrix tiles. tiles={len(tiles)}, workers={workers}")
+
+            paths = (centered_path, mask_path)
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+
+                # a bounded number of tiles is submitted ahead of those written,
+                # and each tile is dropped once written, so few are held at once
+                pending = set()
+
+                for rows, cols in tiles:
+
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            write(*future.result())
+
+                    pending.add(
+                        executor.submit(
+                            _worker_tile, paths, rows, cols, kind, ddof, min_periods
+                        )
+                    )
+
+                for future in as_completed(pending):
+                    write(*future.result())
+
+    if out is not None:
+        result.flush()
+
+    return result
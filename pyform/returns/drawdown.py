@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+from pyform.returns.kernels import as_float_array, get_kernel
+
+
+def _to_frame(returns: Union[pd.DataFrame, pd.Series]) -> pd.DataFrame:
+    """Makes sure returns is a DataFrame, so Series and panels of series are handled
+    the same way: one column per series.
+    """
+
+    if isinstance(returns, pd.Series):
+        return returns.to_frame()
+
+    return returns
+
+
+def _wealth(values: np.ndarray) -> np.ndarray:
+    """Computes the wealth index of returns, starting from 1 before the first return.
+
+    The wealth index is the geometric cumulative index produced by
+    ``cumseries_geometric``, plus one, with the initial wealth prepended so a loss
+    on the very first period is counted as a drawdown.
+
+    Args:
+        values: 1-d array of returns, without missing values
+
+    Returns:
+        np.ndarray: wealth index, of length ``len(values) + 1``
+    """
+
+    cumulative = get_kernel("cumseries_geometric")(values)
+
+    return np.concatenate([[1.0], 1 + cumulative])
+
+
+def _sliding_worst_ratio(wealth: np.ndarray, window: int) -> np.ndarray:
+    """Computes, for every window of wealth, the smallest ratio ``W[b] / W[a]`` with
+    ``a <= b`` inside the window. i.e. one plus the maximum drawdown of the window.
+
+    The van Herk/Gil-Werman block scheme is used: wealth is cut into blocks of size
+    window, and prefix and suffix aggregates (max, min and worst ratio) are
+    accumulated within each block. Any window spans at most two blocks, so its
+    aggregate is the combination of one suffix and one prefix. This is O(n)
+    regardless of window size.
+
+    Args:
+        wealth: 1-d wealth index
+        window: number of wealth points in each window
+
+    Returns:
+        np.ndarray: worst ratio for each window ending at position
+            ``window - 1, window, ..., len(wealth) - 1``
+    """
+
+    m = wealth.shape[0]
+    pad = (-m) % window
+
+    # padding is never part of a queried aggregate, repeat the last value
+    blocks = np.concatenate([wealth, np.repeat(wealth[-1:], pad)]).reshape(-1, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+
+        # aggregates from the start of the block to each position
+        pre_max = np.maximum.accumulate(blocks, axis=1)
+        pre_min = np.minimum.accumulate(blocks, axis=1)
+        pre_worst = np.minimum.accumulate(blocks / pre_max, axis=1)
+
+        # aggregates from each position to the end of the block
+        suf_max = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+        suf_min = np.minimum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+        suf_worst = np.minimum.accumulate((suf_min / blocks)[:, ::-1], axis=1)
+        suf_worst = suf_worst[:, ::-1]
+
+        pre_min, pre_worst = pre_min.reshape(-1), pre_worst.reshape(-1)
+        suf_max, suf_worst = suf_max.reshape(-1), suf_worst.reshape(-1)
+
+        end = np.arange(window - 1, m)
+        start = end - window + 1
+
+        # combine suffix of the first block and prefix of the second block,
+        # a drop can happen within either block, or from first block to second
+        worst = np.minimum(suf_worst[start], pre_worst[end])
+        worst = np.minimum(worst, pre_min[end] / suf_max[start])
+
+    # windows aligned with a block are fully described by the block prefix
+    aligned = start % window == 0
+    worst[aligned] = pre_worst[end[aligned]]
+
+    return worst
+
+
+def calc_drawdown(returns: Union[pd.DataFrame, pd.Series]) -> pd.DataFrame:
+    """Computes drawdown series, i.e. the decline from the running peak of the
+    geometric cumulative index, for each series in returns.
+
+    Args:
+        returns: a time indexed pandas DataFrame or Series of returns. Each column
+            of a DataFrame is treated as a separate series, so a panel of many
+            series can be passed at once. Missing values are skipped.
+
+    Returns:
+        pd.DataFrame: drawdown series, in decimals. e.g. -0.1 means the series is
+            10% below its previous peak.
+    """
+
+    returns = _to_frame(returns)
+    result = pd.DataFrame(index=returns.index, columns=returns.columns, dtype=float)
+
+    for col in returns.columns:
+
+        series = returns[col].dropna()
+        wealth = _wealth(as_float_array(series))
+        drawdown = wealth / np.maximum.accumulate(wealth) - 1
+
+        result.loc[series.index, col] = drawdown[1:]
+
+    return result
+
+
+def calc_max_drawdown(returns: Union[pd.DataFrame, pd.Series]) -> pd.DataFrame:
+    """Computes maximum drawdown and its timing for each series in returns.
+
+    Args:
+        returns: a time indexed pandas DataFrame or Series of returns. Each column
+            of a DataFrame is treated as a separate series, so a panel of many
+            series can be passed at once. Missing values are skipped.
+
+    Returns:
+        pd.DataFrame: one row per series, indexed by series name, with columns
+
+            * max drawdown: maximum drawdown, in decimals. e.g. -0.3 means a 30%
+                decline from peak to trough
+            * peak: date of the peak before the maximum drawdown. A drawdown
+                that starts with the very first return peaks at the first date
+            * trough: date of the trough of the maximum drawdown
+            * recovery: date the series first gets back to the peak,
+                NaT if it has not recovered
+            * periods: time under water, the number of periods from peak to
+                recovery, or to the end of the series if it has not recovered
+
+            A series without returns has a missing max drawdown and dates.
+    """
+
+    returns = _to_frame(returns)
+    rows = []
+
+    for col in returns.columns:
+
+        series = returns[col].dropna()
+
+        if series.empty:
+            rows.append([np.nan, pd.NaT, pd.NaT, pd.NaT, 0])
+            continue
+
+        wealth = _wealth(as_float_array(series))
+        peak = np.maximum.accumulate(wealth)
+        drawdown = wealth / peak - 1
+
+        # position 0 is the initial wealth, which is reported as the first date
+        dates = series.index.insert(0, series.index[0])
+
+        trough = int(np.argmin(drawdown))
+        max_dd = drawdown[trough]
+
+        if max_dd == 0:
+            rows.append([0.0, pd.NaT, pd.NaT, pd.NaT, 0])
+            continue
+
+        # peak is the last time wealth was at the high, before the trough
+        high = peak[trough]
+        peak_pos = trough - int(np.argmax(wealth[trough::-1] >= high))
+
+        # recovery is the first time wealth is back to the high, after the trough
+        recovered = wealth[trough:] >= high
+        if recovered.any():
+            recovery_pos = trough + int(np.argmax(recovered))
+            recovery = dates[recovery_pos]
+        else:
+            recovery_pos = len(wealth) - 1
+            recovery = pd.NaT
+
+        rows.append(
+            [max_dd, dates[peak_pos], dates[trough], recovery, recovery_pos - peak_pos]
+        )
+
+    return pd.DataFrame(
+        data=rows,
+        index=returns.columns,
+        columns=["max drawdown", "peak", "trough", "recovery", "periods"],
+    )
+
+
+def calc_rolling_max_drawdown(
+    returns: Union[pd.DataFrame, pd.Series], window: int
+) -> pd.DataFrame:
+    """Computes rolling maximum drawdown for each series in returns, in O(n).
+
+    The drawdown of a window includes a loss on the first return of the window,
+    i.e. the wealth right before the window starts counts as a potential peak.
+
+    Args:
+        returns: a time indexed pandas DataFrame or Series of returns. Each column
+            of a DataFrame is treated as a separate series, so a panel of many
+            series can be passed at once. Missing values are skipped, and windows
+            are counted over available returns only.
+        window: number of periods in the rolling window
+
+    Returns:
+        pd.DataFrame: rolling maximum drawdown, in decimals. The first
+            ``window - 1`` rows of each series are NaN.
+    """
+
+    returns = _to_frame(returns)
+    result = pd.DataFrame(index=returns.index, columns=returns.columns, dtype=float)
+
+    for col in returns.columns:
+
+        series = returns[col].dropna()
+
+        if len(series.index) < window:
+            continue
+
+        wealth = _wealth(as_float_array(series))
+        values = np.full(len(series.index), np.nan)
+        values[window - 1 :] = _sliding_worst_ratio(wealth, window + 1) - 1
+
+        result.loc[series.index, col] = values
+
+    return result
@@ -0,0 +1,627 @@
+import logging
+
+log = logging.getLogger(__name__)
+
+import math
+import bisect
+import numpy as np
+from typing import Callable, Optional, Union
+from pyform.config import get_option
+
+try:
+    import numba
+except ImportError:  # pragma: no cover
+    numba = None
+
+
+def as_float_array(values) -> np.ndarray:
+    """Converts values to a contiguous 1-d float64 numpy array, which is the input
+    all kernels expect.
+
+    Args:
+        values: a pandas Series, a single column pandas DataFrame, or anything
+            numpy can convert to an array
+
+    Returns:
+        np.ndarray: contiguous float64 array
+    """
+
+    if hasattr(values, "to_numpy"):
+        values = values.to_numpy(dtype=np.float64)
+
+    return np.ascontiguousarray(values, dtype=np.float64).reshape(-1)
+
+
+def _sliding_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Creates a read-only (n - window + 1, window) view of values, without copying.
+
+    Args:
+        values: 1-d array
+        window: size of the window
+
+    Returns:
+        np.ndarray: 2-d view, one row per window
+    """
+
+    shape = (values.shape[0] - window + 1, window)
+    strides = (values.strides[0], values.strides[0])
+
+    return np.lib.stride_tricks.as_strided(
+        values, shape=shape, strides=strides, writeable=False
+    )
+
+
+# NumPy kernels
+# -------------
+# NaN is skipped when compounding, left in place in cumulative series, and turns
+# the whole window into NaN for rolling computations. This mirrors pandas.
+# Compounding and cumulative kernels also accept 2-d arrays, and work along axis 0.
+# Geometric compounding is done in log space by ``log_compound``.
+
+
+def log_compound(values: np.ndarray, total: Callable) -> Union[float, np.ndarray]:
+    """Compounds returns geometrically in log space, as ``expm1(total(log1p(r)))``.
+
+    ``total`` is any sum over the rows of an array shaped like values, e.g. a
+    plain, cumulative, rolling, prefix or group sum, so every geometric
+    compounding shares this one conversion. Summing logs stays precise over long
+    horizons where a running product accumulates error.
+
+    A return at or below -100% has no log of its growth ``1 + r``. When there are
+    any, the logs of the magnitudes ``|1 + r|`` are summed instead, and ``total``
+    also sums the number of negative and zero growth factors, which restore the
+    sign and the zero of each product exactly.
+
+    Args:
+        values: returns, a float64 numpy array. Missing values are passed on to
+            ``total`` as NaN.
+        total: sum over rows, returning a numpy array, pandas object or float
+
+    Returns:
+        Union[float, np.ndarray]: compounded returns, of the type ``total``
+            returns
+    """
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.log1p(values)
+        below = values <= -1
+
+    if not below.any():
+        return np.expm1(total(logs))
+
+    growth = 1 + values
+    missing = np.isnan(values)
+
+    logs = np.where(below, np.log(np.abs(np.where(growth == 0, 1, growth))), logs)
+    negative = np.where(missing, np.nan, growth < 0)
+    zero = np.where(missing, np.nan, growth == 0)
+
+    sums = total(logs)
+
+    # the masks are 0 or 1, missing values stay missing through the products
+    with np.errstate(invalid="ignore"):
+        odd = np.rint(total(negative)) % 2
+        zeros = (np.rint(total(zero)) > 0) * 1.0
+
+    result = np.expm1(sums) * (1 - odd) - (np.exp(sums) + 1) * odd
+
+    return result * (1 - zeros) - zeros
+
+
+def _np_compound_geometric(values: np.ndarray) -> float:
+    return log_compound(values, lambda logs: np.nansum(logs, axis=0))
+
+
+def _np_compound_arithmetic(values: np.ndarray) -> float:
+    return np.nansum(values, axis=0)
+
+
+def _np_compound_continuous(values: np.ndarray) -> float:
+    return np.expm1(np.nansum(values, axis=0))
+
+
+def _np_cumseries_geometric(values: np.ndarray) -> np.ndarray:
+    return log_compound(values, _np_cumseries_arithmetic)
+
+
+def _np_cumseries_arithmetic(values: np.ndarray) -> np.ndarray:
+    mask = np.isnan(values)
+    result = np.cumsum(np.where(mask, 0, values), axis=0)
+    result[mask] = np.nan
+    return result
+
+
+def _np_cumseries_continuous(values: np.ndarray) -> np.ndarray:
+    return np.expm1(_np_cumseries_arithmetic(values))
+
+
+def _np_rolling_geometric(values: np.ndarray, window: int) -> np.ndarray:
+    return log_compound(values, lambda logs: _np_rolling_arithmetic(logs, window))
+
+
+def _np_rolling_arithmetic(values: np.ndarray, window: int) -> np.ndarray:
+    result = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        windows = _sliding_windows(values, window)
+        result[window - 1 :] = np.sum(windows, axis=1)
+    return result
+
+
+def _np_rolling_continuous(values: np.ndarray, window: int) -> np.ndarray:
+    return np.expm1(_np_rolling_arithmetic(values, window))
+
+
+def _np_rolling_std(values: np.ndarray, window: int, ddof: int) -> np.ndarray:
+    result = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window and window > ddof:
+        windows = _sliding_windows(values, window)
+        result[window - 1 :] = np.std(windows, axis=1, ddof=ddof)
+    return result
+
+
+def _np_rolling_comoments(
+    x: np.ndarray, y: np.ndarray, window: int, compensated: bool
+) -> np.ndarray:
+    # window sums of all five moments at once, as differences of prefix sums. The
+    # compensated sums combine sums within blocks of the window size instead, the
+    # suffix of one block and the prefix of the next, so rounding error does not
+    # grow with the length of the series
+    missing = np.isnan(x) | np.isnan(y)
+    x, y = np.where(missing, 0.0, x), np.where(missing, 0.0, y)
+    terms = np.stack([x, y, x * x, y * y, x * y, missing], axis=1)
+    result = np.full((x.shape[0], 5), np.nan)
+    if x.shape[0] < window:
+        return result
+    if compensated:
+        pad = (-x.shape[0]) % window
+        blocks = np.vstack([terms, np.zeros((pad, 6))]).reshape(-1, window, 6)
+        prefix = np.cumsum(blocks, axis=1).reshape(-1, 6)
+        suffix = np.cumsum(blocks[:, ::-1], axis=1)[:, ::-1].reshape(-1, 6)
+        end = np.arange(window - 1, x.shape[0])
+        start = end - window + 1
+        sums = np.where(
+            (start % window == 0)[:, np.newaxis],
+            prefix[end],
+            suffix[start] + prefix[end],
+        )
+    else:
+        prefix = np.cumsum(np.vstack([np.zeros((1, 6)), terms]), axis=0)
+        sums = prefix[window:] - prefix[:-window]
+    sums[sums[:, 5] > 0, :5] = np.nan
+    result[window - 1 :] = sums[:, :5]
+    return result
+
+
+def _tail_rank(n: int, q: float):
+    # rank of the q quantile of n sorted values, and the fraction of the way to
+    # the next value, the same as numpy's and pandas' linear interpolation
+    pos = (n - 1) * q
+    k = int(math.floor(pos))
+    return k, pos - k
+
+
+def _np_rolling_tail(values: np.ndarray, window: int, q: float) -> np.ndarray:
+    # sorted copy of the window, kept in a list: positions are found with a
+    # binary search, and the list shifts in C, so each step is O(log w) compares.
+    # the sum of the k + 1 lowest values is updated as values cross rank k, and
+    # summed again once per window so rounding errors do not build up
+    result = np.full((values.shape[0], 2), np.nan)
+    k, frac = _tail_rank(window, q)
+    ordered, nans, tail = [], 0, 0.0
+    for i, value in enumerate(values.tolist()):
+        if i >= window:
+            old = values[i - window]
+            if math.isnan(old):
+                nans -= 1
+            else:
+                j = bisect.bisect_left(ordered, old)
+                if j <= k:
+                    tail -= old
+                    if len(ordered) > k + 1:
+                        tail += ordered[k + 1]
+                del ordered[j]
+        if math.isnan(value):
+            nans += 1
+        else:
+            j = bisect.bisect_right(ordered, value)
+            if j <= k:
+                tail += value
+                if len(ordered) > k:
+                    tail -= ordered[k]
+            ordered.insert(j, value)
+        if i % window == 0:
+            tail = sum(ordered[: k + 1])
+        if i >= window - 1 and nans == 0:
+            low, high = ordered[k], ordered[min(k + 1, window - 1)]
+            result[i, 0] = low + (high - low) * frac
+            result[i, 1] = tail / (k + 1)
+    return result
+
+
+# Loop kernels
+# ------------
+# Plain loops, written so numba can compile them in nopython mode. They follow the
+# same NaN conventions as the NumPy kernels.
+
+
+def _log_growth(value):
+    # log of the magnitude of the growth 1 + r, and whether it is negative or 0,
+    # which log_compound sums in the same way
+    if value > -1.0:
+        return math.log1p(value), 0, 0
+    if value == -1.0:
+        return 0.0, 0, 1
+    return math.log(-1.0 - value), 1, 0
+
+
+def _from_log_growth(total, negatives, zeros):
+    if zeros > 0:
+        return -1.0
+    if negatives % 2 == 1:
+        return -math.exp(total) - 1.0
+    return math.expm1(total)
+
+
+def _loop_compound_geometric(values):
+    total = 0.0
+    negatives = 0
+    zeros = 0
+    for i in range(values.shape[0]):
+        if not math.isnan(values[i]):
+            log, negative, zero = _log_growth(values[i])
+            total += log
+            negatives += negative
+            zeros += zero
+    return _from_log_growth(total, negatives, zeros)
+
+
+def _loop_compound_arithmetic(values):
+    total = 0.0
+    for i in range(values.shape[0]):
+        if not math.isnan(values[i]):
+            total += values[i]
+    return total
+
+
+def _loop_compound_continuous(values):
+    total = 0.0
+    for i in range(values.shape[0]):
+        if not math.isnan(values[i]):
+            total += values[i]
+    return math.expm1(total)
+
+
+def _loop_cumseries_geometric(values):
+    result = np.empty(values.shape[0])
+    total = 0.0
+    negatives = 0
+    zeros = 0
+    for i in range(values.shape[0]):
+        if math.isnan(values[i]):
+            result[i] = np.nan
+        else:
+            log, negative, zero = _log_growth(values[i])
+            total += log
+            negatives += negative
+            zeros += zero
+            result[i] = _from_log_growth(total, negatives, zeros)
+    return result
+
+
+def _loop_cumseries_arithmetic(values):
+    result = np.empty(values.shape[0])
+    total = 0.0
+    for i in range(values.shape[0]):
+        if math.isnan(values[i]):
+            result[i] = np.nan
+        else:
+            total += values[i]
+            result[i] = total
+    return result
+
+
+def _loop_cumseries_continuous(values):
+    result = np.empty(values.shape[0])
+    total = 0.0
+    for i in range(values.shape[0]):
+        if math.isnan(values[i]):
+            result[i] = np.nan
+        else:
+            total += values[i]
+            result[i] = math.expm1(total)
+    return result
+
+
+def _loop_rolling_geometric(values, window):
+    # sum of log returns per window, a running sum would turn a -100% return
+    # into -inf and poison every window after it
+    n = values.shape[0]
+    result = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        total = 0.0
+        negatives = 0
+        zeros = 0
+        for j in range(i - window + 1, i + 1):
+            if math.isnan(values[j]):
+                total = np.nan
+                break
+            log, negative, zero = _log_growth(values[j])
+            total += log
+            negatives += negative
+            zeros += zero
+        if not math.isnan(total):
+            result[i] = _from_log_growth(total, negatives, zeros)
+    return result
+
+
+def _loop_rolling_sum(values, window, exp):
+    # running sum over the window, O(n). NaN are counted rather than added, so a
+    # window containing NaN is reported as NaN without corrupting the running sum.
+    n = values.shape[0]
+    result = np.full(n, np.nan)
+    total = 0.0
+    nans = 0
+    for i in range(n):
+        if math.isnan(values[i]):
+            nans += 1
+        else:
+            total += values[i]
+        if i >= window:
+            if math.isnan(values[i - window]):
+                nans -= 1
+            else:
+                total -= values[i - window]
+        if i >= window - 1 and nans == 0:
+            result[i] = math.expm1(total) if exp else total
+    return result
+
+
+def _loop_rolling_arithmetic(values, window):
+    return _loop_rolling_sum(values, window, False)
+
+
+def _loop_rolling_continuous(values, window):
+    return _loop_rolling_sum(values, window, True)
+
+
+def _loop_rolling_std(values, window, ddof):
+    # two pass standard deviation per window, which is as precise as numpy's
+    n = values.shape[0]
+    result = np.full(n, np.nan)
+    if window <= ddof:
+        return result
+    for i in range(window - 1, n):
+        mean = 0.0
+        for j in range(i - window + 1, i + 1):
+            mean += values[j]
+        mean /= window
+        ssq = 0.0
+        for j in range(i - window + 1, i + 1):
+            ssq += (values[j] - mean) ** 2
+        result[i] = math.sqrt(ssq / (window - ddof))
+    return result
+
+
+def _loop_rolling_comoments(x, y, window, compensated):
+    # running sums of x, y, x^2, y^2 and xy over the window, O(n). Pairs with a
+    # NaN are counted rather than added. Neumaier summation keeps the rounding
+    # error of adding and removing terms in a separate compensation term.
+    n = x.shape[0]
+    result = np.full((n, 5), np.nan)
+    total = np.zeros(5)
+    error = np.zeros(5)
+    term = np.empty(5)
+    nans = 0
+    for i in range(n):
+        for step in range(2):
+            j = i if step == 0 else i - window
+            if j < 0:
+                continue
+            if math.isnan(x[j]) or math.isnan(y[j]):
+                nans += 1 if step == 0 else -1
+                continue
+            sign = 1.0 if step == 0 else -1.0
+            term[0] = sign * x[j]
+            term[1] = sign * y[j]
+            term[2] = sign * x[j] * x[j]
+            term[3] = sign * y[j] * y[j]
+            term[4] = sign * x[j] * y[j]
+            for k in range(5):
+                if compensated:
+                    t = total[k] + term[k]
+                    if abs(total[k]) >= abs(term[k]):
+                        error[k] += (total[k] - t) + term[k]
+                    else:
+                        error[k] += (term[k] - t) + total[k]
+                    total[k] = t
+                else:
+                    total[k] += term[k]
+        if i >= window - 1 and nans == 0:
+            for k in range(5):
+                result[i, k] = total[k] + error[k]
+    return result
+
+
+def _fenwick_add(counts, sums, pos, count, value):
+    # adds count values at position pos, 1-based, of binary indexed trees of the
+    # number and the sum of values at each position
+    while pos < counts.shape[0]:
+        counts[pos] += count
+        sums[pos] += value
+        pos += pos & -pos
+
+
+def _fenwick_select(counts, sums, rank, step):
+    # position of the value of rank rank, 0-based, and the sum of the values
+    # ranked before it, walking down the trees from step, the largest power of 2
+    # below their size
+    pos = 0
+    total = 0.0
+    while step > 0:
+        if pos + step < counts.shape[0] and counts[pos + step] <= rank:
+            pos += step
+            rank -= counts[pos]
+            total += sums[pos]
+        step //= 2
+    return pos + 1, total
+
+
+def _loop_rolling_tail(values, window, q):
+    # each value is ranked once in the whole series, and the window is held in
+    # binary indexed trees over ranks, so a step costs O(log n) without shifting
+    # the window, and the sum of the k + 1 lowest values comes with the search
+    n = values.shape[0]
+    result = np.full((n, 2), np.nan)
+    k, frac = _tail_rank(window, q)
+    order = np.argsort(values, kind="mergesort")
+    ordered = values[order]
+    ranks = np.empty(n, dtype=np.int64)
+    for m in range(n):
+        ranks[order[m]] = m + 1
+    counts = np.zeros(n + 1, dtype=np.int64)
+    sums = np.zeros(n + 1)
+    step = 1
+    while step * 2 <= n:
+        step *= 2
+    nans = 0
+    for i in range(n):
+        if i >= window:
+            old = values[i - window]
+            if math.isnan(old):
+                nans -= 1
+            else:
+                _fenwick_add(counts, sums, ranks[i - window], -1, -old)
+        value = values[i]
+        if math.isnan(value):
+            nans += 1
+        else:
+            _fenwick_add(counts, sums, ranks[i], 1, value)
+        if i >= window - 1 and nans == 0:
+            pos, total = _fenwick_select(counts, sums, k, step)
+            low = high = ordered[pos - 1]
+            if k + 1 < window:
+                high = ordered[_fenwick_select(counts, sums, k + 1, step)[0] - 1]
+            result[i, 0] = low + (high - low) * frac
+            result[i, 1] = (total + low) / (k + 1)
+    return result
+
+
+_NUMPY_KERNELS = {
+    "compound_geometric": _np_compound_geometric,
+    "compound_arithmetic": _np_compound_arithmetic,
+    "compound_continuous": _np_compound_continuous,
+    "cumseries_geometric": _np_cumseries_geometric,
+    "cumseries_arithmetic": _np_cumseries_arithmetic,
+    "cumseries_continuous": _np_cumseries_continuous,
+    "rolling_geometric": _np_rolling_geometric,
+    "rolling_arithmetic": _np_rolling_arithmetic,
+    "rolling_continuous": _np_rolling_continuous,
+    "rolling_std": _np_rolling_std,
+    "rolling_comoments": _np_rolling_comoments,
+    "rolling_tail": _np_rolling_tail,
+}
+
+_LOOP_KERNELS = {
+    "compound_geometric": _loop_compound_geometric,
+    "compound_arithmetic": _loop_compound_arithmetic,
+    "compound_continuous": _loop_compound_continuous,
+    "cumseries_geometric": _loop_cumseries_geometric,
+    "cumseries_arithmetic": _loop_cumseries_arithmetic,
+    "cumseries_continuous": _loop_cumseries_continuous,
+    "rolling_geometric": _loop_rolling_geometric,
+    "rolling_arithmetic": _loop_rolling_arithmetic,
+    "rolling_continuous": _loop_rolling_continuous,
+    "rolling_std": _loop_rolling_std,
+    "rolling_comoments": _loop_rolling_comoments,
+    "rolling_tail": _loop_rolling_tail,
+}
+
+KERNELS = {"numpy": _NUMPY_KERNELS}
+
+if numba is not None:
+
+    # shared helpers are compiled first, so the kernels calling them resolve to
+    # the compiled versions when they are compiled lazily on first call
+    _loop_rolling_sum = numba.njit(nogil=True)(_loop_rolling_sum)
+    _log_growth = numba.njit(nogil=True)(_log_growth)
+    _from_log_growth = numba.njit(nogil=True)(_from_log_growth)
+    _tail_rank = numba.njit(nogil=True)(_tail_rank)
+    _fenwick_add = numba.njit(nogil=True)(_fenwick_add)
+    _fenwick_select = numba.njit(nogil=True)(_fenwick_select)
+
+    KERNELS["numba"] = {
+        name: numba.njit(nogil=True)(kernel) for name, kernel in _LOOP_KERNELS.items()
+    }
+
+
+def _resolve_backend(backend: Optional[str] = None) -> str:
+    """Resolves the backend to use, falling back to numpy when unavailable."""
+
+    if backend is None:
+        backend = get_option("backend")
+
+    if backend not in KERNELS:
+        log.debug(f"Backend not available, using numpy. backend={backend}")
+        backend = "numpy"
+
+    return backend
+
+
+def get_kernel(name: str, backend: Optional[str] = None) -> Callable:
+    """Gets a compiled or vectorized kernel by name.
+
+    Args:
+        name: name of the kernel, e.g. 'compound_geometric', 'rolling_std'
+        backend: {'numpy', 'numba'}. Defaults to None, which uses the
+            ``backend`` option set via ``pyform.set_option``. 'numba' falls back
+            to 'numpy' when numba is not installed.
+
+    Raises:
+        ValueError: when kernel does not exist
+
+    Returns:
+        Callable: kernel that takes a 1-d float64 numpy array as first argument
+    """
+
+    backend = _resolve_backend(backend)
+
+    try:
+        return KERNELS[backend][name]
+    except KeyError:
+        raise ValueError(f"Kernel does not exist: name={name}")
+
+
+def run_kernel(
+    name: str, values: np.ndarray, *args, backend: Optional[str] = None
+) -> Union[float, np.ndarray]:
+    """Runs a kernel over a 1-d array, or over each column of a 2-d array.
+
+    NumPy kernels process all columns of a 2-d array in one call, compiled loop
+    kernels are called once per column.
+
+    Args:
+        name: name of the kernel, e.g. 'compound_geometric', 'cumseries_geometric'
+        values: 1-d array, or 2-d array with one series per column
+        args: additional arguments of the kernel
+        backend: {'numpy', 'numba'}. Defaults to None, which uses the
+            ``backend`` option set via ``pyform.set_option``.
+
+    Returns:
+        Union[float, np.ndarray]: kernel result. For a 2-d input, compounding
+            kernels return one value per column, and cumulative kernels return an
+            array of the same shape as values.
+    """
+
+    backend = _resolve_backend(backend)
+    kernel = get_kernel(name, backend)
+
+    if values.ndim == 1 or backend == "numpy":
+        return kernel(values, *args)
+
+    return np.stack(
+        [
+            kernel(np.ascontiguousarray(values[:, i]), *args)
+            for i in range(values.shape[1])
+        ],
+        axis=-1,
+    )
@@ -1,7 +1,9 @@
 import math
+import numpy as np
 import pandas as pd
-from typing import Optional, Union
-from pyform.returns.compound import compound
+from typing import Dict, Optional, Union
+from pyform.returns.compound import compound, cumseries_values, rolling_compound
+from pyform.returns.kernels import as_float_array, get_kernel
 from pyform.util.freq import calc_samples_per_year, calc_timedelta_in_years
 
 
@@ -46,6 +48,38 @@ def calc_ann_vol(
     return vol
 
 
+def calc_rolling_ann_vol(
+    df: pd.DataFrame, window: int, method: str, samples_per_year: float,
+) -> pd.DataFrame:
+    """Computes rolling annualized volatility of a time indexed pandas dataframe
+
+    Args:
+        df: a time indexed pandas DataFrame of returns
+        window: number of periods in the rolling window
+        method: {'sample', 'population'}. method used to compute volatility
+            (standard deviation).
+        samples_per_year: number of samples per year, used for annualization.
+
+    Returns:
+        pd.DataFrame: rolling annualized volatility. The first ``window - 1`` rows
+            are NaN.
+    """
+
+    # delta degrees of freedom, used for calculate standard deviation
+    ddof = {"sample": 1, "population": 0}[method]
+
+    kernel = get_kernel("rolling_std")
+    scale = math.sqrt(samples_per_year)
+
+    return pd.DataFrame(
+        data={
+            col: kernel(as_float_array(df[col]), window, ddof) * scale
+            for col in df.columns
+        },
+        index=df.index,
+    )
+
+
 def calc_ann_ret(
     series: Union[pd.DataFrame, pd.Series], method: str, years: Optional[float] = None,
 ) -> float:
@@ -81,3 +115,321 @@ def calc_ann_ret(
         ann_ret = math.log(tot_ret + 1) * (1 / years)
 
     return ann_ret
+
+
+def annualize_ret(
+    tot_ret: Union[float, np.ndarray], years: Union[float, np.ndarray], method: str
+) -> Union[float, np.ndarray]:
+    """Annualizes total returns, element wise, the same way as ``calc_ann_ret``
+
+    Args:
+        tot_ret: total returns, in decimals
+        years: number of years each total return is over
+        method: {'geometric', 'arithmetic', 'continuous'}. method used to compound
+            returns
+
+    Returns:
+        Union[float, np.ndarray]: annualized returns
+    """
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+
+        if method == "geometric":
+            ann_ret = (tot_ret + 1) ** (1 / years) - 1
+        elif method == "arithmetic":
+            ann_ret = tot_ret * (1 / years)
+        elif method == "continuous":
+            ann_ret = np.log(tot_ret + 1) * (1 / years)
+
+    return ann_ret
+
+
+def calc_rolling_ann_ret(
+    df: pd.DataFrame, window: int, method: str, years: np.ndarray,
+) -> pd.DataFrame:
+    """Computes rolling annualized return of a time indexed pandas dataframe
+
+    Args:
+        df: a time indexed pandas DataFrame of returns
+        window: number of periods in the rolling window
+        method: {'geometric', 'arithmetic', 'continuous'}. method used to compound
+            returns
+        years: number of years covered by the window ending at each row, see
+            ``calc_rolling_years``.
+
+    Returns:
+        pd.DataFrame: rolling annualized return. The first ``window - 1`` rows
+            are NaN.
+    """
+
+    tot_ret = rolling_compound(df, window, method)
+
+    return pd.DataFrame(
+        data={
+            col: annualize_ret(tot_ret[col].to_numpy(), years, method)
+            for col in df.columns
+        },
+        index=df.index,
+    )
+
+
+def calc_pairwise_moments(df: pd.DataFrame, ddof: int = 1) -> Dict[str, np.ndarray]:
+    """Computes pairwise complete means, variances and covariance matrix of all
+    columns of a DataFrame, in one pass of matrix multiplications.
+
+    For every pair of columns (i, j), only rows where both are available are used,
+    so series with different inception dates can be held in one DataFrame. Values
+    are centered by their column mean before multiplying, which keeps the one pass
+    formulas precise.
+
+    Args:
+        df: a time indexed pandas DataFrame of returns, one column per series.
+            Missing values are marked as NaN.
+        ddof: delta degrees of freedom. Defaults to 1.
+
+    Returns:
+        Dict[str, np.ndarray]: (k, k) matrices, where k is the number of columns
+
+            * count: number of rows where both column i and j are available
+            * mean: mean of column i, over rows where column j is available
+            * var: variance of column i, over rows where column j is available
+            * cov: covariance of column i and j
+    """
+
+    values = df.to_numpy(dtype=np.float64)
+    available = ~np.isnan(values)
+    mask = available.astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+
+        center = np.nanmean(values, axis=0)
+        centered = np.where(available, values - center, 0.0)
+
+        count = mask.T @ mask
+        total = centered.T @ mask
+        total_sq = (centered ** 2).T @ mask
+        cross = centered.T @ centered
+
+        mean = total / count + center[:, np.newaxis]
+        var = (total_sq - total ** 2 / count) / (count - ddof)
+        cov = (cross - total * total.T / count) / (count - ddof)
+
+    return {"count": count, "mean": mean, "var": var, "cov": cov}
+
+
+def calc_bm_stats(
+    moments: Dict[str, np.ndarray],
+    samples_per_year: float,
+    risk_free: Union[float, np.ndarray] = 0,
+) -> pd.DataFrame:
+    """Computes benchmark relative statistics of the first series against all
+    other series, from pairwise moments.
+
+    Args:
+        moments: pairwise moments, as computed by ``calc_pairwise_moments``. The
+            first series is the main series, others are benchmarks.
+        samples_per_year: number of samples per year, used for annualization.
+        risk_free: risk free return per period, used for alpha. Either one value,
+            or one per benchmark, e.g. averaged over the periods it has in common
+            with the series. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: one row per benchmark, with columns
+
+            * correlation: correlation with the benchmark
+            * beta: CAPM beta against the benchmark
+            * alpha: annualized Jensen's alpha against the benchmark
+            * tracking error: annualized standard deviation of active return
+            * information ratio: annualized active return over tracking error
+            * used: number of periods used
+    """
+
+    count, mean = moments["count"][0, 1:], moments["mean"]
+    var, cov = moments["var"], moments["cov"][0, 1:]
+
+    # mean and variance of the series and the benchmarks, over common periods
+    series_mean, bm_mean = mean[0, 1:], mean[1:, 0]
+    series_var, bm_var = var[0, 1:], var[1:, 0]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+
+        corr = cov / np.sqrt(series_var * bm_var)
+        beta = cov / bm_var
+        alpha = (series_mean - risk_free) - beta * (bm_mean - risk_free)
+        alpha *= samples_per_year
+        tracking_error = np.sqrt(series_var + bm_var - 2 * cov)
+        tracking_error *= math.sqrt(samples_per_year)
+        active_return = (series_mean - bm_mean) * samples_per_year
+        info_ratio = active_return / tracking_error
+
+    return pd.DataFrame(
+        data={
+            "correlation": corr,
+            "beta": beta,
+            "alpha": alpha,
+            "tracking error": tracking_error,
+            "information ratio": info_ratio,
+            "used": count.astype(int),
+        }
+    )
+
+
+def calc_rolling_bm_stats(
+    df: pd.DataFrame, window: int, field: str, compensated: bool = False, ddof: int = 1,
+) -> pd.DataFrame:
+    """Computes rolling benchmark relative statistics of the first series against
+    all other series, in one pass over each benchmark.
+
+    Running sums of x, y, x^2, y^2 and xy are kept over the window, so the cost
+    is O(n) regardless of window size. Values are centered by their column mean
+    before summing, which keeps the one pass formulas precise.
+
+    Args:
+        df: a time indexed pandas DataFrame of returns, one column per series. The
+            first column is the main series, others are benchmarks. Missing values
+            are marked as NaN.
+        window: number of periods in the rolling window
+        field: {'correlation', 'beta'}. statistic to compute
+        compensated: whether to keep rounding error of the running sums from
+            growing with the length of the series. The numpy backend combines
+            sums within blocks of the window size, and compiled loops use
+            Neumaier summation. Defaults to False.
+        ddof: delta degrees of freedom. Defaults to 1.
+
+    Raises:
+        ValueError: when field is not supported
+
+    Returns:
+        pd.DataFrame: rolling statistic, one column per benchmark. Windows with
+            missing values are NaN.
+    """
+
+    if field not in ["correlation", "beta"]:
+        raise ValueError("Field should be one of 'correlation' or 'beta'")
+
+    kernel = get_kernel("rolling_comoments")
+
+    x = as_float_array(df.iloc[:, 0])
+    x = x - np.nanmean(x)
+
+    result = dict()
+
+    for col in df.columns[1:]:
+
+        y = as_float_array(df[col])
+        y = y - np.nanmean(y)
+
+        sum_x, sum_y, sum_xx, sum_yy, sum_xy = kernel(x, y, window, compensated).T
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+
+            cov = (sum_xy - sum_x * sum_y / window) / (window - ddof)
+            var_y = (sum_yy - sum_y ** 2 / window) / (window - ddof)
+
+            if field == "correlation":
+                var_x = (sum_xx - sum_x ** 2 / window) / (window - ddof)
+                result[col] = cov / np.sqrt(var_x * var_y)
+            else:
+                result[col] = cov / var_y
+
+    return pd.DataFrame(data=result, index=df.index, columns=df.columns[1:])
+
+
+def calc_expanding_ann_ret(
+    series: Union[pd.DataFrame, pd.Series], dates: pd.DatetimeIndex, method: str,
+) -> pd.DataFrame:
+    """Computes total and annualized return since the first return, as of each
+    date, from one cumulative series.
+
+    The result as of a date is the same as ``calc_ann_ret`` over all returns up to
+    and including that date, but all dates are computed together in O(n).
+
+    Args:
+        series: a time indexed pandas DataFrame or Series of returns, without
+            missing values
+        dates: dates to compute the since inception figures as of
+        method: {'geometric', 'arithmetic', 'continuous'}. method used to compound
+            returns
+
+    Returns:
+        pd.DataFrame: indexed by dates, with columns
+
+            * total return: compounded return since the first return
+            * annualized return: annualized compounded return since the first
+                return
+
+            Dates before the first return are NaN.
+    """
+
+    if isinstance(series, pd.DataFrame):
+        returns = series.iloc[:, 0]
+    elif isinstance(series, pd.Series):
+        returns = series
+
+    cumulative = cumseries_values(as_float_array(returns), method)
+
+    # position of the last return on or before each date
+    pos = np.searchsorted(returns.index, dates, side="right") - 1
+    valid = pos >= 0
+    pos = np.maximum(pos, 0)
+
+    tot_ret = np.where(valid, cumulative[pos], np.nan)
+    years = calc_timedelta_in_years(returns.index[0], returns.index[pos])
+    ann_ret = annualize_ret(tot_ret, np.asarray(years, dtype=np.float64), method)
+
+    return pd.DataFrame(
+        data={"total return": tot_ret, "annualized return": ann_ret}, index=dates
+    )
+
+
+def calc_expanding_ann_vol(
+    series: Union[pd.DataFrame, pd.Series],
+    method: str,
+    start: pd.Timestamp,
+    ends: pd.DatetimeIndex,
+) -> pd.Series:
+    """Computes annualized volatility since the first return, as of each period,
+    from cumulative sums.
+
+    The result as of a period is the same as ``calc_ann_vol`` over all returns up
+    to and including that period, but all periods are computed together in O(n).
+
+    Args:
+        series: a time indexed pandas DataFrame or Series of returns, without
+            missing values
+        method: {'sample', 'population'}. method used to compute volatility
+            (standard deviation).
+        start: start date of the returns, used for annualization
+        ends: end date of the returns as of each period, used for annualization
+
+    Returns:
+        pd.Series: annualized volatility, as of each period. Periods without enough
+            returns to compute a standard deviation are NaN.
+    """
+
+    # delta degrees of freedom, used for calculate standard deviation
+    ddof = {"sample": 1, "population": 0}[method]
+
+    if isinstance(series, pd.DataFrame):
+        returns = series.iloc[:, 0]
+    elif isinstance(series, pd.Series):
+        returns = series
+
+    # centering keeps the cumulative sums of squares precise
+    values = as_float_array(returns)
+    values = values - values.mean()
+
+    count = np.arange(1, len(values) + 1, dtype=np.float64)
+    total = np.cumsum(values)
+    total_sq = np.cumsum(values ** 2)
+
+    years = calc_timedelta_in_years(start, ends)
+    samples_per_year = count / np.asarray(years, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (total_sq - total ** 2 / count) / (count - ddof)
+        vol = np.sqrt(np.maximum(var, 0) * samples_per_year)
+
+    vol[count <= ddof] = np.nan
+
+    return pd.Series(vol, index=returns.index)
@@ -0,0 +1,284 @@
+import numpy as np
+from typing import Union
+
+# moments of a single series are floats, of many series arrays with one per series
+Value = Union[float, np.ndarray]
+
+
+class Moments:
+    """Moments of return series, accumulated in one pass and mergeable.
+
+    Holds the count, mean and central sums of powers up to the fourth, along with
+    the partial moment below a threshold used for downside deviation. Values can
+    be added in batches with ``update``, and moments computed over separate
+    chunks or processes can be combined with ``merge`` (or ``+``), with the
+    pairwise formulas of Chan et al. and Pébay. Merging is exact up to rounding,
+    so results match moments computed over all values at once.
+
+    A 1-d input is one series, and a 2-d input holds one series per column.
+
+    Args:
+        threshold: return per period below which returns count as downside.
+            Defaults to 0.
+    """
+
+    def __init__(self, threshold: float = 0.0):
+
+        self.threshold = threshold
+
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+
+        # sum of squared shortfalls below the threshold, and how many there were
+        self.lower_m2 = 0.0
+        self.lower_count = 0
+
+    def __repr__(self) -> str:
+
+        return f"Moments(count={self.count}, threshold={self.threshold})"
+
+    def __add__(self, other: "Moments") -> "Moments":
+
+        return self.merge(other)
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, threshold: float = 0.0) -> "Moments":
+        """Computes moments of values, skipping missing values.
+
+        Args:
+            values: returns, one series per column if 2-d
+            threshold: return per period below which returns count as downside.
+                Defaults to 0.
+
+        Returns:
+            Moments: moments of the values
+        """
+
+        values = np.asarray(values, dtype=np.float64)
+        missing = np.isnan(values)
+
+        moments = cls(threshold)
+        moments.count = np.sum(~missing, axis=0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+
+            moments.mean = np.sum(np.where(missing, 0, values), axis=0) / moments.count
+
+            # centered by the batch mean, which keeps the sums of powers precise
+            deviation = np.where(missing, 0, values - moments.mean)
+            squared = deviation * deviation
+
+            moments.m2 = np.sum(squared, axis=0)
+            moments.m3 = np.sum(squared * deviation, axis=0)
+            moments.m4 = np.sum(squared * squared, axis=0)
+
+            shortfall = np.where(missing, 0, np.minimum(values - threshold, 0))
+
+        moments.lower_m2 = np.sum(shortfall * shortfall, axis=0)
+        moments.lower_count = np.sum(shortfall < 0, axis=0)
+
+        return moments
+
+    def update(self, values: np.ndarray) -> "Moments":
+        """Adds a batch of values, e.g. a chunk of a series.
+
+        Args:
+            values: returns, one series per column if 2-d
+
+        Returns:
+            Moments: self, including the values
+        """
+
+        merged = self.merge(Moments.from_values(values, self.threshold))
+        self.__dict__.update(merged.__dict__)
+
+        return self
+
+    def merge(self, other: "Moments") -> "Moments":
+        """Combines moments of two disjoint sets of values.
+
+        Args:
+            other: moments of the other values
+
+        Raises:
+            ValueError: when the moments use different thresholds
+
+        Returns:
+            Moments: moments of all values
+        """
+
+        if self.threshold != other.threshold:
+            raise ValueError(
+                "Cannot merge moments with different thresholds: "
+                f"threshold={self.threshold}, other={other.threshold}"
+            )
+
+        na, nb = self.count, other.count
+        n = na + nb
+
+        result = Moments(self.threshold)
+        result.count = n
+        result.lower_m2 = self.lower_m2 + other.lower_m2
+        result.lower_count = self.lower_count + other.lower_count
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+
+            # an empty side contributes nothing, and has no mean to move towards
+            delta = np.where(nb == 0, 0, np.where(na == 0, 0, other.mean - self.mean))
+            nn = np.where(n == 0, 1, n).astype(np.float64)
+
+            result.mean = np.where(
+                na == 0,
+                other.mean,
+                np.where(nb == 0, self.mean, self.mean + delta * nb / nn),
+            )
+            result.m2 = self.m2 + other.m2 + delta ** 2 * na * nb / nn
+            result.m3 = (
+                self.m3
+                + other.m3
+                + delta ** 3 * na * nb * (na - nb) / nn ** 2
+                + 3 * delta * (na * other.m2 - nb * self.m2) / nn
+            )
+            result.m4 = (
+                self.m4
+                + other.m4
+                + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / nn ** 3
+                + 6 * delta ** 2 * (na * na * other.m2 + nb * nb * self.m2) / nn ** 2
+                + 4 * delta * (na * other.m3 - nb * self.m3) / nn
+            )
+
+        return result
+
+    def raw_moment(self, order: int) -> Value:
+        """Computes a raw moment, the average of values to a power.
+
+        Args:
+            order: power, from 1 to 4
+
+        Returns:
+            Union[float, np.ndarray]: raw moment
+        """
+
+        # central sums of powers, the zeroth being the count
+        central = [self.count, 0.0, self.m2, self.m3, self.m4]
+
+        if order not in range(1, 5):
+            raise ValueError(f"Order should be between 1 and 4: order={order}")
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return sum(
+                _binomial(order, k) * self.mean ** (order - k) * central[k] / self.count
+                for k in range(order + 1)
+            )
+
+    def variance(self, method: str = "sample") -> Value:
+        """Computes variance.
+
+        Args:
+            method: {'sample', 'population'}. Defaults to "sample".
+
+        Returns:
+            Union[float, np.ndarray]: variance
+        """
+
+        ddof = _ddof(method)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = np.where(
+                self.count > ddof, self.m2 / (self.count - ddof), np.nan
+            )
+
+        return variance[()]
+
+    def std(self, method: str = "sample") -> Value:
+        """Computes standard deviation.
+
+        Args:
+            method: {'sample', 'population'}. Defaults to "sample".
+
+        Returns:
+            Union[float, np.ndarray]: standard deviation
+        """
+
+        return np.sqrt(self.variance(method))
+
+    def skew(self, method: str = "sample") -> Value:
+        """Computes skewness.
+
+        Args:
+            method: {'sample', 'population'}. 'sample' is the adjusted
+                Fisher-Pearson coefficient, the same as pandas. Defaults to
+                "sample".
+
+        Returns:
+            Union[float, np.ndarray]: skewness
+        """
+
+        n = self.count
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+
+            skew = np.sqrt(n) * self.m3 / self.m2 ** 1.5
+
+            if _ddof(method):
+                skew = skew * np.sqrt(n * (n - 1)) / (n - 2)
+
+            # 0 without variance, if there are enough values to estimate it at all
+            enough = n > (2 if _ddof(method) else 0)
+            return np.where(enough, np.where(self.m2 == 0, 0.0, skew), np.nan)[()]
+
+    def kurtosis(self, method: str = "sample") -> Value:
+        """Computes excess kurtosis, which is 0 for normally distributed returns.
+
+        Args:
+            method: {'sample', 'population'}. 'sample' is the unbiased estimate
+                under normality, the same as pandas. Defaults to "sample".
+
+        Returns:
+            Union[float, np.ndarray]: excess kurtosis
+        """
+
+        n = self.count
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+
+            kurt = n * self.m4 / self.m2 ** 2 - 3
+
+            if _ddof(method):
+                kurt = n * (n + 1) * (n - 1) * self.m4 / (
+                    (n - 2) * (n - 3) * self.m2 ** 2
+                ) - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+
+            # 0 without variance, if there are enough values to estimate it at all
+            enough = n > (3 if _ddof(method) else 0)
+            return np.where(enough, np.where(self.m2 == 0, 0.0, kurt), np.nan)[()]
+
+    def downside_deviation(self) -> Value:
+        """Computes downside deviation, the root mean squared shortfall below the
+        threshold, over all values.
+
+        Returns:
+            Union[float, np.ndarray]: downside deviation
+        """
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self.lower_m2 / self.count)
+
+
+def _ddof(method: str) -> int:
+    """Gets delta degrees of freedom of a method, 'sample' or 'population'."""
+
+    return {"sample": 1, "population": 0}[method]
+
+
+def _binomial(n: int, k: int) -> int:
+    """Computes the binomial coefficient n choose k."""
+
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+
+    return result
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple, Union
+from pyform.util.calendar import Calendar
+
+# target weights: static by component name, or a schedule with one row per date
+Weights = Union[Dict[str, float], pd.Series, pd.DataFrame]
+
+
+def _target_weights(df: pd.DataFrame, weights: Weights) -> pd.DataFrame:
+    """Gets target weights as a schedule, one row per date the targets apply from
+    and one column per component of df.
+
+    Raises:
+        ValueError: when weights name unknown components, or do not add up to 1
+    """
+
+    if isinstance(weights, dict):
+        weights = pd.Series(weights)
+
+    if isinstance(weights, pd.Series):
+        weights = pd.DataFrame([weights], index=df.index[:1])
+
+    unknown = set(weights.columns) - set(df.columns)
+    if unknown:
+        raise ValueError(f"Weights of unknown components: {sorted(unknown)}")
+
+    targets = weights.reindex(columns=df.columns).fillna(0).sort_index()
+
+    total = targets.sum(axis=1)
+    off = ~np.isclose(total, 1)
+    if off.any():
+        raise ValueError(
+            "Weights should add up to 1: "
+            f"date={total.index[off][0]}, total={total[off].iloc[0]}"
+        )
+
+    return targets
+
+
+def calc_portfolio(
+    df: pd.DataFrame,
+    weights: Weights,
+    rebalance: Optional[Union[str, Calendar]] = None,
+) -> Tuple[pd.Series, pd.DataFrame]:
+    """Computes returns of a portfolio of return series, with drifting weights
+
+    Between rebalances, each component grows with its own returns, so weights
+    drift away from their targets. On each rebalance, weights are reset to the
+    latest targets. The growth of all components in a holding period comes from
+    one cumulative product over the shared index, and portfolio returns from a
+    row wise dot product with the weights held.
+
+    Args:
+        df: a time indexed pandas dataframe of returns, one column per component.
+            Missing returns count as 0.
+        weights: target weights, adding up to 1. Either static weights, as a dict
+            or Series by component name, or a DataFrame schedule with one row of
+            weights per date they apply from, e.g. the dates of a model change.
+            Components missing from the weights are not held.
+        rebalance: frequency to rebalance to the targets at, e.g. "M", "Q" or "Y",
+            or a ``pyform.Calendar``. Weights are reset at the first date of
+            each period. Defaults to None, which only rebalances on the dates of
+            the weights schedule.
+
+    Raises:
+        ValueError: when weights name unknown components, or do not add up to 1
+
+    Returns:
+        Tuple[pd.Series, pd.DataFrame]: returns of the portfolio, and the weights
+            held over each period, from the first date of the targets
+    """
+
+    targets = _target_weights(df, weights)
+
+    index = df.index
+    values = df.to_numpy(dtype=np.float64)
+    values = np.where(np.isnan(values), 0, values)
+
+    # row each set of targets applies from, the latest of a row wins
+    target_pos = index.searchsorted(targets.index)
+    first = target_pos[0]
+    resets = set(target_pos[target_pos < len(index)].tolist())
+
+    if rebalance is not None:
+        if not isinstance(rebalance, Calendar):
+            rebalance = Calendar.from_freq(rebalance, index[0], index[-1], None)
+        periods = rebalance.bucket_ids(index)
+        resets.update((np.flatnonzero(np.diff(periods)) + 1).tolist())
+
+    starts = np.array(sorted(pos for pos in resets if pos >= first), dtype=np.int64)
+    ends = np.append(starts[1:], len(index))
+    which = np.searchsorted(target_pos, starts, side="right") - 1
+    target = targets.to_numpy(dtype=np.float64)
+
+    held = np.empty((len(index) - first, len(df.columns)))
+
+    for start, end, pos in zip(starts, ends, which):
+
+        # value of each holding before each row, per 1 invested at the reset
+        growth = np.cumprod(1 + values[start : end - 1], axis=0)
+        before = np.vstack([np.ones((1, len(df.columns))), growth]) * target[pos]
+
+        held[start - first : end - first] = before / before.sum(axis=1, keepdims=True)
+
+    returns = np.sum(held * values[first:], axis=1)
+
+    return (
+        pd.Series(returns, index=index[first:]),
+        pd.DataFrame(held, index=index[first:], columns=df.columns),
+    )
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+from pyform.returns.kernels import as_float_array, get_kernel
+
+
+def _check_level(level: float):
+    """Checks confidence level is between 0 and 1.
+
+    Raises:
+        ValueError: when level is not between 0 and 1
+    """
+
+    if not 0 < level < 1:
+        raise ValueError(f"Level should be between 0 and 1: level={level}")
+
+
+def _calc_tail(values: np.ndarray, level: float):
+    """Computes value at risk and conditional value at risk of one series, with
+    an O(n) selection of the values in the tail instead of a full sort.
+    """
+
+    values = values[~np.isnan(values)]
+    n = len(values)
+
+    if n == 0:
+        return np.nan, np.nan
+
+    pos = (n - 1) * (1 - level)
+    k = int(np.floor(pos))
+
+    # values before position k are smaller than it, in no particular order
+    tail = np.partition(values, [k, min(k + 1, n - 1)])
+    low, high = tail[k], tail[min(k + 1, n - 1)]
+
+    return low + (high - low) * (pos - k), tail[: k + 1].mean()
+
+
+def calc_var(
+    series: Union[pd.DataFrame, pd.Series], level: float = 0.95
+) -> Union[float, pd.Series]:
+    """Computes historical value at risk of a time indexed pandas series
+
+    Value at risk is the return only undercut in ``1 - level`` of periods, i.e.
+    the ``1 - level`` quantile of returns, interpolated the same way as
+    ``pd.Series.quantile``. Losses are negative.
+
+    Args:
+        series: a time indexed pandas DataFrame or Series of returns. Missing
+            values are skipped.
+        level: confidence level. Defaults to 0.95.
+
+    Raises:
+        ValueError: when level is not between 0 and 1
+
+    Returns:
+        Union[float, pd.Series]: value at risk, a float for a Series, and one value
+            per column for a DataFrame
+    """
+
+    _check_level(level)
+
+    if isinstance(series, pd.Series):
+        return _calc_tail(as_float_array(series), level)[0]
+
+    return pd.Series(
+        [_calc_tail(as_float_array(series[col]), level)[0] for col in series.columns],
+        index=series.columns,
+    )
+
+
+def calc_cvar(
+    series: Union[pd.DataFrame, pd.Series], level: float = 0.95
+) -> Union[float, pd.Series]:
+    """Computes historical conditional value at risk, or expected shortfall, of a
+    time indexed pandas series
+
+    Conditional value at risk is the average of the returns at or below the
+    rank of the value at risk. Losses are negative.
+
+    Args:
+        series: a time indexed pandas DataFrame or Series of returns. Missing
+            values are skipped.
+        level: confidence level. Defaults to 0.95.
+
+    Raises:
+        ValueError: when level is not between 0 and 1
+
+    Returns:
+        Union[float, pd.Series]: conditional value at risk, a float for a Series,
+            and one value per column for a DataFrame
+    """
+
+    _check_level(level)
+
+    if isinstance(series, pd.Series):
+        return _calc_tail(as_float_array(series), level)[1]
+
+    return pd.Series(
+        [_calc_tail(as_float_array(series[col]), level)[1] for col in series.columns],
+        index=series.columns,
+    )
+
+
+def _calc_rolling_tail(
+    df: pd.DataFrame, window: int, level: float, which: int
+) -> pd.DataFrame:
+    """Computes rolling value at risk (which=0) or conditional value at risk
+    (which=1) of each column.
+    """
+
+    _check_level(level)
+
+    kernel = get_kernel("rolling_tail")
+
+    return pd.DataFrame(
+        data={
+            col: kernel(as_float_array(df[col]), window, 1 - level)[:, which]
+            for col in df.columns
+        },
+        index=df.index,
+    )
+
+
+def calc_rolling_var(
+    df: pd.DataFrame, window: int, level: float = 0.95
+) -> pd.DataFrame:
+    """Computes rolling historical value at risk of a time indexed pandas dataframe
+
+    Each window is kept sorted as it rolls, by the kernels selected by the
+    ``backend`` option, so a step costs a binary search rather than a sort.
+
+    Args:
+        df: a time indexed pandas DataFrame of returns
+        window: number of periods in the rolling window
+        level: confidence level. Defaults to 0.95.
+
+    Raises:
+        ValueError: when level is not between 0 and 1
+
+    Returns:
+        pd.DataFrame: rolling value at risk. The first ``window - 1`` rows, and
+            windows with missing values, are NaN.
+    """
+
+    return _calc_rolling_tail(df, window, level, 0)
+
+
+def calc_rolling_cvar(
+    df: pd.DataFrame, window: int, level: float = 0.95
+) -> pd.DataFrame:
+    """Computes rolling historical conditional value at risk of a time indexed
+    pandas dataframe
+
+    Args:
+        df: a time indexed pandas DataFrame of returns
+        window: number of periods in the rolling window
+        level: confidence level. Defaults to 0.95.
+
+    Raises:
+        ValueError: when level is not between 0 and 1
+
+    Returns:
+        pd.DataFrame: rolling conditional value at risk. The first ``window - 1``
+            rows, and windows with missing values, are NaN.
+    """
+
+    return _calc_rolling_tail(df, window, level, 1)
@@ -0,0 +1,243 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import List, NamedTuple, Optional, Sequence, Union
+from pyform.returns.kernels import log_compound
+from pyform.returns.metrics import annualize_ret
+from pyform.util.freq import calc_period_bounds, calc_timedelta_in_years, infer_freq
+
+# Horizons of a typical fact sheet
+TRAILING_HORIZONS = ["1M", "3M", "YTD", "1Y", "3Y", "5Y", "10Y", "ITD"]
+
+
+class Horizon(NamedTuple):
+    """A trailing horizon, resolved as of a date.
+
+    Attributes:
+        label: label of the horizon, e.g. '3M'
+        after: returns after this date, and up to the as of date, are in the
+            horizon. NaT for inception to date, which starts with the first return
+            of each series.
+        annualize: whether returns over the horizon are annualized. None for
+            inception to date, which is annualized when it is longer than a year.
+    """
+
+    label: str
+    after: pd.Timestamp
+    annualize: Optional[bool]
+
+
+def resolve_horizons(
+    horizons: Sequence[Union[str, Horizon]], as_of: Union[str, pd.Timestamp]
+) -> List[Horizon]:
+    """Resolves horizon labels to the dates they start after, as of a date.
+
+    Horizons can be resolved once and reused for every series of a universe.
+
+    Args:
+        horizons: labels of the horizons. Available options are
+
+            * '<n>D', '<n>W', '<n>M', '<n>Y': trailing n days, weeks, months or
+                years. Months and years are counted in month ends when as of is a
+                month end, and are annualized when longer than a year.
+            * 'MTD', 'QTD', 'YTD': month, quarter and year to date
+            * 'ITD': inception to date
+
+            Horizons that are already resolved are kept as is.
+        as_of: date the horizons end on
+
+    Raises:
+        ValueError: when a horizon label is not supported
+
+    Returns:
+        List[Horizon]: resolved horizons
+    """
+
+    as_of = pd.Timestamp(as_of)
+    resolved = []
+
+    to_date = {
+        "MTD": pd.offsets.MonthEnd(),
+        "QTD": pd.offsets.QuarterEnd(),
+        "YTD": pd.offsets.YearEnd(),
+    }
+
+    for label in horizons:
+
+        if isinstance(label, Horizon):
+            resolved.append(label)
+            continue
+
+        if label == "ITD":
+            resolved.append(Horizon(label, pd.NaT, None))
+            continue
+
+        if label in to_date:
+            resolved.append(Horizon(label, as_of - to_date[label], False))
+            continue
+
+        match = re.fullmatch(r"(\d+)([DWMY])", label)
+
+        if match is None:
+            raise ValueError(f"Horizon is not supported: horizon={label}")
+
+        n, unit = int(match.group(1)), match.group(2)
+
+        if unit == "D":
+            after, annualize = as_of - pd.DateOffset(days=n), False
+        elif unit == "W":
+            after, annualize = as_of - pd.DateOffset(weeks=n), False
+        else:
+            months = n * 12 if unit == "Y" else n
+            annualize = months > 12
+
+            # keep month end data on month ends, e.g. 3M as of June 30 starts
+            # after March 31
+            if as_of.is_month_end:
+                after = as_of - pd.offsets.MonthEnd(months)
+            else:
+                after = as_of - pd.DateOffset(months=months)
+
+        resolved.append(Horizon(label, after, annualize))
+
+    return resolved
+
+
+def calc_trailing_returns(
+    df: Union[pd.DataFrame, pd.Series],
+    as_of: Union[str, pd.Timestamp],
+    horizons: Sequence[Union[str, Horizon]] = TRAILING_HORIZONS,
+    method: str = "geometric",
+    freq: Optional[str] = None,
+) -> pd.DataFrame:
+    """Computes trailing returns of many series over many horizons, as of a date.
+
+    Returns are turned into prefix sums (of ``log1p`` returns for geometric
+    compounding), horizons are converted to index positions with
+    ``searchsorted``, and every trailing return is a difference of two prefix
+    sums. A horizon is missing for a series that started after the horizon.
+
+    Returns are annualized over the years from the start of the horizon, or the
+    first day of the first period for inception to date, to the last day of the
+    last period, see ``calc_period_bounds``. So monthly and daily returns of a
+    series are annualized over the same years.
+
+    Args:
+        df: a time indexed pandas DataFrame of returns, one column per series, or
+            a pandas Series. Missing values are skipped.
+        as_of: date the horizons end on
+        horizons: labels of the horizons, or resolved horizons, see
+            ``resolve_horizons``. Defaults to TRAILING_HORIZONS.
+        method: {'geometric', 'arithmetic', 'continuous'}. method used to compound
+            returns. Defaults to "geometric".
+        freq: frequency of the returns. Defaults to None, which infers the
+            frequency from the index.
+
+    Raises:
+        ValueError: when method or a horizon is not supported, or the frequency
+            cannot be inferred
+
+    Returns:
+        pd.DataFrame: trailing returns, one row per series and one column per
+            horizon
+    """
+
+    if method not in ["geometric", "arithmetic", "continuous"]:
+        raise ValueError(
+            "Method should be one of 'geometric', 'arithmetic' or 'continuous'"
+        )
+
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+
+    horizons = resolve_horizons(horizons, as_of)
+    index = df.index
+
+    if freq is None and len(index) > 0:
+        freq = infer_freq(df)
+
+    # first day of each period, and its last day
+    period_start, period_end = calc_period_bounds(index, freq)
+    period_end = pd.DatetimeIndex(period_end) - pd.Timedelta(days=1)
+
+    values = df.to_numpy(dtype=np.float64)
+    available = ~np.isnan(values)
+    n, k = values.shape
+
+    # positions of the first return on or after, and the last return on or before
+    # each position, per series
+    positions = np.broadcast_to(np.arange(n)[:, np.newaxis], (n, k))
+    next_available = np.where(available, positions, n)
+    next_available = np.minimum.accumulate(next_available[::-1], axis=0)[::-1]
+    next_available = np.vstack([next_available, np.full((1, k), n)])
+    last_available = np.maximum.accumulate(np.where(available, positions, -1), axis=0)
+
+    columns = np.arange(k)
+    end = np.searchsorted(index, pd.Timestamp(as_of), side="right")
+    last = last_available[end - 1] if end > 0 else np.full(k, -1)
+    first = next_available[0]
+
+    # the first return of the frame covers a horizon starting up to about one
+    # period before it, allowing for weekends and holidays on daily data
+    step = np.median(np.diff(index.values)) if n > 1 else np.timedelta64(0)
+    tolerance = max(pd.Timedelta(step) * 1.5, pd.Timedelta(days=4))
+
+    starts, covered = [], []
+
+    for horizon in horizons:
+        if pd.isnull(horizon.after):
+            starts.append(first)
+            covered.append(True)
+        else:
+            starts.append(
+                np.full(k, np.searchsorted(index, horizon.after, side="right"))
+            )
+            covered.append(n > 0 and (index[0] - horizon.after <= tolerance))
+
+    starts = np.array(starts, dtype=np.int64).reshape(len(horizons), k)
+
+    def total(x):
+        # sums over every horizon at once, as differences of prefix sums
+        prefix = np.zeros((n + 1, k))
+        np.cumsum(np.where(available, x, 0.0), axis=0, out=prefix[1:])
+        return prefix[end] - prefix[starts, columns]
+
+    if method == "geometric":
+        tot_rets = log_compound(values, total)
+    elif method == "continuous":
+        tot_rets = np.expm1(total(values))
+    else:
+        tot_rets = total(values)
+
+    result = dict()
+
+    for horizon, start, is_covered, tot_ret in zip(horizons, starts, covered, tot_rets):
+
+        # first return of each series within the horizon
+        first_in = next_available[start, columns]
+        valid = (first <= start) & (first_in <= last) & ((start > 0) | is_covered)
+
+        first_in, last_in = np.minimum(first_in, n - 1), np.maximum(last, 0)
+
+        # horizons cover every day after the date they start after, also when
+        # their first period starts later, e.g. on the first business day
+        start_day = period_start[first_in]
+        if not pd.isnull(horizon.after):
+            after = (horizon.after + pd.Timedelta(days=1)).value
+            start_day = np.minimum(start_day, after)
+
+        years = calc_timedelta_in_years(
+            pd.DatetimeIndex(start_day), period_end[last_in]
+        )
+        years = np.asarray(years, dtype=np.float64)
+
+        annualize = horizon.annualize
+        if annualize is None:
+            annualize = years > 1
+
+        ann_ret = annualize_ret(tot_ret, years, method)
+        value = np.where(annualize, ann_ret, tot_ret)
+
+        result[horizon.label] = np.where(valid, value, np.nan)
+
+    return pd.DataFrame(data=result, index=df.columns)
@@ -3,12 +3,59 @@ import logging
 log = logging.getLogger(__name__)
 
 import copy
+import math
+import numpy as np
 import pandas as pd
-from typing import Optional, Union, Dict
+from typing import Optional, Union, Dict, Sequence, Tuple
+from pyform.config import get_option
 from pyform.timeseries import TimeSeries
-from pyform.returns.compound import compound, ret_to_period, cumseries
-from pyform.returns.metrics import calc_ann_vol, calc_ann_ret
-from pyform.util.freq import is_lower_freq, calc_samples_per_year
+from pyform.cache import cached
+from pyform.result import make_result
+from pyform.returns.compound import (
+    _compound_sums,
+    compound,
+    ret_to_period,
+    cumseries_frame,
+    rolling_compound,
+    series_to_period,
+)
+from pyform.returns.metrics import (
+    calc_ann_ret,
+    calc_rolling_ann_ret,
+    calc_rolling_ann_vol,
+    calc_pairwise_moments,
+    calc_bm_stats,
+    calc_rolling_bm_stats,
+    calc_expanding_ann_ret,
+    calc_expanding_ann_vol,
+)
+from pyform.returns.moments import Moments
+from pyform.returns.drawdown import (
+    calc_drawdown,
+    calc_max_drawdown,
+    calc_rolling_max_drawdown,
+)
+from pyform.returns.bootstrap import calc_bootstrap_ci
+from pyform.returns.portfolio import Weights, calc_portfolio
+from pyform.returns.tail import (
+    calc_var,
+    calc_cvar,
+    calc_rolling_var,
+    calc_rolling_cvar,
+)
+from pyform.returns.trailing import (
+    TRAILING_HORIZONS,
+    Horizon,
+    calc_trailing_returns,
+)
+from pyform.util.freq import (
+    calc_index_samples_per_year,
+    calc_period_bounds,
+    calc_rolling_years,
+)
+from pyform.util.calendar import Calendar
+from pyform.util.index import intern_frame_index
+from pyform.util.align import align_index, take
 
 
 class ReturnSeries(TimeSeries):
@@ -22,17 +69,28 @@ class ReturnSeries(TimeSeries):
         self.benchmark = dict()
         self.risk_free = dict()
 
+        # pairwise moments of the series and all benchmarks, computed once per
+        # frequency, compounding method and date range
+        self._bm_moments = dict()
+
+        # moments of the series, computed once per frequency, compounding method,
+        # threshold and date range
+        self._moments = dict()
+
         if name is None:
             self.name = self.series.columns[0]
         else:
             self.name = name
 
-    def to_period(self, freq: str, method: str) -> pd.DataFrame:
+    def to_period(self, freq: Union[str, Calendar], method: str) -> pd.DataFrame:
         """Converts return series to a different (and lower) frequency.
 
         Args:
             freq: frequency to convert the return series to.
                 Available options can be found `here <https://tinyurl.com/t78g6bh>`_.
+                A ``pyform.Calendar`` converts to its periods, e.g. fiscal months
+                or a 4-4-5 calendar, and can be passed as the ``freq`` argument of
+                all ``get_*`` methods as well.
             method: compounding method when converting to lower frequency.
 
                 * 'geometric': geometric compounding ``(1+r1) * (1+r2) - 1``
@@ -43,24 +101,13 @@ class ReturnSeries(TimeSeries):
             pd.DataFrame: return series in desired frequency
         """
 
-        # Use businessness days for all return series
-        if freq == "D":
-            freq = "B"
-
-        if freq == self.freq:
-            return self.series
-
-        # make sure it's not converting to a higher frequency
-        # e.g. trying to convert a monthly series into daily
-        try:
-            assert is_lower_freq(freq, self.freq)
-        except AssertionError:
-            raise ValueError(
-                "Cannot convert to higher frequency. "
-                f"target={freq}, current={self.freq}"
-            )
+        if isinstance(freq, Calendar):
+            return intern_frame_index(freq.to_period(self.series, method))
 
-        return ret_to_period(self.series, freq, method)
+        # converted series on the same calendar share one index
+        return intern_frame_index(
+            series_to_period(self.series, freq, method, self.freq)
+        )
 
     def to_week(self, method: Optional[str] = "geometric") -> pd.DataFrame:
         """Converts return series to weekly frequency.
@@ -118,6 +165,9 @@ class ReturnSeries(TimeSeries):
             * 'correlation': is the correlation between the return series and
                 the benchmark
             * 'beta': is the CAPM beta between the return series and the benchmark
+            * 'alpha': is the Jensen's alpha of the return series
+            * 'tracking error': is the volatility of the active return
+            * 'information ratio': is the active return over tracking error
 
         Args:
             benchmark: A benchmark. Should be a ReturnSeries object.
@@ -131,6 +181,9 @@ class ReturnSeries(TimeSeries):
         log.info(f"Adding benchmark. name={name}")
         self.benchmark[name] = copy.deepcopy(benchmark)
 
+        # moments no longer cover all benchmarks
+        self._bm_moments = dict()
+
     def add_rf(self, risk_free: "ReturnSeries", name: Optional[str] = None):
         """Adds a risk free rate for the return series.
 
@@ -151,6 +204,370 @@ class ReturnSeries(TimeSeries):
         log.info(f"Adding risk free rate. name={name}")
         self.risk_free[name] = copy.deepcopy(risk_free)
 
+    def _get_rf(self, risk_free: Union[float, int, str]) -> "ReturnSeries":
+        """Gets the risk free rate series.
+
+        Args:
+            risk_free: the risk free rate to use. If is float, use the value as
+                annualized risk free return, and create a constant cash series for
+                it. If is string, look for the corresponding risk free rate in
+                ``self.risk_free``.
+
+        Raises:
+            ValueError: when risk free rate with the given name is not set
+            TypeError: when risk free is not a str, float or int
+
+        Returns:
+            ReturnSeries: risk free rate series
+        """
+
+        if isinstance(risk_free, str):
+            try:
+                rf = self.risk_free[risk_free]
+            except KeyError:
+                raise ValueError(f"Risk free rate is not set: risk_free={risk_free}")
+        elif isinstance(risk_free, float) or isinstance(risk_free, int):
+            try:
+                rf = self.risk_free[f"cash_{risk_free}"]
+            except KeyError:
+                rf = CashSeries.constant(risk_free, self.start, self.end)
+                self.add_rf(rf, f"cash_{risk_free}")
+        else:
+            raise TypeError(
+                "Risk free should be str, float, or 0." f"received={type(risk_free)}"
+            )
+
+        return rf
+
+    @staticmethod
+    def _get_excess_ret(series: pd.DataFrame, risk_free: pd.DataFrame):
+        """Computes excess return of a series over the risk free rate.
+
+        The two are aligned on the union of their dates, with missing returns as
+        0, by gathering values with take indices rather than joining frames.
+
+        Args:
+            series: a time indexed pandas dataframe of returns
+            risk_free: a time indexed pandas dataframe of risk free returns
+
+        Returns:
+            Tuple[pd.DatetimeIndex, np.ndarray]: dates and excess returns
+        """
+
+        index, series_take, rf_take = align_index(
+            series.index, risk_free.index, "outer"
+        )
+        series_ret = take(series.iloc[:, 0].to_numpy(), series_take, 0)
+        rf_ret = take(risk_free.iloc[:, 0].to_numpy(), rf_take, 0)
+
+        # missing values within either series count as 0 as well
+        series_ret[np.isnan(series_ret)] = 0
+        rf_ret[np.isnan(rf_ret)] = 0
+
+        excess = series_ret - rf_ret
+
+        return index, excess
+
+    def _get_bm_frame(self, freq: str, compound_method: str):
+        """Gets returns of the series and all of its benchmarks in one frame.
+
+        Benchmarks are aligned to the date range of the series, and all returns
+        are converted to the desired frequency before they are joined.
+
+        Args:
+            freq: frequency to convert returns to
+            compound_method: method to use when compounding return
+
+        Returns:
+            Tuple[pd.DataFrame, List, List]: a date aligned DataFrame with the
+                series as first column and one column per benchmark, and the
+                start and end date of each benchmark within the date range
+        """
+
+        # Convert return
+        ret = self.to_period(freq=freq, method=compound_method)
+        returns, start, end = [ret.iloc[:, 0]], [], []
+
+        for name, benchmark in self.benchmark.items():
+
+            # keep record of start and so they can be reset later
+            bm_start, bm_end = benchmark.start, benchmark.end
+
+            # modify benchmark so it's in the same timerange as the returns series
+            self.align_daterange(benchmark)
+
+            # Convert benchmark to desired frequency
+            # note this is done after it's time range has been normalized
+            bm_ret = benchmark.to_period(freq=freq, method=compound_method)
+            returns.append(bm_ret.iloc[:, 0].rename(name))
+            start.append(benchmark.start)
+            end.append(benchmark.end)
+
+            # Reset bm daterange
+            benchmark.set_daterange(bm_start, bm_end)
+
+        # one date aligned frame for the series and all benchmarks
+        df = pd.concat(returns, axis=1, sort=True)
+
+        return df, start, end
+
+    def _get_bm_moments(self, freq: str, compound_method: str) -> Dict:
+        """Gets pairwise moments of the series and all of its benchmarks.
+
+        Returns of the series and its benchmarks are converted to the desired
+        frequency and joined in one wide DataFrame, and a single pairwise
+        covariance matrix is computed for all of them. The result is cached per
+        frequency, compounding method, sessions per year, and data and date range
+        of the series and its benchmarks, so each benchmark is only converted once
+        no matter how many statistics are computed.
+
+        Args:
+            freq: frequency to convert returns to
+            compound_method: method to use when compounding return
+
+        Returns:
+            Dict: pairwise moments, as computed by ``calc_pairwise_moments``, and
+
+                * names: name of the benchmarks
+                * start: start date of each benchmark, within the date range
+                * end: end date of each benchmark, within the date range
+                * samples_per_year: number of samples per year of the series
+                * index: dates of the joined returns
+                * common: (n, k) mask of dates where both the series and each
+                  benchmark have returns
+        """
+
+        # intraday series are annualized by the sessions_per_year option
+        key = (
+            freq,
+            compound_method,
+            self.key,
+            tuple(sorted((name, bm.key) for name, bm in self.benchmark.items())),
+            get_option("sessions_per_year"),
+        )
+
+        if key in self._bm_moments:
+            return self._bm_moments[key]
+
+        df, start, end = self._get_bm_frame(freq, compound_method)
+
+        moments = calc_pairwise_moments(df)
+        moments["names"] = list(self.benchmark.keys())
+        moments["start"] = start
+        moments["end"] = end
+        moments["samples_per_year"] = calc_index_samples_per_year(
+            df.iloc[:, 0].dropna().index, self.start, self.end
+        )
+        moments["index"] = df.index
+
+        available = df.notna().to_numpy()
+        moments["common"] = available[:, :1] & available[:, 1:]
+
+        self._bm_moments[key] = moments
+
+        return moments
+
+    def _get_bm_stat(
+        self,
+        field: str,
+        freq: str,
+        compound_method: str,
+        risk_free: Union[float, int, str],
+        meta: bool,
+    ) -> pd.DataFrame:
+        """Computes a benchmark relative statistic against all benchmarks.
+
+        Args:
+            field: {'correlation', 'beta', 'alpha', 'tracking error',
+                'information ratio'}. statistic to compute
+            freq: frequency to convert returns to
+            compound_method: method to use when compounding return
+            risk_free: the risk free rate to use, see ``get_sharpe``
+            meta: whether to include meta data in output
+
+        Raises:
+            ValueError: when no benchmark is set
+
+        Returns:
+            pd.DataFrame: statistic for each benchmark, see ``get_beta``
+        """
+
+        if not len(self.benchmark) > 0:
+            raise ValueError(f"{field.capitalize()} needs at least one benchmark.")
+
+        moments = self._get_bm_moments(freq, compound_method)
+
+        # risk free return per period, averaged over the same periods as the
+        # series and each benchmark are
+        rf_return = 0
+        if field == "alpha":
+            rf = self._get_rf(risk_free)
+            rf_ret = rf.series.loc[self.start : self.end]
+            rf_ret = ret_to_period(rf_ret, freq, compound_method).iloc[:, 0]
+            rf_ret = rf_ret.reindex(moments["index"]).to_numpy()
+
+            used = moments["common"] & ~np.isnan(rf_ret)[:, np.newaxis]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rf_return = np.where(used, rf_ret[:, np.newaxis], 0).sum(axis=0)
+                rf_return /= used.sum(axis=0)
+
+        stats = calc_bm_stats(moments, moments["samples_per_year"], rf_return)
+
+        if meta:
+
+            result = make_result(
+                data={
+                    "name": moments["names"],
+                    "field": field,
+                    "value": stats[field].tolist(),
+                    "freq": freq,
+                    "start": moments["start"],
+                    "end": moments["end"],
+                    "used": stats["used"].tolist(),
+                }
+            )
+
+        else:
+
+            result = make_result(
+                data={
+                    "name": moments["names"],
+                    "field": field,
+                    "value": stats[field].tolist(),
+                }
+            )
+
+        return result
+
+    def _get_moments(
+        self, freq: str, compound_method: str, threshold: Optional[float] = 0.0
+    ) -> Tuple[Moments, float]:
+        """Gets moments of the series, converted to the desired frequency.
+
+        Volatility, downside deviation, skewness and kurtosis all come from the
+        same moments, so the series is converted and walked once per frequency,
+        compounding method, threshold, sessions per year, data and date range.
+
+        Args:
+            freq: frequency to convert returns to
+            compound_method: method to use when compounding return
+            threshold: return per period below which returns count as downside.
+                Defaults to 0.
+
+        Returns:
+            Tuple[Moments, float]: moments of the series, and its number of
+                samples per year
+        """
+
+        # intraday series are annualized by the sessions_per_year option
+        key = (
+            freq,
+            compound_method,
+            threshold,
+            self.key,
+            get_option("sessions_per_year"),
+        )
+
+        if key not in self._moments:
+
+            ret = self.to_period(freq=freq, method=compound_method)
+            samples_per_year = calc_index_samples_per_year(
+                ret.index, self.start, self.end
+            )
+            moments = Moments.from_values(ret.iloc[:, 0].to_numpy(), threshold)
+
+            self._moments[key] = (moments, samples_per_year)
+
+        return self._moments[key]
+
+    def _get_moment_stat(
+        self,
+        field: str,
+        freq: str,
+        include_bm: bool,
+        method: str,
+        compound_method: str,
+        meta: bool,
+    ) -> pd.DataFrame:
+        """Computes a statistic of the moments of the series, and of its
+        benchmarks.
+
+        Args:
+            field: {'annualized volatility', 'skewness', 'kurtosis'}. statistic
+                to compute
+            freq: frequency to convert returns to
+            include_bm: whether to compute the statistic for benchmarks as well
+            method: {'sample', 'population'}. estimator of the statistic
+            compound_method: method to use when compounding return
+            meta: whether to include meta data in output
+
+        Returns:
+            pd.DataFrame: statistic for each series, see ``get_ann_vol``
+        """
+
+        # Columns in the returned dataframe
+        names, value, start, end = ([] for i in range(4))
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            try:
+
+                # keep record of start and so they can be reset later
+                series_start, series_end = series.start, series.end
+
+                # modify series so it's in the same timerange as the main series
+                self.align_daterange(series)
+
+                moments, samples_per_year = series._get_moments(freq, compound_method)
+
+                if field == "annualized volatility":
+                    stat = moments.std(method) * math.sqrt(samples_per_year)
+                elif field == "skewness":
+                    stat = moments.skew(method)
+                elif field == "kurtosis":
+                    stat = moments.kurtosis(method)
+
+                names.append(name)
+                value.append(stat)
+
+                if meta:
+                    start.append(series.start)
+                    end.append(series.end)
+
+                series.set_daterange(series_start, series_end)
+
+            except Exception as e:  # pragma: no cover
+
+                log.error(f"Cannot compute {field}: name={name}: {e}")
+                pass
+
+        if meta:
+
+            result = make_result(
+                data={
+                    "name": names,
+                    "field": field,
+                    "value": value,
+                    "freq": freq,
+                    "method": method,
+                    "start": start,
+                    "end": end,
+                }
+            )
+
+        else:
+
+            result = make_result(data={"name": names, "field": field, "value": value})
+
+        return result
+
+    @cached
     def get_corr(
         self,
         freq: Optional[str] = "M",
@@ -199,6 +616,32 @@ class ReturnSeries(TimeSeries):
         if not len(self.benchmark) > 0:
             raise ValueError("Correlation needs at least one benchmark.")
 
+        # pearson correlation comes from the covariance matrix shared by all
+        # benchmark statistics
+        if method == "pearson" and not meta:
+
+            return self._get_bm_stat("correlation", freq, compound_method, 0, meta)
+
+        if method == "pearson":
+
+            moments = self._get_bm_moments(freq, compound_method)
+            stats = calc_bm_stats(moments, moments["samples_per_year"], 0)
+            total = len(self.to_period(freq=freq, method=compound_method).index)
+
+            return make_result(
+                data={
+                    "name": moments["names"],
+                    "field": "correlation",
+                    "value": stats["correlation"].tolist(),
+                    "freq": freq,
+                    "method": method,
+                    "start": moments["start"],
+                    "end": moments["end"],
+                    "total": total,
+                    "used": stats["used"].tolist(),
+                }
+            )
+
         # Columns in the returned dataframe
         names, corr, start, end, used = ([] for i in range(5))
 
@@ -222,8 +665,15 @@ class ReturnSeries(TimeSeries):
                 # include additional days in the calculation
                 bm_ret = benchmark.to_period(freq=freq, method=compound_method)
 
-                # Join returns and benchmark to calculate correlation
-                df = ret.join(bm_ret, on="datetime", how="inner")
+                # Align returns and benchmark on common dates, and gather their
+                # values to calculate correlation, without joining frames
+                _, ret_take, bm_take = align_index(ret.index, bm_ret.index, "inner")
+                df = pd.DataFrame(
+                    data={
+                        "returns": take(ret.iloc[:, 0].to_numpy(), ret_take),
+                        "benchmark": take(bm_ret.iloc[:, 0].to_numpy(), bm_take),
+                    }
+                )
 
                 # Add correlation to list
                 corr.append(df.corr(method).iloc[0, 1])
@@ -246,7 +696,7 @@ class ReturnSeries(TimeSeries):
 
         if meta:
 
-            result = pd.DataFrame(
+            result = make_result(
                 data={
                     "name": names,
                     "field": "correlation",
@@ -262,80 +712,242 @@ class ReturnSeries(TimeSeries):
 
         else:
 
-            result = pd.DataFrame(
+            result = make_result(
                 data={"name": names, "field": "correlation", "value": corr}
             )
 
         return result
 
-    def get_tot_ret(
+    @cached
+    def get_beta(
         self,
-        include_bm: Optional[bool] = True,
-        method: Optional[str] = "geometric",
+        freq: Optional[str] = "M",
+        compound_method: Optional[str] = "geometric",
         meta: Optional[bool] = False,
     ) -> pd.DataFrame:
-        """Computes total return of the series
+        """Calculates CAPM beta of the return series against its benchmarks
 
         Args:
-            include_bm: whether to compute total return for benchmarks as well.
-                Defaults to True.
-            method: method to use when compounding total return.
+            freq: Returns are converted to the same frequency before beta
+                is compuated. Defaults to "M".
+            compound_method: {'geometric', 'arithmetic', 'continuous'}.
                 Defaults to "geometric".
             meta: whether to include meta data in output. Defaults to False.
                 Available meta are:
 
-                * method: method used to compound total return
-                * start: start date for calculating total return
-                * end: end date for calculating total return
+                * freq: frequency used to compute beta
+                * start: start date for calculating beta
+                * end: end date for calculating beta
+                * used: number of data points used when computing beta
+
+        Raises:
+            ValueError: when no benchmark is set
 
         Returns:
-            pd.DataFrame: total return results with the following columns
+            pd.DataFrame: beta results with the following columns
 
-                * name: name of the series
-                * field: name of the field. In this case, it is 'total return' for all
-                * value: total return value, in decimals
+                * name: name of the benchmark
+                * field: name of the field. In this case, it is 'beta' for all
+                * value: beta value
 
             Data described in meta will also be available in the returned DataFrame if
             meta is set to True.
         """
 
-        # Columns in the returned dataframe
-        names, total_return, start, end = ([] for i in range(4))
-
-        run_name, run_data = [self.name], [self]
-
-        if include_bm:
-            run_name += list(self.benchmark.keys())
-            run_data += list(self.benchmark.values())
+        return self._get_bm_stat("beta", freq, compound_method, 0, meta)
 
-        for name, series in zip(run_name, run_data):
+    @cached
+    def get_alpha(
+        self,
+        freq: Optional[str] = "M",
+        risk_free: Optional[Union[float, int, str]] = 0,
+        compound_method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Calculates annualized Jensen's alpha of the return series against its
+        benchmarks
 
-            try:
+        Args:
+            freq: Returns are converted to the same frequency before alpha
+                is compuated. Defaults to "M".
+            risk_free: the risk free rate to use. Can be a float or a string. If is
+                float, use the value as annualized risk free return. If is string,
+                look for the corresponding risk free rate in ``self.risk_free``.
+                Defaults to 0.
+            compound_method: {'geometric', 'arithmetic', 'continuous'}.
+                Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
 
-                # keep record of start and so they can be reset later
-                series_start, series_end = series.start, series.end
+                * freq: frequency used to compute alpha
+                * start: start date for calculating alpha
+                * end: end date for calculating alpha
+                * used: number of data points used when computing alpha
 
-                # modify series so it's in the same timerange as the main series
-                self.align_daterange(series)
-                tot_ret = compound(method)(series.series.iloc[:, 0])
+        Raises:
+            ValueError: when no benchmark is set
 
-                names.append(name)
-                total_return.append(tot_ret)
+        Returns:
+            pd.DataFrame: alpha results with the following columns
 
-                if meta:
-                    start.append(series.start)
-                    end.append(series.end)
+                * name: name of the benchmark
+                * field: name of the field. In this case, it is 'alpha' for all
+                * value: annualized alpha, in decimals
 
-                series.set_daterange(series_start, series_end)
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
 
-            except Exception as e:  # pragma: no cover
+        return self._get_bm_stat("alpha", freq, compound_method, risk_free, meta)
 
-                log.error(f"Cannot compute total return: name={name}: {e}")
+    @cached
+    def get_tracking_error(
+        self,
+        freq: Optional[str] = "M",
+        compound_method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Calculates annualized tracking error of the return series against its
+        benchmarks
+
+        Args:
+            freq: Returns are converted to the same frequency before tracking error
+                is compuated. Defaults to "M".
+            compound_method: {'geometric', 'arithmetic', 'continuous'}.
+                Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
+
+                * freq: frequency used to compute tracking error
+                * start: start date for calculating tracking error
+                * end: end date for calculating tracking error
+                * used: number of data points used when computing tracking error
+
+        Raises:
+            ValueError: when no benchmark is set
+
+        Returns:
+            pd.DataFrame: tracking error results with the following columns
+
+                * name: name of the benchmark
+                * field: name of the field. In this case, it is 'tracking error'
+                    for all
+                * value: annualized tracking error, in decimals
+
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
+
+        return self._get_bm_stat("tracking error", freq, compound_method, 0, meta)
+
+    @cached
+    def get_info_ratio(
+        self,
+        freq: Optional[str] = "M",
+        compound_method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Calculates information ratio of the return series against its benchmarks
+
+        Args:
+            freq: Returns are converted to the same frequency before information
+                ratio is compuated. Defaults to "M".
+            compound_method: {'geometric', 'arithmetic', 'continuous'}.
+                Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
+
+                * freq: frequency used to compute information ratio
+                * start: start date for calculating information ratio
+                * end: end date for calculating information ratio
+                * used: number of data points used when computing information ratio
+
+        Raises:
+            ValueError: when no benchmark is set
+
+        Returns:
+            pd.DataFrame: information ratio results with the following columns
+
+                * name: name of the benchmark
+                * field: name of the field. In this case, it is 'information ratio'
+                    for all
+                * value: information ratio value
+
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
+
+        return self._get_bm_stat("information ratio", freq, compound_method, 0, meta)
+
+    @cached
+    def get_tot_ret(
+        self,
+        include_bm: Optional[bool] = True,
+        method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Computes total return of the series
+
+        Args:
+            include_bm: whether to compute total return for benchmarks as well.
+                Defaults to True.
+            method: method to use when compounding total return.
+                Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
+
+                * method: method used to compound total return
+                * start: start date for calculating total return
+                * end: end date for calculating total return
+
+        Returns:
+            pd.DataFrame: total return results with the following columns
+
+                * name: name of the series
+                * field: name of the field. In this case, it is 'total return' for all
+                * value: total return value, in decimals
+
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
+
+        # Columns in the returned dataframe
+        names, total_return, start, end = ([] for i in range(4))
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            try:
+
+                # keep record of start and so they can be reset later
+                series_start, series_end = series.start, series.end
+
+                # modify series so it's in the same timerange as the main series
+                self.align_daterange(series)
+                tot_ret = compound(method)(series.series.iloc[:, 0])
+
+                names.append(name)
+                total_return.append(tot_ret)
+
+                if meta:
+                    start.append(series.start)
+                    end.append(series.end)
+
+                series.set_daterange(series_start, series_end)
+
+            except Exception as e:  # pragma: no cover
+
+                log.error(f"Cannot compute total return: name={name}: {e}")
                 pass
 
         if meta:
 
-            result = pd.DataFrame(
+            result = make_result(
                 data={
                     "name": names,
                     "field": "total return",
@@ -348,18 +960,114 @@ class ReturnSeries(TimeSeries):
 
         else:
 
-            result = pd.DataFrame(
+            result = make_result(
                 data={"name": names, "field": "total return", "value": total_return}
             )
 
         return result
 
+    @cached
     def get_index_series(
         self,
         freq: Optional[str] = "M",
         method: Optional[str] = "geometric",
         include_bm: Optional[bool] = True,
+        wide: Optional[bool] = False,
+        step: Optional[int] = 1,
+    ) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
+        """Computes cumulative index series of the series
+
+        Returns of the series and its benchmarks are put in one date aligned
+        DataFrame, and the cumulative index of all of them is computed at once.
+
+        Args:
+            freq: Returns are converted to the same frequency before the index
+                is computed. Defaults to "M".
+            method: method to use when compounding return. Defaults to "geometric".
+            include_bm: whether to compute index series for benchmarks as well.
+                Defaults to True.
+            wide: whether to return one wide DataFrame, with one column per series,
+                instead of a dictionary. Dates missing from a series are NaN.
+                Defaults to False.
+            step: only keep every step-th date, useful to reduce the number of
+                points when charting. The last date is always kept. Defaults to 1.
+
+        Returns:
+            Dict[pd.DataFrame]: dictionary of index series
+
+                * key: name of the series
+                * value: index series, in decimals, in a datetime indexed pandas
+                    dataframe
+
+            if wide is True, a datetime indexed pandas dataframe with one column
+            per series, named by the name of the series, is returned instead.
+        """
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        # returns of all series, and their column names
+        returns, columns = [], []
+
+        for name, series in zip(run_name, run_data):
+
+            # keep record of start and so they can be reset later
+            series_start, series_end = series.start, series.end
+
+            # modify series so it's in the same timerange as the main series
+            self.align_daterange(series)
+
+            # convert return to desired frequency
+            ret = series.to_period(freq=freq, method=method)
+            returns.append(ret.iloc[:, 0].rename(name))
+            columns.append(ret.columns[0])
+
+            # reset series date range
+            series.set_daterange(series_start, series_end)
+
+        # one date aligned frame for all series
+        df = pd.concat(returns, axis=1, sort=True)
+        df.index.name = "datetime"
+
+        index_series = cumseries_frame(df, method, step)
+
+        if wide:
+            return index_series
+
+        # Store result in dictionary
+        result = dict()
+
+        for name, column in zip(run_name, columns):
+            result[name] = index_series[[name]].dropna().rename(columns={name: column})
+
+        return result
+
+    @cached
+    def get_drawdown_series(
+        self,
+        freq: Optional[str] = None,
+        method: Optional[str] = "geometric",
+        include_bm: Optional[bool] = True,
     ) -> Dict[str, pd.DataFrame]:
+        """Computes drawdown series, i.e. decline from the running peak, of the series
+
+        Args:
+            freq: Returns are converted to the same frequency before drawdown
+                is computed. Defaults to None, which uses the frequency of the series.
+            method: method to use when compounding return to desired
+                frequency. Defaults to "geometric".
+            include_bm: whether to compute drawdown series for benchmarks as well.
+                Defaults to True.
+
+        Returns:
+            Dict[pd.DataFrame]: dictionary of drawdown series
+
+                * key: name of the series
+                * value: drawdown series, in a datetime indexed pandas dataframe
+        """
 
         # Store result in dictionary
         result = dict()
@@ -378,17 +1086,21 @@ class ReturnSeries(TimeSeries):
             # modify series so it's in the same timerange as the main series
             self.align_daterange(series)
 
-            # compute rolling annualized volatility
-            ret = series.to_period(freq=freq, method=method)
+            # compute drawdown series
+            if freq is None:
+                ret = series.series
+            else:
+                ret = series.to_period(freq=freq, method=method)
 
             # store result in dictionary
-            result[name] = ret.apply(cumseries(method))
+            result[name] = calc_drawdown(ret)
 
             # reset series date range
             series.set_daterange(series_start, series_end)
 
         return result
 
+    @cached
     def get_ann_ret(
         self,
         method: Optional[str] = "geometric",
@@ -452,7 +1164,7 @@ class ReturnSeries(TimeSeries):
 
         if meta:
 
-            result = pd.DataFrame(
+            result = make_result(
                 data={
                     "name": names,
                     "field": "annualized return",
@@ -465,12 +1177,13 @@ class ReturnSeries(TimeSeries):
 
         else:
 
-            result = pd.DataFrame(
+            result = make_result(
                 data={"name": names, "field": "annualized return", "value": ann_return}
             )
 
         return result
 
+    @cached
     def get_ann_vol(
         self,
         freq: Optional[str] = "M",
@@ -510,68 +1223,100 @@ class ReturnSeries(TimeSeries):
             meta is set to True.
         """
 
-        # Columns in the returned dataframe
-        names, ann_vol, start, end = ([] for i in range(4))
-
-        run_name, run_data = [self.name], [self]
-
-        if include_bm:
-            run_name += list(self.benchmark.keys())
-            run_data += list(self.benchmark.values())
+        return self._get_moment_stat(
+            "annualized volatility", freq, include_bm, method, compound_method, meta
+        )
 
-        for name, series in zip(run_name, run_data):
+    @cached
+    def get_skew(
+        self,
+        freq: Optional[str] = "M",
+        include_bm: Optional[bool] = True,
+        method: Optional[str] = "sample",
+        compound_method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Computes skewness of the series
 
-            try:
+        Args:
+            freq: Returns are converted to the same frequency before skewness
+                is compuated. Defaults to "M".
+            include_bm: whether to compute skewness for benchmarks as well.
+                Defaults to True.
+            method: {'sample', 'population'}. 'sample' adjusts for the number of
+                samples, the same as pandas. Defaults to "sample".
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
 
-                # keep record of start and so they can be reset later
-                series_start, series_end = series.start, series.end
+                * freq: frequency of the series
+                * method: method used to compute skewness
+                * start: start date for calculating skewness
+                * end: end date for calculating skewness
 
-                # modify series so it's in the same timerange as the main series
-                self.align_daterange(series)
+        Returns:
+            pd.DataFrame: skewness results with the following columns
 
-                # Convert return to desired frequency
-                ret = series.to_period(freq=freq, method=compound_method)
-                samples_per_year = calc_samples_per_year(
-                    len(ret.index), series.start, series.end
-                )
-                vol = calc_ann_vol(ret, method, samples_per_year)
+                * name: name of the series
+                * field: name of the field. In this case, it is 'skewness' for all
+                * value: skewness value
 
-                names.append(name)
-                ann_vol.append(vol)
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
 
-                if meta:
-                    start.append(series.start)
-                    end.append(series.end)
+        return self._get_moment_stat(
+            "skewness", freq, include_bm, method, compound_method, meta
+        )
 
-                series.set_daterange(series_start, series_end)
+    @cached
+    def get_kurtosis(
+        self,
+        freq: Optional[str] = "M",
+        include_bm: Optional[bool] = True,
+        method: Optional[str] = "sample",
+        compound_method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Computes excess kurtosis of the series.
 
-            except Exception as e:  # pragma: no cover
+        Excess kurtosis is 0 for normally distributed returns, and positive for
+        returns with fatter tails.
 
-                log.error(f"Cannot compute annualized volatility: name={name}: {e}")
-                pass
+        Args:
+            freq: Returns are converted to the same frequency before excess kurtosis
+                is compuated. Defaults to "M".
+            include_bm: whether to compute excess kurtosis for benchmarks as well.
+                Defaults to True.
+            method: {'sample', 'population'}. 'sample' adjusts for the number of
+                samples, the same as pandas. Defaults to "sample".
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
 
-        if meta:
+                * freq: frequency of the series
+                * method: method used to compute excess kurtosis
+                * start: start date for calculating excess kurtosis
+                * end: end date for calculating excess kurtosis
 
-            result = pd.DataFrame(
-                data={
-                    "name": names,
-                    "field": "annualized volatility",
-                    "value": ann_vol,
-                    "freq": freq,
-                    "method": method,
-                    "start": start,
-                    "end": end,
-                }
-            )
+        Returns:
+            pd.DataFrame: excess kurtosis results with the following columns
 
-        else:
+                * name: name of the series
+                * field: name of the field. In this case, it is 'kurtosis' for all
+                * value: excess kurtosis value
 
-            result = pd.DataFrame(
-                data={"name": names, "field": "annualized volatility", "value": ann_vol}
-            )
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
 
-        return result
+        return self._get_moment_stat(
+            "kurtosis", freq, include_bm, method, compound_method, meta
+        )
 
+    @cached
     def get_sharpe(
         self,
         freq: Optional[str] = "M",
@@ -616,21 +1361,7 @@ class ReturnSeries(TimeSeries):
         """
 
         # create risk free rate
-        if isinstance(risk_free, str):
-            try:
-                rf = self.risk_free[risk_free]
-            except KeyError:
-                raise ValueError(f"Risk free rate is not set: risk_free={risk_free}")
-        elif isinstance(risk_free, float) or isinstance(risk_free, int):
-            try:
-                rf = self.risk_free[f"cash_{risk_free}"]
-            except KeyError:
-                rf = CashSeries.constant(risk_free, self.start, self.end)
-                self.add_rf(rf, f"cash_{risk_free}")
-        else:
-            raise TypeError(
-                "Risk free should be str, float, or 0." f"received={type(risk_free)}"
-            )
+        rf = self._get_rf(risk_free)
 
         # create sharpe for main series
         names, sharpe, start, end, risk_free = ([] for i in range(5))
@@ -651,75 +1382,834 @@ class ReturnSeries(TimeSeries):
                 # keep record of start and so they can be reset later
                 series_start, series_end = series.start, series.end
 
-                # modify series so it's in the same timerange as the main series
-                self.align_daterange(series)
+                # modify series so it's in the same timerange as the main series
+                self.align_daterange(series)
+
+                # get name of the series
+                name = series.series.columns[0]
+
+                # use the narrowest date range between series and risk free rate
+                start_date = max(rf.start, series.start)
+                end_date = min(rf.end, series.end)
+                rf.set_daterange(start_date, end_date)
+                series.set_daterange(start_date, end_date)
+
+                # Align series and risk free rate on all dates, and gather their
+                # values, with missing returns as 0, without joining frames
+                index, excess = self._get_excess_ret(series.series, rf.series)
+                df = pd.DataFrame(data={name: excess}, index=index)
+
+                # computed directly, results of get_* depend on the result type
+                ann_excess_ret = calc_ann_ret(df, compound_method)
+                moments, samples_per_year = series._get_moments(freq, compound_method)
+                ann_series_vol = moments.std("sample") * math.sqrt(samples_per_year)
+                ratio = ann_excess_ret / ann_series_vol
+
+                names.append(name)
+                sharpe.append(ratio)
+
+                if meta:
+                    rf_ann = calc_ann_ret(rf.series, compound_method)
+                    rf_ann = f"{round(rf_ann*100, 2)}%"
+                    risk_free.append(f"{rf_name}: {rf_ann}")
+                    start.append(series.start)
+                    end.append(series.end)
+
+                series.set_daterange(series_start, series_end)
+                rf.reset()
+
+            except Exception as e:  # pragma: no cover
+
+                log.error("Cannot compute sharpe ratio: " f"benchmark={name}: {e}")
+                pass
+
+        if meta:
+
+            result = make_result(
+                data={
+                    "name": names,
+                    "field": "sharpe ratio",
+                    "value": sharpe,
+                    "freq": freq,
+                    "risk_free": risk_free,
+                    "start": start,
+                    "end": end,
+                }
+            )
+
+        else:
+
+            result = make_result(
+                data={"name": names, "field": "sharpe ratio", "value": sharpe}
+            )
+
+        return result
+
+    @cached
+    def get_sortino(
+        self,
+        freq: Optional[str] = "M",
+        risk_free: Optional[Union[float, int, str]] = 0,
+        include_bm: Optional[bool] = True,
+        compound_method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Computes Sortino ratio of the series
+
+        The Sortino ratio is the annualized excess return over the risk free rate,
+        divided by the annualized downside deviation of excess returns, i.e. of
+        returns below the risk free rate.
+
+        Args:
+            freq: Returns are converted to the same frequency before downside
+                deviation is compuated. Defaults to "M".
+            risk_free: the risk free rate to use. Can be a float or a string, see
+                ``get_sharpe``. Defaults to 0.
+            include_bm: whether to compute Sortino ratio for benchmarks as well.
+                Defaults to True.
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
+
+                * freq: frequency of the series
+                * risk_free: the risk free rate used
+                * start: start date for calculating Sortino ratio
+                * end: end date for calculating Sortino ratio
+
+        Returns:
+            pd.DataFrame: Sortino ratio with the following columns
+
+                * names: name of the series
+                * field: name of the field. In this case, it is 'sortino ratio'
+                    for all
+                * value: Sortino ratio value
+
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
+
+        # create risk free rate
+        rf = self._get_rf(risk_free)
+
+        names, sortino, start, end, risk_free = ([] for i in range(5))
+
+        # get column name of risk free rate
+        rf_name = rf.series.columns[0]
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            try:
+
+                # keep record of start and so they can be reset later
+                series_start, series_end = series.start, series.end
+
+                # modify series so it's in the same timerange as the main series
+                self.align_daterange(series)
+
+                # get name of the series
+                name = series.series.columns[0]
+
+                # use the narrowest date range between series and risk free rate
+                start_date = max(rf.start, series.start)
+                end_date = min(rf.end, series.end)
+                rf.set_daterange(start_date, end_date)
+                series.set_daterange(start_date, end_date)
+
+                index, excess = self._get_excess_ret(series.series, rf.series)
+                df = pd.DataFrame(data={name: excess}, index=index)
+
+                # computed directly, results of get_* depend on the result type
+                excess_series = ReturnSeries(df)
+                ann_excess_ret = calc_ann_ret(df, compound_method)
+
+                # downside deviation of excess returns, below 0
+                moments, samples_per_year = excess_series._get_moments(
+                    freq, compound_method
+                )
+                downside = moments.downside_deviation() * math.sqrt(samples_per_year)
+                ratio = ann_excess_ret / downside
+
+                names.append(name)
+                sortino.append(ratio)
+
+                if meta:
+                    rf_ann = calc_ann_ret(rf.series, compound_method)
+                    rf_ann = f"{round(rf_ann*100, 2)}%"
+                    risk_free.append(f"{rf_name}: {rf_ann}")
+                    start.append(series.start)
+                    end.append(series.end)
+
+                series.set_daterange(series_start, series_end)
+                rf.reset()
+
+            except Exception as e:  # pragma: no cover
+
+                log.error(f"Cannot compute sortino ratio: benchmark={name}: {e}")
+                pass
+
+        if meta:
+
+            result = make_result(
+                data={
+                    "name": names,
+                    "field": "sortino ratio",
+                    "value": sortino,
+                    "freq": freq,
+                    "risk_free": risk_free,
+                    "start": start,
+                    "end": end,
+                }
+            )
+
+        else:
+
+            result = make_result(
+                data={"name": names, "field": "sortino ratio", "value": sortino}
+            )
+
+        return result
+
+    @staticmethod
+    def _get_bootstrap_ret(
+        series: "ReturnSeries",
+        rf: "ReturnSeries",
+        freq: Optional[Union[str, Calendar]],
+        compound_method: str,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Gets returns of a series to resample, and its excess returns over the
+        risk free rate in the same periods.
+
+        Excess returns are computed as in ``get_sharpe``, on all dates of the series
+        and the risk free rate. Risk free returns on dates the series has no data
+        for, e.g. holidays, are compounded into the next date of the series, so
+        they are accrued rather than dropped.
+
+        Args:
+            series: return series, in the date range to resample
+            rf: risk free rate
+            freq: frequency to convert returns to, None to keep the frequency of
+                the series
+            compound_method: method to use when compounding return
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: returns and excess returns
+        """
+
+        rf_ret = rf.series.loc[series.start : series.end]
+        index, excess = ReturnSeries._get_excess_ret(series.series, rf_ret)
+
+        dates = series.series.index
+        ids = np.searchsorted(dates.asi8, index.asi8, side="left")
+        ids = np.minimum(ids, len(dates) - 1)
+
+        def total(x):
+            return np.bincount(ids, weights=x[:, 0], minlength=len(dates))[:, None]
+
+        # continuous returns are log returns, they add up
+        method = "arithmetic" if compound_method == "continuous" else compound_method
+        excess = _compound_sums(excess[:, np.newaxis], method, total)
+        excess = ReturnSeries(pd.DataFrame(data={"excess": excess[:, 0]}, index=dates))
+
+        if freq is None:
+            return series.series, excess.series
+
+        return (
+            series.to_period(freq=freq, method=compound_method),
+            excess.to_period(freq=freq, method=compound_method),
+        )
+
+    @cached
+    def get_bootstrap_ci(
+        self,
+        freq: Optional[str] = "M",
+        risk_free: Optional[Union[float, int, str]] = 0,
+        include_bm: Optional[bool] = True,
+        method: Optional[str] = "sample",
+        compound_method: Optional[str] = "geometric",
+        samples: Optional[int] = 1000,
+        confidence: Optional[float] = 0.95,
+        block_size: Optional[float] = None,
+        bootstrap: Optional[str] = "stationary",
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Computes bootstrap confidence intervals of annualized return, annualized
+        volatility and Sharpe ratio of the series
+
+        Returns are resampled in blocks of consecutive periods, which preserves
+        serial correlation, and all resamples are evaluated at once, see
+        ``pyform.returns.bootstrap.calc_bootstrap_ci``.
+
+        Args:
+            freq: Returns are converted to the same frequency before they are
+                resampled. None resamples returns in the frequency of the series.
+                Defaults to "M".
+            risk_free: the risk free rate to use for Sharpe ratio, see
+                ``get_sharpe``. Returns are resampled within the date range of
+                the risk free rate, and excess returns are computed the same way
+                as ``get_sharpe``, so the Sharpe ratio of the series is the one of
+                ``get_sharpe``. Defaults to 0.
+            include_bm: whether to compute confidence intervals for benchmarks as
+                well. Defaults to True.
+            method: {'sample', 'population'}. method used to compute volatility
+                (standard deviation). Defaults to "sample".
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+            samples: number of resamples. Defaults to 1000.
+            confidence: confidence level of the intervals. Defaults to 0.95.
+            block_size: (mean) number of periods in each block. Defaults to None,
+                which uses the cube root of the number of periods.
+            bootstrap: {'stationary', 'block'}. Defaults to "stationary".
+
+                * stationary: blocks of random, geometrically distributed lengths
+                * block: moving blocks of a fixed size
+
+            seed: seed of the random number generator, for reproducible intervals.
+                Defaults to None.
+            workers: number of processes computing resamples. Defaults to None,
+                which computes all resamples in the current process.
+
+        Returns:
+            pd.DataFrame: confidence intervals with the following columns
+
+                * name: name of the series
+                * field: 'annualized return', 'annualized volatility' or
+                    'sharpe ratio'
+                * value: statistic of the series
+                * lower: lower bound of the confidence interval
+                * upper: upper bound of the confidence interval
+        """
+
+        # delta degrees of freedom, used for calculate standard deviation
+        ddof = {"sample": 1, "population": 0}[method]
+
+        # create risk free rate
+        rf = self._get_rf(risk_free)
+
+        # Columns in the returned dataframe
+        names, fields, value, lower, upper = ([] for i in range(5))
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            # keep record of start and so they can be reset later
+            series_start, series_end = series.start, series.end
+
+            # modify series so it's in the same timerange as the main series
+            self.align_daterange(series)
+
+            try:
+
+                # use the narrowest date range between series and risk free rate,
+                # the same as get_sharpe
+                start_date = max(rf.start, series.start)
+                end_date = min(rf.end, series.end)
+                series.set_daterange(start_date, end_date)
+
+                ret, excess = self._get_bootstrap_ret(series, rf, freq, compound_method)
+                samples_per_year = calc_index_samples_per_year(
+                    ret.index, series.start, series.end
+                )
+
+                ci = calc_bootstrap_ci(
+                    ret.iloc[:, 0].to_numpy(),
+                    samples_per_year,
+                    method=compound_method,
+                    ddof=ddof,
+                    excess=excess.iloc[:, 0].to_numpy(),
+                    samples=samples,
+                    block_size=block_size,
+                    bootstrap=bootstrap,
+                    confidence=confidence,
+                    seed=seed,
+                    workers=workers,
+                )
+
+            finally:
+
+                # reset series date range
+                series.set_daterange(series_start, series_end)
+
+            names += [name] * len(ci.index)
+            fields += ci.index.tolist()
+            value += ci["value"].tolist()
+            lower += ci["lower"].tolist()
+            upper += ci["upper"].tolist()
+
+        return make_result(
+            data={
+                "name": names,
+                "field": fields,
+                "value": value,
+                "lower": lower,
+                "upper": upper,
+            }
+        )
+
+    @cached
+    def get_max_dd(
+        self,
+        freq: Optional[str] = None,
+        method: Optional[str] = "geometric",
+        include_bm: Optional[bool] = True,
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Computes maximum drawdown of the series
+
+        Args:
+            freq: Returns are converted to the same frequency before maximum drawdown
+                is computed. Defaults to None, which uses the frequency of the series.
+            method: method to use when compounding return to desired
+                frequency. Defaults to "geometric".
+            include_bm: whether to compute maximum drawdown for benchmarks as well.
+                Defaults to True.
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
+
+                * freq: frequency used to compute maximum drawdown
+                * peak: date of the peak before the maximum drawdown
+                * trough: date of the trough of the maximum drawdown
+                * recovery: date the series recovered to the peak, NaT if it has
+                    not recovered
+                * periods: time under water, in number of periods
+                * start: start date for calculating maximum drawdown
+                * end: end date for calculating maximum drawdown
+
+        Returns:
+            pd.DataFrame: maximum drawdown results with the following columns
+
+                * name: name of the series
+                * field: name of the field. In this case, it is 'max drawdown'
+                    for all
+                * value: maximum drawdown value, in decimals
+
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
+
+        # Columns in the returned dataframe
+        names, max_dd, peak, trough, recovery, periods, start, end = (
+            [] for i in range(8)
+        )
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            try:
+
+                # keep record of start and so they can be reset later
+                series_start, series_end = series.start, series.end
+
+                # modify series so it's in the same timerange as the main series
+                self.align_daterange(series)
+
+                # Convert return to desired frequency
+                if freq is None:
+                    ret = series.series
+                else:
+                    ret = series.to_period(freq=freq, method=method)
+
+                drawdown = calc_max_drawdown(ret).iloc[0]
+
+                names.append(name)
+                max_dd.append(drawdown["max drawdown"])
+
+                if meta:
+                    peak.append(drawdown["peak"])
+                    trough.append(drawdown["trough"])
+                    recovery.append(drawdown["recovery"])
+                    periods.append(drawdown["periods"])
+                    start.append(series.start)
+                    end.append(series.end)
+
+                series.set_daterange(series_start, series_end)
+
+            except Exception as e:  # pragma: no cover
+
+                log.error(f"Cannot compute max drawdown: name={name}: {e}")
+                pass
+
+        if meta:
+
+            result = make_result(
+                data={
+                    "name": names,
+                    "field": "max drawdown",
+                    "value": max_dd,
+                    "freq": freq,
+                    "peak": peak,
+                    "trough": trough,
+                    "recovery": recovery,
+                    "periods": periods,
+                    "start": start,
+                    "end": end,
+                }
+            )
+
+        else:
+
+            result = make_result(
+                data={"name": names, "field": "max drawdown", "value": max_dd}
+            )
+
+        return result
+
+    @cached
+    def get_var(
+        self,
+        freq: Optional[str] = None,
+        level: Optional[float] = 0.95,
+        include_bm: Optional[bool] = True,
+        compound_method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Computes historical value at risk of the series
+
+        Value at risk is the return only undercut in ``1 - level`` of periods, e.g.
+        the 5% quantile of returns at the 95% level. Losses are negative.
+
+        Args:
+            freq: Returns are converted to the same frequency before value at risk
+                is computed. Defaults to None, which uses the frequency of the series.
+            level: confidence level. Defaults to 0.95.
+            include_bm: whether to compute value at risk for benchmarks as well.
+                Defaults to True.
+            compound_method: method to use when compounding return to desired
+                frequency. Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
+
+                * freq: frequency used to compute value at risk
+                * level: confidence level
+                * start: start date for calculating value at risk
+                * end: end date for calculating value at risk
+
+        Returns:
+            pd.DataFrame: value at risk results with the following columns
+
+                * name: name of the series
+                * field: name of the field. In this case, it is 'value at risk'
+                    for all
+                * value: value at risk, as a return in decimals
+
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
+
+        return self._get_tail_stat(
+            "value at risk", freq, level, include_bm, compound_method, meta
+        )
+
+    @cached
+    def get_cvar(
+        self,
+        freq: Optional[str] = None,
+        level: Optional[float] = 0.95,
+        include_bm: Optional[bool] = True,
+        compound_method: Optional[str] = "geometric",
+        meta: Optional[bool] = False,
+    ) -> pd.DataFrame:
+        """Computes historical conditional value at risk of the series
+
+        Conditional value at risk, or expected shortfall, is the average return in
+        the tail at or below the value at risk. Losses are negative.
+
+        Args:
+            freq: Returns are converted to the same frequency before conditional
+                value at risk is computed. Defaults to None, which uses the
+                frequency of the series.
+            level: confidence level. Defaults to 0.95.
+            include_bm: whether to compute conditional value at risk for benchmarks
+                as well. Defaults to True.
+            compound_method: method to use when compounding return to desired
+                frequency. Defaults to "geometric".
+            meta: whether to include meta data in output. Defaults to False.
+                Available meta are:
+
+                * freq: frequency used to compute conditional value at risk
+                * level: confidence level
+                * start: start date for calculating conditional value at risk
+                * end: end date for calculating conditional value at risk
+
+        Returns:
+            pd.DataFrame: conditional value at risk results with the following columns
+
+                * name: name of the series
+                * field: name of the field. In this case, it is 'conditional value
+                    at risk' for all
+                * value: conditional value at risk, as a return in decimals
+
+            Data described in meta will also be available in the returned DataFrame if
+            meta is set to True.
+        """
+
+        return self._get_tail_stat(
+            "conditional value at risk", freq, level, include_bm, compound_method, meta
+        )
+
+    def _get_tail_stat(
+        self,
+        field: str,
+        freq: Optional[str],
+        level: float,
+        include_bm: bool,
+        compound_method: str,
+        meta: bool,
+    ) -> pd.DataFrame:
+        """Computes a tail risk statistic of the series, and of its benchmarks.
+
+        Args:
+            field: {'value at risk', 'conditional value at risk'}. statistic to
+                compute
+            freq: frequency to convert returns to, None uses the frequency of the
+                series
+            level: confidence level
+            include_bm: whether to compute the statistic for benchmarks as well
+            compound_method: method to use when compounding return
+            meta: whether to include meta data in output
+
+        Returns:
+            pd.DataFrame: statistic for each series, see ``get_var``
+        """
+
+        calc = {"value at risk": calc_var, "conditional value at risk": calc_cvar}
+
+        # Columns in the returned dataframe
+        names, value, start, end = ([] for i in range(4))
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            try:
+
+                # keep record of start and so they can be reset later
+                series_start, series_end = series.start, series.end
+
+                # modify series so it's in the same timerange as the main series
+                self.align_daterange(series)
+
+                # Convert return to desired frequency
+                if freq is None:
+                    ret = series.series
+                else:
+                    ret = series.to_period(freq=freq, method=compound_method)
+
+                names.append(name)
+                value.append(calc[field](ret.iloc[:, 0], level))
+
+                if meta:
+                    start.append(series.start)
+                    end.append(series.end)
+
+                series.set_daterange(series_start, series_end)
+
+            except Exception as e:  # pragma: no cover
+
+                log.error(f"Cannot compute {field}: name={name}: {e}")
+                pass
+
+        if meta:
+
+            result = make_result(
+                data={
+                    "name": names,
+                    "field": field,
+                    "value": value,
+                    "freq": freq,
+                    "level": level,
+                    "start": start,
+                    "end": end,
+                }
+            )
+
+        else:
+
+            result = make_result(data={"name": names, "field": field, "value": value})
+
+        return result
+
+    @cached
+    def get_expanding_stats(
+        self,
+        freq: Optional[str] = "M",
+        risk_free: Optional[Union[float, int, str]] = 0,
+        include_bm: Optional[bool] = True,
+        method: Optional[str] = "sample",
+        compound_method: Optional[str] = "geometric",
+    ) -> Dict[str, pd.DataFrame]:
+        """Computes since inception statistics of the series, as of each period
+
+        The statistics as of a period are the ones ``get_tot_ret``, ``get_ann_ret``,
+        ``get_ann_vol`` and ``get_sharpe`` give when the series ends at that period,
+        but the full history is computed in one pass from cumulative sums.
+
+        Args:
+            freq: frequency of the periods to compute statistics as of. Returns are
+                also converted to this frequency before volatility is computed.
+                Defaults to "M".
+            risk_free: the risk free rate to use for Sharpe ratio, see
+                ``get_sharpe``. The risk free rate should cover the series.
+                Defaults to 0.
+            include_bm: whether to compute statistics for benchmarks as well.
+                Defaults to True.
+            method: {'sample', 'population'}. method used to compute volatility
+                (standard deviation). Defaults to "sample".
+            compound_method: method to use when compounding return.
+                Defaults to "geometric".
+
+        Returns:
+            Dict[pd.DataFrame]: dictionary of since inception statistics
+
+                * key: name of the series
+                * value: datetime indexed pandas dataframe, with columns 'total
+                    return', 'annualized return', 'annualized volatility' and
+                    'sharpe ratio'
+        """
+
+        # Store result in dictionary
+        result = dict()
+
+        # create risk free rate
+        rf = self._get_rf(risk_free)
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            try:
+
+                # keep record of start and so they can be reset later
+                series_start, series_end = series.start, series.end
+
+                # modify series so it's in the same timerange as the main series
+                self.align_daterange(series)
+
+                # end date of the returns as of each period
+                ret = series.to_period(freq=freq, method=compound_method)
+                dates = series.series.index
+                ends = dates[np.searchsorted(dates, ret.index, side="right") - 1]
+
+                stats = calc_expanding_ann_ret(
+                    series.series, ret.index, compound_method
+                )
+                vol = calc_expanding_ann_vol(ret, method, series.start, ends)
+                stats["annualized volatility"] = vol.to_numpy()
+
+                # excess return over the narrowest date range of series and
+                # risk free rate, as in get_sharpe
+                start_date = max(rf.start, series.start)
+                end_date = min(rf.end, series.end)
+                rf.set_daterange(start_date, end_date)
+
+                native = intern_frame_index(series.series.loc[start_date:end_date])
+                index, excess = self._get_excess_ret(native, rf.series)
+                excess = pd.Series(excess, index=index)
+
+                excess_ret = calc_expanding_ann_ret(excess, ret.index, compound_method)
+                stats["sharpe ratio"] = (
+                    excess_ret["annualized return"] / stats["annualized volatility"]
+                )
+
+                # store result in dictionary
+                result[name] = stats
+
+                # reset date ranges
+                series.set_daterange(series_start, series_end)
+                rf.reset()
+
+            except Exception as e:  # pragma: no cover
+
+                log.error(f"Cannot compute expanding statistics: name={name}: {e}")
+                pass
+
+        return result
+
+    @cached
+    def get_trailing_table(
+        self,
+        as_of: Optional[str] = None,
+        horizons: Optional[Sequence[Union[str, Horizon]]] = TRAILING_HORIZONS,
+        method: Optional[str] = "geometric",
+        include_bm: Optional[bool] = True,
+    ) -> pd.DataFrame:
+        """Computes trailing returns of the series over many horizons, as of a date
+
+        All horizons of all series are evaluated from one prefix sum array, see
+        ``pyform.returns.trailing.calc_trailing_returns``.
 
-                # get name of the series
-                name = series.series.columns[0]
+        Args:
+            as_of: date the horizons end on. Defaults to None, which uses the end
+                date of the series.
+            horizons: labels of the horizons, e.g. '3M', 'YTD', '5Y', 'ITD', or
+                horizons resolved with ``pyform.returns.trailing.resolve_horizons``.
+                Horizons longer than a year are annualized. Defaults to
+                ["1M", "3M", "YTD", "1Y", "3Y", "5Y", "10Y", "ITD"].
+            method: method to use when compounding return. Defaults to "geometric".
+            include_bm: whether to compute trailing returns for benchmarks as well.
+                Defaults to True.
 
-                # use the narrowest date range between series and risk free rate
-                start_date = max(rf.start, series.start)
-                end_date = min(rf.end, series.end)
-                rf.set_daterange(start_date, end_date)
-                series.set_daterange(start_date, end_date)
+        Returns:
+            pd.DataFrame: trailing returns, in decimals, with one row per series and
+                one column per horizon. A horizon is missing for a series that
+                started after the horizon.
+        """
 
-                df = series.series.merge(
-                    rf.series, on="datetime", how="outer", sort=True
-                ).fillna(0)
-                df[name] -= df[rf_name]
-                df = df.drop(rf_name, axis="columns")
-
-                exccess_series = ReturnSeries(df)
-                ann_excess_ret = exccess_series.get_ann_ret(
-                    method=compound_method, include_bm=False
-                )["value"][0]
-                ann_series_vol = series.get_ann_vol(
-                    freq=freq, compound_method=compound_method, include_bm=False
-                )["value"][0]
-                ratio = ann_excess_ret / ann_series_vol
+        returns = []
 
-                names.append(name)
-                sharpe.append(ratio)
+        run_name, run_data = [self.name], [self]
 
-                if meta:
-                    rf_ann = rf.get_ann_ret(method=compound_method, include_bm=False)[
-                        "value"
-                    ][0]
-                    rf_ann = f"{round(rf_ann*100, 2)}%"
-                    risk_free.append(f"{rf_name}: {rf_ann}")
-                    start.append(series.start)
-                    end.append(series.end)
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
 
-                series.set_daterange(series_start, series_end)
-                rf.reset()
+        for name, series in zip(run_name, run_data):
 
-            except Exception as e:  # pragma: no cover
+            # keep record of start and so they can be reset later
+            series_start, series_end = series.start, series.end
 
-                log.error("Cannot compute sharpe ratio: " f"benchmark={name}: {e}")
-                pass
+            # modify series so it's in the same timerange as the main series
+            self.align_daterange(series)
 
-        if meta:
+            returns.append(series.series.iloc[:, 0].rename(name))
 
-            result = pd.DataFrame(
-                data={
-                    "name": names,
-                    "field": "sharpe ratio",
-                    "value": sharpe,
-                    "freq": freq,
-                    "risk_free": risk_free,
-                    "start": start,
-                    "end": end,
-                }
-            )
+            # reset series date range
+            series.set_daterange(series_start, series_end)
 
-        else:
+        # one date aligned frame for the series and all benchmarks
+        df = pd.concat(returns, axis=1, sort=True)
 
-            result = pd.DataFrame(
-                data={"name": names, "field": "sharpe ratio", "value": sharpe}
-            )
+        if as_of is None:
+            as_of = self.end
 
-        return result
+        return calc_trailing_returns(df, as_of, horizons, method, self.freq)
 
+    @cached
     def get_rolling_tot_ret(
         self,
         window: Optional[int] = 36,
@@ -764,7 +2254,7 @@ class ReturnSeries(TimeSeries):
 
             # compute rolling total return
             ret = series.to_period(freq=freq, method=method)
-            roll_result = ret.rolling(window).apply(compound(method))
+            roll_result = rolling_compound(ret, window, method)
             roll_result = roll_result.dropna()
 
             # store result in dictionary
@@ -775,6 +2265,7 @@ class ReturnSeries(TimeSeries):
 
         return result
 
+    @cached
     def get_rolling_ann_ret(
         self,
         window: Optional[int] = 36,
@@ -787,7 +2278,9 @@ class ReturnSeries(TimeSeries):
         Args:
             window: the rolling window. Defaults to 36.
             freq: Returns are converted to the same frequency before annualized
-                return is compuated. Defaults to "M".
+                return is compuated. Each window is annualized by the years from
+                the first day of its first period to the last day of its last
+                period. Defaults to "M".
             compound_method: method to use when compounding return to desired
                 frequency. Defaults to "geometric".
             include_bm: whether to compute rolling annualized returns for
@@ -821,18 +2314,15 @@ class ReturnSeries(TimeSeries):
             # compute rolling annualized return
             ret = series.to_period(freq=freq, method=method)
 
-            # TODO: annualization can be more precise for the start and end period
-            # number of days in each period
-            freq_year = {"M": 12, "Q": 4, "Y": 1}
-
-            if freq in ["D", "B"]:
-                years = None
+            # years covered by each window, from the bounds of its periods
+            if isinstance(freq, Calendar):
+                starts, ends = freq.period_bounds(ret.index)
             else:
-                years = window / freq_year[freq]
+                starts, ends = calc_period_bounds(ret.index, freq)
 
-            roll_result = ret.rolling(window).apply(
-                lambda x: calc_ann_ret(x, method, years)
-            )
+            years = calc_rolling_years(starts, ends, window)
+
+            roll_result = calc_rolling_ann_ret(ret, window, method, years)
             roll_result = roll_result.dropna()
 
             # store result in dictionary
@@ -843,6 +2333,7 @@ class ReturnSeries(TimeSeries):
 
         return result
 
+    @cached
     def get_rolling_ann_vol(
         self,
         window: Optional[int] = 36,
@@ -891,14 +2382,131 @@ class ReturnSeries(TimeSeries):
 
             # compute rolling annualized volatility
             ret = series.to_period(freq=freq, method=compound_method)
-            samples_per_year = calc_samples_per_year(
-                len(ret.index), series.start, series.end
-            )
-            roll_result = ret.rolling(window).apply(
-                lambda x: calc_ann_vol(
-                    x, method=method, samples_per_year=samples_per_year
-                )
+            samples_per_year = calc_index_samples_per_year(
+                ret.index, series.start, series.end
             )
+            roll_result = calc_rolling_ann_vol(ret, window, method, samples_per_year)
+            roll_result = roll_result.dropna()
+
+            # store result in dictionary
+            result[name] = roll_result
+
+            # reset series date range
+            series.set_daterange(series_start, series_end)
+
+        return result
+
+    @cached
+    def get_rolling_max_dd(
+        self,
+        window: Optional[int] = 36,
+        freq: Optional[str] = "M",
+        method: Optional[str] = "geometric",
+        include_bm: Optional[bool] = True,
+    ) -> Dict[str, pd.DataFrame]:
+        """Computes rolling maximum drawdown of the series
+
+        Args:
+            window: the rolling window. Defaults to 36.
+            freq: Returns are converted to the same frequency before maximum drawdown
+                is compuated. Defaults to "M".
+            method: method to use when compounding return to desired
+                frequency. Defaults to "geometric".
+            include_bm: whether to compute rolling maximum drawdown for
+                benchmarks as well. Defaults to True.
+
+        Returns:
+            Dict[pd.DataFrame]: dictionary of rolling maximum drawdowns
+
+                * key: name of the series
+                * value: rolling maximum drawdowns, in a datetime indexed pandas
+                    dataframe
+        """
+
+        # Store result in dictionary
+        result = dict()
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            # keep record of start and so they can be reset later
+            series_start, series_end = series.start, series.end
+
+            # modify series so it's in the same timerange as the main series
+            self.align_daterange(series)
+
+            # compute rolling maximum drawdown
+            ret = series.to_period(freq=freq, method=method)
+            roll_result = calc_rolling_max_drawdown(ret, window)
+            roll_result = roll_result.dropna()
+
+            # store result in dictionary
+            result[name] = roll_result
+
+            # reset series date range
+            series.set_daterange(series_start, series_end)
+
+        return result
+
+    def _get_rolling_tail_stat(
+        self,
+        field: str,
+        window: int,
+        freq: Optional[str],
+        level: float,
+        include_bm: bool,
+        compound_method: str,
+    ) -> Dict[str, pd.DataFrame]:
+        """Computes a rolling tail risk statistic of the series, and of its
+        benchmarks.
+
+        Args:
+            field: {'value at risk', 'conditional value at risk'}. statistic to
+                compute
+            window: the rolling window
+            freq: frequency to convert returns to, None uses the frequency of the
+                series
+            level: confidence level
+            include_bm: whether to compute the statistic for benchmarks as well
+            compound_method: method to use when compounding return
+
+        Returns:
+            Dict[pd.DataFrame]: rolling statistic, see ``get_rolling_var``
+        """
+
+        calc = {
+            "value at risk": calc_rolling_var,
+            "conditional value at risk": calc_rolling_cvar,
+        }
+
+        # Store result in dictionary
+        result = dict()
+
+        run_name, run_data = [self.name], [self]
+
+        if include_bm:
+            run_name += list(self.benchmark.keys())
+            run_data += list(self.benchmark.values())
+
+        for name, series in zip(run_name, run_data):
+
+            # keep record of start and so they can be reset later
+            series_start, series_end = series.start, series.end
+
+            # modify series so it's in the same timerange as the main series
+            self.align_daterange(series)
+
+            if freq is None:
+                ret = series.series
+            else:
+                ret = series.to_period(freq=freq, method=compound_method)
+
+            roll_result = calc[field](ret, window, level)
             roll_result = roll_result.dropna()
 
             # store result in dictionary
@@ -909,6 +2517,247 @@ class ReturnSeries(TimeSeries):
 
         return result
 
+    @cached
+    def get_rolling_var(
+        self,
+        window: Optional[int] = 252,
+        freq: Optional[str] = None,
+        level: Optional[float] = 0.95,
+        include_bm: Optional[bool] = True,
+        compound_method: Optional[str] = "geometric",
+    ) -> Dict[str, pd.DataFrame]:
+        """Computes rolling historical value at risk of the series
+
+        Each window is kept sorted as it rolls, so long daily histories are
+        handled without sorting every window.
+
+        Args:
+            window: the rolling window. Defaults to 252.
+            freq: Returns are converted to the same frequency before value at risk
+                is computed. Defaults to None, which uses the frequency of the series.
+            level: confidence level. Defaults to 0.95.
+            include_bm: whether to compute rolling value at risk for
+                benchmarks as well. Defaults to True.
+            compound_method: method to use when compounding return to desired
+                frequency. Defaults to "geometric".
+
+        Returns:
+            Dict[pd.DataFrame]: dictionary of rolling value at risk
+
+                * key: name of the series
+                * value: rolling value at risk, in a datetime indexed pandas
+                    dataframe
+        """
+
+        return self._get_rolling_tail_stat(
+            "value at risk", window, freq, level, include_bm, compound_method
+        )
+
+    @cached
+    def get_rolling_cvar(
+        self,
+        window: Optional[int] = 252,
+        freq: Optional[str] = None,
+        level: Optional[float] = 0.95,
+        include_bm: Optional[bool] = True,
+        compound_method: Optional[str] = "geometric",
+    ) -> Dict[str, pd.DataFrame]:
+        """Computes rolling historical conditional value at risk of the series
+
+        Each window is kept sorted as it rolls, so long daily histories are
+        handled without sorting every window.
+
+        Args:
+            window: the rolling window. Defaults to 252.
+            freq: Returns are converted to the same frequency before conditional
+                value at risk is computed. Defaults to None, which uses the
+                frequency of the series.
+            level: confidence level. Defaults to 0.95.
+            include_bm: whether to compute rolling conditional value at risk for
+                benchmarks as well. Defaults to True.
+            compound_method: method to use when compounding return to desired
+                frequency. Defaults to "geometric".
+
+        Returns:
+            Dict[pd.DataFrame]: dictionary of rolling conditional value at risk
+
+                * key: name of the series
+                * value: rolling conditional value at risk, in a datetime indexed pandas
+                    dataframe
+        """
+
+        return self._get_rolling_tail_stat(
+            "conditional value at risk",
+            window,
+            freq,
+            level,
+            include_bm,
+            compound_method,
+        )
+
+    def _get_rolling_bm_stat(
+        self,
+        field: str,
+        window: int,
+        freq: str,
+        compound_method: str,
+        compensated: bool,
+        wide: bool,
+    ) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
+        """Computes a rolling benchmark relative statistic against all benchmarks.
+
+        Args:
+            field: {'correlation', 'beta'}. statistic to compute
+            window: the rolling window
+            freq: frequency to convert returns to
+            compound_method: method to use when compounding return
+            compensated: whether to use compensated summation
+            wide: whether to return one wide DataFrame
+
+        Raises:
+            ValueError: when no benchmark is set
+
+        Returns:
+            Union[Dict[str, pd.DataFrame], pd.DataFrame]: rolling statistic, see
+                ``get_rolling_corr``
+        """
+
+        if not len(self.benchmark) > 0:
+            raise ValueError(f"{field.capitalize()} needs at least one benchmark.")
+
+        df, _, _ = self._get_bm_frame(freq, compound_method)
+        roll_result = calc_rolling_bm_stats(df, window, field, compensated)
+
+        if wide:
+            return roll_result
+
+        return {name: roll_result[[name]].dropna() for name in roll_result.columns}
+
+    @cached
+    def get_rolling_corr(
+        self,
+        window: Optional[int] = 36,
+        freq: Optional[str] = "M",
+        compound_method: Optional[str] = "geometric",
+        compensated: Optional[bool] = False,
+        wide: Optional[bool] = False,
+    ) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
+        """Computes rolling pearson correlation of the series with its benchmarks
+
+        All benchmarks are computed in one pass over running sums, which is O(n)
+        regardless of window size. Windows with a period the benchmark has no
+        return for are skipped.
+
+        Args:
+            window: the rolling window. Defaults to 36.
+            freq: Returns are converted to the same frequency before correlation
+                is compuated. Defaults to "M".
+            compound_method: {'geometric', 'arithmetic', 'continuous'}.
+                Defaults to "geometric".
+            compensated: whether to use compensated summation for the running
+                sums. Slower, but more precise for long daily series.
+                Defaults to False.
+            wide: whether to return one DataFrame with a column per benchmark.
+                Defaults to False.
+
+        Raises:
+            ValueError: when no benchmark is set
+
+        Returns:
+            Union[Dict[pd.DataFrame], pd.DataFrame]: dictionary of rolling
+                correlations
+
+                * key: name of the benchmark
+                * value: rolling correlations, in a datetime indexed pandas
+                    dataframe
+
+            or, if wide is True, one datetime indexed pandas dataframe with a column
+            per benchmark.
+        """
+
+        return self._get_rolling_bm_stat(
+            "correlation", window, freq, compound_method, compensated, wide
+        )
+
+    @cached
+    def get_rolling_beta(
+        self,
+        window: Optional[int] = 36,
+        freq: Optional[str] = "M",
+        compound_method: Optional[str] = "geometric",
+        compensated: Optional[bool] = False,
+        wide: Optional[bool] = False,
+    ) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
+        """Computes rolling CAPM beta of the series against its benchmarks
+
+        All benchmarks are computed in one pass over running sums, which is O(n)
+        regardless of window size. Windows with a period the benchmark has no
+        return for are skipped.
+
+        Args:
+            window: the rolling window. Defaults to 36.
+            freq: Returns are converted to the same frequency before beta
+                is compuated. Defaults to "M".
+            compound_method: {'geometric', 'arithmetic', 'continuous'}.
+                Defaults to "geometric".
+            compensated: whether to use compensated summation for the running
+                sums. Slower, but more precise for long daily series.
+                Defaults to False.
+            wide: whether to return one DataFrame with a column per benchmark.
+                Defaults to False.
+
+        Raises:
+            ValueError: when no benchmark is set
+
+        Returns:
+            Union[Dict[pd.DataFrame], pd.DataFrame]: dictionary of rolling betas
+
+                * key: name of the benchmark
+                * value: rolling betas, in a datetime indexed pandas dataframe
+
+            or, if wide is True, one datetime indexed pandas dataframe with a column
+            per benchmark.
+        """
+
+        return self._get_rolling_bm_stat(
+            "beta", window, freq, compound_method, compensated, wide
+        )
+
+    @classmethod
+    def from_portfolio(
+        cls,
+        series: Sequence["ReturnSeries"],
+        weights: Weights,
+        rebalance: Optional[Union[str, Calendar]] = None,
+        name: Optional[str] = "portfolio",
+    ) -> "ReturnSeries":
+        """Creates the return series of a portfolio of return series
+
+        Components are aligned on the union of their dates, and weights drift
+        with their returns between rebalances. See
+        ``pyform.returns.portfolio.calc_portfolio``.
+
+        Args:
+            series: components of the portfolio. Each is named by its ``name``.
+            weights: target weights, adding up to 1. Either static weights, as a
+                dict or Series by component name, or a DataFrame schedule with one
+                row of weights per date they apply from.
+            rebalance: frequency to rebalance to the targets at, e.g. "M", "Q" or
+                "Y", or a ``pyform.Calendar``. Defaults to None, which only
+                rebalances on the dates of the weights schedule.
+            name: name of the portfolio. Defaults to "portfolio".
+
+        Returns:
+            pyform.ReturnSeries: returns of the portfolio
+        """
+
+        df = pd.concat(
+            [s.series.iloc[:, 0].rename(s.name) for s in series], axis=1, sort=True
+        )
+        returns, _ = calc_portfolio(df, weights, rebalance)
+
+        return cls(returns.rename(name).to_frame(), name)
+
 
 class CashSeries(ReturnSeries):
     @classmethod
@@ -2,10 +2,70 @@ import logging
 
 log = logging.getLogger(__name__)
 
+import os
+import glob
 import pandas as pd
-from typing import Optional, Union
-from pyform.util.dataframe import set_col_as_datetime_index
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from pyform.util.dataframe import set_col_as_datetime_index, set_date_index
+from pyform.util.fingerprint import (
+    new_fingerprint,
+    update_fingerprint,
+    format_fingerprint,
+)
 from pyform.util.freq import infer_freq
+from pyform.util.index import intern_frame_index
+
+# file extensions supported by the bulk loaders
+_CSV_EXTENSIONS = [".csv", ".txt"]
+_EXCEL_EXTENSIONS = [".xlsx", ".xlsm"]
+
+
+def _expand_paths(paths: Union[str, List[str]]) -> List[str]:
+    """Expands a glob pattern to the sorted list of matching paths.
+
+    Args:
+        paths: a glob pattern, e.g. "data/*.csv", or a list of paths
+
+    Returns:
+        List[str]: paths. A pattern that matches nothing is kept as is, so it is
+            reported as a file that cannot be read.
+    """
+
+    if isinstance(paths, str):
+        return sorted(glob.glob(paths)) or [paths]
+
+    return list(paths)
+
+
+def _read_file(
+    cls,
+    path: str,
+    sheet_name: Union[str, int] = 0,
+    date_format: Optional[str] = None,
+    dtype: Optional[Dict] = None,
+    usecols: Optional[List[str]] = None,
+) -> "TimeSeries":
+    """Reads one file with the reader matching its extension.
+
+    This is a module level function so it can be sent to worker processes.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in _CSV_EXTENSIONS:
+        return cls.read_csv(path, date_format=date_format, dtype=dtype, usecols=usecols)
+
+    if extension in _EXCEL_EXTENSIONS:
+        return cls.read_excel(
+            path,
+            sheet_name=sheet_name,
+            date_format=date_format,
+            dtype=dtype,
+            usecols=usecols,
+        )
+
+    raise ValueError(f"File type is not supported: path={path}")
 
 
 class TimeSeries:
@@ -26,34 +86,78 @@ class TimeSeries:
         # _series stores the initial input. This allows us to
         # go to different timerange and comeback, without losing
         # any information
-        self._series = df.copy()
+        # the index is interned, so series on the same calendar, and _series and
+        # series themselves, share one index object
+        self._series = intern_frame_index(df.copy())
         self._start = min(self._series.index)
         self._end = max(self._series.index)
 
         # start and end date of the series
-        self.series = df.copy()
+        self.series = intern_frame_index(df.copy())
         self.start = min(self.series.index)
         self.end = max(self.series.index)
 
         # frequency of the series
         self.freq = infer_freq(self.series)
 
+        # fingerprint of the data, computed once and updated on append
+        self._fingerprint = new_fingerprint(self._series)
+
+    @property
+    def fingerprint(self) -> str:
+        """str: fingerprint of all the data of the series, regardless of the
+        date range set. Series with the same data have the same fingerprint.
+        """
+
+        return format_fingerprint(self._fingerprint)
+
+    @property
+    def key(self) -> Tuple[str, int, int]:
+        """Tuple[str, int, int]: key of the series in its current date range, the
+        fingerprint and the start and end positions of the range in the data.
+        """
+
+        index = self._series.index
+        start = index.searchsorted(self.start)
+        end = index.searchsorted(self.end, side="right")
+
+        return self.fingerprint, int(start), int(end)
+
     @classmethod
-    def read_csv(cls, path: str):
+    def read_csv(
+        cls,
+        path: str,
+        date_format: Optional[str] = None,
+        dtype: Optional[Dict] = None,
+        usecols: Optional[List[str]] = None,
+    ):
         """Creates a time series object from a csv file
 
         Args:
             path: path to the csv file
+            date_format: format of the dates, e.g. "%Y-%m-%d". Defaults to None,
+                which detects the format from a sample of the dates.
+            dtype: data type of columns, e.g. {"SPY": "float64"}. Defaults to None,
+                which infers data types.
+            usecols: columns to read, including the date column. Defaults to None,
+                which reads all columns.
 
         Returns:
             pyform.TimeSeries: a TimeSeries object
         """
 
-        df = pd.read_csv(path)
-        return cls(df)
+        df = pd.read_csv(path, dtype=dtype, usecols=usecols)
+        return cls(set_date_index(df, date_format))
 
     @classmethod
-    def read_excel(cls, path: str, sheet_name: Union[str, int] = 0):
+    def read_excel(
+        cls,
+        path: str,
+        sheet_name: Union[str, int] = 0,
+        date_format: Optional[str] = None,
+        dtype: Optional[Dict] = None,
+        usecols: Optional[List[str]] = None,
+    ):
         """Creates a time series object from a Excel file
 
         Note:
@@ -62,13 +166,156 @@ class TimeSeries:
         Args:
             path: path to the Excel file
             sheet_name: the index or name of the sheet to read in. Defaults to 0.
+            date_format: format of the dates, when they are stored as text.
+                Defaults to None, which detects the format from a sample of the
+                dates.
+            dtype: data type of columns, e.g. {"SPY": "float64"}. Defaults to None,
+                which infers data types.
+            usecols: columns to read, including the date column. Defaults to None,
+                which reads all columns.
 
         Returns:
             pyform.TimeSeries: a TimeSeries object
         """
 
-        df = pd.read_excel(path, sheet_name=sheet_name, engine="openpyxl")
-        return cls(df)
+        df = pd.read_excel(
+            path, sheet_name=sheet_name, engine="openpyxl", dtype=dtype, usecols=usecols
+        )
+        return cls(set_date_index(df, date_format))
+
+    @classmethod
+    def iter_read(
+        cls,
+        paths: Union[str, List[str]],
+        workers: Optional[int] = None,
+        executor: Optional[str] = None,
+        sheet_name: Union[str, int] = 0,
+        date_format: Optional[str] = None,
+        dtype: Optional[Dict] = None,
+        usecols: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[str, Optional["TimeSeries"], Optional[Exception]]]:
+        """Reads many csv and Excel files concurrently, and yields each of them as
+        soon as it is read.
+
+        A file that cannot be read does not stop the others, its error is yielded
+        instead.
+
+        Args:
+            paths: a glob pattern, e.g. "data/*.csv", or a list of paths
+            workers: number of threads or processes reading files. Defaults to
+                None, which uses the default of ``concurrent.futures``. 1 reads
+                files one by one, in the current thread.
+            executor: {'thread', 'process'}. Threads suit csv files, as the pandas
+                csv parser releases the GIL, while processes suit Excel files,
+                which are parsed in Python. Defaults to None, which uses threads
+                when all files are csv files, and processes otherwise.
+            sheet_name: the index or name of the sheet to read in Excel files.
+                Defaults to 0.
+            date_format: format of the dates, e.g. "%Y-%m-%d". Defaults to None,
+                which detects the format from a sample of the dates of each file.
+            dtype: data type of columns, e.g. {"SPY": "float64"}. Defaults to None,
+                which infers data types.
+            usecols: columns to read, including the date column. Defaults to None,
+                which reads all columns.
+
+        Raises:
+            ValueError: when executor is not supported
+
+        Yields:
+            Tuple[str, Optional[TimeSeries], Optional[Exception]]: path, and either
+                the object read from it, or the error raised while reading it
+        """
+
+        paths = _expand_paths(paths)
+
+        if executor is None:
+            is_csv = [os.path.splitext(p)[1].lower() in _CSV_EXTENSIONS for p in paths]
+            executor = "thread" if all(is_csv) else "process"
+
+        if executor not in ["thread", "process"]:
+            raise ValueError("Executor should be one of 'thread' or 'process'")
+
+        options = (sheet_name, date_format, dtype, usecols)
+
+        if workers == 1:
+
+            for path in paths:
+                try:
+                    yield path, _read_file(cls, path, *options), None
+                except Exception as e:
+                    yield path, None, e
+
+            return
+
+        pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+
+        log.info(f"Reading files. files={len(paths)}, executor={executor}")
+
+        with pool_class(max_workers=workers) as pool:
+
+            futures = {
+                pool.submit(_read_file, cls, path, *options): path for path in paths
+            }
+
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as e:
+                    yield futures[future], None, e
+
+    @classmethod
+    def read_many(
+        cls,
+        paths: Union[str, List[str]],
+        workers: Optional[int] = None,
+        executor: Optional[str] = None,
+        sheet_name: Union[str, int] = 0,
+        date_format: Optional[str] = None,
+        dtype: Optional[Dict] = None,
+        usecols: Optional[List[str]] = None,
+    ) -> Dict[str, "TimeSeries"]:
+        """Reads many csv and Excel files concurrently
+
+        Files that cannot be read are logged and skipped. Use ``iter_read`` to
+        handle each file, or its error, as soon as it is read.
+
+        Args:
+            paths: a glob pattern, e.g. "data/*.csv", or a list of paths
+            workers: number of threads or processes reading files. Defaults to
+                None, which uses the default of ``concurrent.futures``.
+            executor: {'thread', 'process'}. Defaults to None, which uses threads
+                when all files are csv files, and processes otherwise.
+            sheet_name: the index or name of the sheet to read in Excel files.
+                Defaults to 0.
+            date_format: format of the dates, e.g. "%Y-%m-%d". Defaults to None,
+                which detects the format from a sample of the dates of each file.
+            dtype: data type of columns, e.g. {"SPY": "float64"}. Defaults to None,
+                which infers data types.
+            usecols: columns to read, including the date column. Defaults to None,
+                which reads all columns.
+
+        Returns:
+            Dict[str, TimeSeries]: objects read, keyed by path, in the order of
+                paths
+        """
+
+        result = dict()
+
+        read = cls.iter_read(
+            paths, workers, executor, sheet_name, date_format, dtype, usecols
+        )
+
+        for path, series, error in read:
+
+            if error is not None:
+                log.error(f"Cannot read file: path={path}: {error}")
+                continue
+
+            result[path] = series
+
+        order = {path: i for i, path in enumerate(_expand_paths(paths))}
+
+        return dict(sorted(result.items(), key=lambda item: order[item[0]]))
 
     @classmethod
     def read_db(cls, query: str):
@@ -139,12 +386,15 @@ class TimeSeries:
                 Defaults to None.
         """
 
+        # slice before copying, so only the date range is copied
         if start is not None and end is not None:
-            self.series = self._series.copy().loc[start:end]
+            self.series = self._series.loc[start:end].copy()
         elif start is not None:
-            self.series = self._series.copy().loc[start:]
+            self.series = self._series.loc[start:].copy()
         elif end is not None:
-            self.series = self._series.copy().loc[:end]
+            self.series = self._series.loc[:end].copy()
+
+        intern_frame_index(self.series)
 
         self.start = min(self.series.index)
         self.end = max(self.series.index)
@@ -158,10 +408,51 @@ class TimeSeries:
 
         series.set_daterange(start=self.start, end=self.end)
 
+    def append(self, df: pd.DataFrame):
+        """Appends data after the end of the series.
+
+        The fingerprint is updated with the new rows only. If the current date
+        range runs to the end of the data, it is extended to include them.
+
+        Args:
+            df: a dataframe with datetime index, or a 'date'/'datetime' column,
+                with the same columns as the series
+
+        Raises:
+            ValueError: when columns differ, or data does not start after the end
+                of the series
+        """
+
+        df = self._validate_input(df.copy())
+
+        if list(df.columns) != list(self._series.columns):
+            raise ValueError(
+                "Appended columns should match the series: "
+                f"columns={list(df.columns)}, expected={list(self._series.columns)}"
+            )
+
+        if df.empty:
+            return
+
+        if not df.index.is_monotonic_increasing or min(df.index) <= self._end:
+            raise ValueError(
+                "Appended data should be sorted and start after the end of the "
+                f"series: start={min(df.index)}, end={self._end}"
+            )
+
+        extend = self.end == self._end
+
+        self._series = intern_frame_index(pd.concat([self._series, df]))
+        self._end = max(self._series.index)
+        self._fingerprint = update_fingerprint(self._fingerprint, df)
+
+        if extend:
+            self.set_daterange(start=self.start)
+
     def reset(self):
         """Resets TimeSeries to its initial state
         """
 
-        self.series = self._series.copy()
+        self.series = intern_frame_index(self._series.copy())
         self.start = min(self.series.index)
         self.end = max(self.series.index)
@@ -0,0 +1,127 @@
+import weakref
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+# Alignments computed so far, keyed by the identity of both indexes. Indexes are
+# interned, see ``pyform.util.index``, so the same calendar pair, including the
+# same date range window, hits the cache no matter which series it comes from.
+_align_cache = dict()
+_align_cache_size = 1024
+
+
+def _align_sorted(
+    left: np.ndarray, right: np.ndarray, how: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aligns two sorted int64 arrays without duplicates.
+
+    Args:
+        left: sorted values
+        right: sorted values
+        how: {'inner', 'outer'}
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: aligned values, and positions of
+            them in left and right. Positions are -1 where a value is missing.
+    """
+
+    if how == "inner":
+
+        if len(right) == 0:
+            empty = np.array([], dtype=np.int64)
+            return left[:0], empty, empty
+
+        pos = np.searchsorted(right, left)
+        pos_clipped = np.minimum(pos, len(right) - 1)
+        found = (pos < len(right)) & (right[pos_clipped] == left)
+        left_take = np.flatnonzero(found)
+
+        return left[left_take], left_take, pos[found]
+
+    # outer: union of both, and where each value sits in left and right
+    values = np.union1d(left, right)
+
+    takes = []
+    for side in [left, right]:
+        if len(side) == 0:
+            takes.append(np.full(len(values), -1))
+            continue
+        pos = np.searchsorted(side, values)
+        pos_clipped = np.minimum(pos, len(side) - 1)
+        found = (pos < len(side)) & (side[pos_clipped] == values)
+        takes.append(np.where(found, pos, -1))
+
+    return values, takes[0], takes[1]
+
+
+def align_index(
+    left: pd.DatetimeIndex, right: pd.DatetimeIndex, how: str = "inner"
+) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+    """Aligns two sorted datetime indexes, and gets the take indices that gather
+    values of each side onto the aligned index.
+
+    The alignment is a ``searchsorted`` over the int64 representation of the
+    indexes, and is cached per pair of index objects, so aligning a series with
+    a benchmark over the same window again is free.
+
+    Args:
+        left: sorted datetime index without duplicates
+        right: sorted datetime index without duplicates
+        how: {'inner', 'outer'}. Defaults to "inner".
+
+    Raises:
+        ValueError: when how is not supported
+
+    Returns:
+        Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]: aligned index, and
+            positions of it in left and right. Positions are -1 where a date is
+            missing from that side.
+    """
+
+    if how not in ["inner", "outer"]:
+        raise ValueError("How should be one of 'inner' or 'outer'")
+
+    if left is right:
+        take = np.arange(len(left))
+        return left, take, take
+
+    key = (id(left), id(right), how)
+    cached = _align_cache.get(key)
+
+    # ids can be reused once an index is garbage collected, check it is alive
+    if cached is not None and cached[0]() is left and cached[1]() is right:
+        return cached[2]
+
+    values, left_take, right_take = _align_sorted(left.asi8, right.asi8, how)
+    index = pd.DatetimeIndex(values.view("datetime64[ns]"), name=left.name)
+
+    # int64 values of timezone aware indexes are UTC
+    if left.tz is not None:
+        index = index.tz_localize("UTC").tz_convert(left.tz)
+
+    result = (index, left_take, right_take)
+
+    if len(_align_cache) >= _align_cache_size:
+        _align_cache.clear()
+
+    _align_cache[key] = (weakref.ref(left), weakref.ref(right), result)
+
+    return result
+
+
+def take(values: np.ndarray, indexer: np.ndarray, fill_value: float = np.nan):
+    """Gathers values at positions, filling positions of -1 with fill_value.
+
+    Args:
+        values: 1-d or 2-d array, gathered along axis 0
+        indexer: positions, as returned by ``align_index``
+        fill_value: value for missing positions. Defaults to NaN.
+
+    Returns:
+        np.ndarray: gathered values, as float64
+    """
+
+    result = np.asarray(values, dtype=np.float64)[indexer]
+    result[indexer < 0] = fill_value
+
+    return result
@@ -0,0 +1,321 @@
+import weakref
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Tuple, Union
+from pyform.returns.compound import _check_method, _compound_sums
+
+# one day, periods of a calendar run from their first day to their last day
+_ONE_DAY = pd.Timedelta(days=1)
+
+
+class Calendar:
+    """A reporting calendar, i.e. a sequence of consecutive periods.
+
+    Period boundaries are computed once, when the calendar is created, and dates
+    are mapped to periods with a binary search over them. One calendar can then be
+    reused to convert every series in a universe, e.g. as the ``freq`` argument of
+    ``ReturnSeries.to_period`` and the ``get_*`` methods.
+
+    Args:
+        edges: sorted boundaries of the periods. Period i covers dates from
+            ``edges[i]`` up to, but excluding, ``edges[i + 1]``.
+        labels: label of each period, one fewer than edges. Defaults to None,
+            which labels each period by its last day.
+        years: calendar of the (fiscal) years the periods roll up to, used by
+            ``table_calendar_return``. Defaults to None.
+        name: name of the calendar. Defaults to None.
+
+    Raises:
+        ValueError: when edges are not strictly increasing, or labels do not
+            match the number of periods
+    """
+
+    def __init__(
+        self,
+        edges: Sequence,
+        labels: Optional[Sequence] = None,
+        years: Optional["Calendar"] = None,
+        name: Optional[str] = None,
+    ):
+
+        self.edges = pd.DatetimeIndex(edges)
+
+        if len(self.edges) < 2 or not (np.diff(self.edges.asi8) > 0).all():
+            raise ValueError("Calendar edges should be at least two increasing dates")
+
+        if labels is None:
+            labels = self.edges[1:] - _ONE_DAY
+
+        self.labels = pd.DatetimeIndex(labels, name="datetime")
+
+        if len(self.labels) != len(self.edges) - 1:
+            raise ValueError(
+                "Calendar should have one label per period: "
+                f"periods={len(self.edges) - 1}, labels={len(self.labels)}"
+            )
+
+        self.years = years
+        self.name = name
+
+        # periods of indexes mapped so far, keyed by the identity of the index
+        self._ids_cache = dict()
+
+    def __len__(self) -> int:
+
+        return len(self.labels)
+
+    def __repr__(self) -> str:
+
+        # cached results are keyed by repr, so it covers everything that changes
+        # them, the years calendar by its own repr
+        digest = hashlib.sha1(self.edges.asi8.tobytes())
+        digest.update(self.labels.asi8.tobytes())
+        digest.update(repr(self.years).encode())
+
+        return (
+            f"Calendar(name={self.name}, periods={len(self)}, "
+            f"start={self.edges[0]}, end={self.edges[-1]}, "
+            f"digest={digest.hexdigest()[:12]})"
+        )
+
+    @classmethod
+    def from_freq(
+        cls,
+        freq: str,
+        start,
+        end,
+        year_end: Optional[str] = "DEC",
+        name: Optional[str] = None,
+    ) -> "Calendar":
+        """Creates a calendar of periods ending on a pandas offset alias.
+
+        Use anchored aliases for fiscal calendars, e.g. "Q-JUN" for quarters of
+        a fiscal year ending in June.
+
+        Args:
+            freq: offset alias of daily or lower frequency, whose dates are the last
+                day of each period, e.g. "M", "W-FRI" or "Q-JUN".
+                Available options can be found `here <https://tinyurl.com/t78g6bh>`_.
+            start: first date the calendar should cover
+            end: last date the calendar should cover
+            year_end: month the (fiscal) year ends in, e.g. "JUN". Defaults to "DEC".
+                None creates a calendar without years.
+            name: name of the calendar. Defaults to freq.
+
+        Returns:
+            Calendar: the calendar
+        """
+
+        offset = pd.tseries.frequencies.to_offset(freq)
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+
+        # periods cover whole years, so they can be numbered within each year
+        years = None
+        if year_end is not None and freq != f"A-{year_end}":
+            years = cls.from_freq(f"A-{year_end}", start, end, year_end=None)
+            start, end = years.edges[0], years.edges[-1] - _ONE_DAY
+
+        # one more period end on each side, so start and end are covered
+        ends = pd.date_range(start - offset, end + offset, freq=offset).normalize()
+
+        return cls(ends + _ONE_DAY, years=years, name=name or freq)
+
+    @classmethod
+    def from_retail(
+        cls,
+        start,
+        end,
+        pattern: Sequence[int] = (4, 4, 5),
+        year_end_month: int = 12,
+        weekday: int = 5,
+        name: Optional[str] = None,
+    ) -> "Calendar":
+        """Creates a retail calendar of 52-53 week years, e.g. a 4-4-5 calendar.
+
+        Years end on the last given weekday of the year end month. Each quarter is
+        split in periods of whole weeks given by pattern, and the extra week of a
+        53 week year is added to its last period.
+
+        Args:
+            start: first date the calendar should cover
+            end: last date the calendar should cover
+            pattern: number of weeks in each period of a quarter, adding up to 13.
+                Defaults to (4, 4, 5).
+            year_end_month: month the year ends in. Defaults to 12.
+            weekday: day of week the year ends on, Monday is 0. Defaults to 5,
+                i.e. Saturday.
+            name: name of the calendar. Defaults to the pattern, e.g. "4-4-5".
+
+        Raises:
+            ValueError: when the pattern does not add up to 13 weeks
+
+        Returns:
+            Calendar: the calendar
+        """
+
+        if sum(pattern) != 13:
+            raise ValueError(f"Pattern should add up to 13 weeks: pattern={pattern}")
+
+        offset = pd.offsets.FY5253(
+            weekday=weekday, startingMonth=year_end_month, variation="last"
+        )
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        year_ends = pd.date_range(start - offset, end + offset, freq=offset)
+
+        weeks = np.cumsum(np.tile(pattern, 4))[:-1]
+        edges = [year_ends[0] + _ONE_DAY]
+
+        for year_end in year_ends[1:]:
+            year_start = edges[-1]
+            edges += [year_start + pd.Timedelta(weeks=int(w)) for w in weeks]
+            edges.append(year_end + _ONE_DAY)
+
+        years = cls(year_ends + _ONE_DAY, name="retail year")
+
+        return cls(edges, years=years, name=name or "-".join(map(str, pattern)))
+
+    @classmethod
+    def from_sessions(
+        cls, sessions: Sequence, name: Optional[str] = None
+    ) -> "Calendar":
+        """Creates a calendar with one period per trading session, e.g. from an
+        exchange calendar. Dates from the close of a session to the next session,
+        such as weekends and holidays, belong to the earlier session.
+
+        Args:
+            sessions: dates of the sessions
+            name: name of the calendar. Defaults to "sessions".
+
+        Returns:
+            Calendar: the calendar
+        """
+
+        sessions = pd.DatetimeIndex(sessions).normalize().unique().sort_values()
+        edges = sessions.append(pd.DatetimeIndex([sessions[-1] + _ONE_DAY]))
+
+        return cls(edges, labels=sessions, name=name or "sessions")
+
+    def bucket_ids(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Maps dates to the periods they belong to, with a binary search over the
+        period boundaries. Results are cached per index object, so series sharing
+        one interned index are only mapped once.
+
+        Args:
+            index: dates to map
+
+        Raises:
+            ValueError: when dates are outside of the calendar
+
+        Returns:
+            np.ndarray: position of the period of each date
+        """
+
+        cached = self._ids_cache.get(id(index))
+        if cached is not None and cached[0]() is index:
+            return cached[1]
+
+        ids = self.edges.searchsorted(index, side="right") - 1
+
+        outside = (ids < 0) | (ids >= len(self))
+        if outside.any():
+            raise ValueError(
+                "Dates are outside of the calendar: "
+                f"first={index[outside][0]}, calendar={self}"
+            )
+
+        if len(self._ids_cache) >= 1024:
+            self._ids_cache.clear()
+
+        try:
+            self._ids_cache[id(index)] = (weakref.ref(index), ids)
+        except TypeError:  # pragma: no cover
+            pass
+
+        return ids
+
+    def period_bounds(self, labels: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+        """Gets the first day of periods, and the day after their last day.
+
+        Args:
+            labels: labels of periods of the calendar, e.g. the index returned by
+                ``to_period``
+
+        Raises:
+            ValueError: when a label is not a period of the calendar
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: start and end of each period, as int64
+                nanoseconds
+        """
+
+        ids = self.labels.get_indexer(labels)
+
+        if (ids < 0).any():
+            raise ValueError(f"Labels are not periods of the calendar: {self}")
+
+        edges = self.edges.asi8
+
+        return edges[ids], edges[ids + 1]
+
+    def to_period(
+        self, df: pd.DataFrame, method: str, empty: Union[float, int] = 0.0,
+    ) -> pd.DataFrame:
+        """Converts return series to the periods of the calendar.
+
+        Returns in each period are compounded at once for all series, with
+        weighted ``np.bincount`` sums over the period of each date.
+
+        Args:
+            df: a time indexed pandas dataframe, one column per series
+            method: compounding method when converting to lower frequency.
+
+                * 'geometric': geometric compounding ``(1+r1) * (1+r2) - 1``
+                * 'arithmetic': arithmetic compounding ``r1 + r2``
+                * 'continuous': continous compounding ``exp(r1+r2) - 1``
+
+            empty: value of periods in which a series has no returns. Defaults to
+                0, the same as ``ret_to_period``.
+
+        Raises:
+            ValueError: when method is not supported, or dates are outside of the
+                calendar
+
+        Returns:
+            pd.DataFrame: return series, indexed by the labels of the periods from
+                the first to the last date of df
+        """
+
+        _check_method(method)
+
+        if df.empty:
+            return pd.DataFrame(columns=df.columns, index=self.labels[:0])
+
+        ids = self.bucket_ids(df.index)
+        first, last = ids.min(), ids.max()
+        ids = ids - first
+        periods = last - first + 1
+
+        values = df.to_numpy(dtype=np.float64)
+
+        def total(x):
+            sums = np.empty((periods, x.shape[1]))
+            for col in range(x.shape[1]):
+                available = ~np.isnan(x[:, col])
+                sums[:, col] = np.bincount(
+                    ids[available], weights=x[available, col], minlength=periods
+                )
+            return sums
+
+        result = _compound_sums(values, method, total)
+
+        missing = np.empty((periods, values.shape[1]), dtype=bool)
+        for col in range(values.shape[1]):
+            available = ~np.isnan(values[:, col])
+            missing[:, col] = np.bincount(ids[available], minlength=periods) == 0
+
+        result[missing] = empty
+
+        return pd.DataFrame(
+            data=result, index=self.labels[first : last + 1], columns=df.columns
+        )
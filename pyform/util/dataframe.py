@@ -1,13 +1,146 @@
+import threading
+import numpy as np
 import pandas as pd
+from typing import Optional
 
+# Formats tried, in order, when detecting the format of a date column. Month first
+# is preferred over day first, unless a day larger than 12 rules it out.
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%Y%m%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%m-%d-%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+]
 
-def set_col_as_datetime_index(df: pd.DataFrame, col: str) -> pd.DataFrame:
+# Dates parsed so far, shared by all files read in this process. One series per
+# format, with parsed dates indexed by date string. Series are replaced rather than
+# modified, under the lock, as files may be read from several threads.
+_date_cache = dict()
+_date_cache_size = 1_000_000
+_date_cache_lock = threading.Lock()
+
+
+def clear_date_cache():
+    """Clears the cache of parsed date strings"""
+
+    with _date_cache_lock:
+        _date_cache.clear()
+
+
+def detect_date_format(values, sample: Optional[int] = 20) -> Optional[str]:
+    """Detects the format of date strings, from a sample of them.
+
+    Args:
+        values: date strings
+        sample: number of strings to check, taken evenly across values.
+            Defaults to 20.
+
+    Returns:
+        Optional[str]: the first format in ``DATE_FORMATS`` all sampled strings
+            match, None if none of them matches
+    """
+
+    values = np.asarray(values, dtype=object)
+
+    if len(values) == 0:
+        return None
+
+    positions = np.linspace(0, len(values) - 1, min(sample, len(values)))
+    sampled = values[positions.astype(int)]
+    sampled = sampled[~pd.isna(sampled)].astype(str)
+
+    if len(sampled) == 0:
+        return None
+
+    for date_format in DATE_FORMATS:
+        try:
+            pd.to_datetime(sampled, format=date_format)
+            return date_format
+        except (ValueError, TypeError):
+            continue
+
+    return None
+
+
+def parse_dates(values, date_format: Optional[str] = None) -> pd.DatetimeIndex:
+    """Parses date strings to datetime, parsing each unique string once.
+
+    Unique strings are looked up in a cache shared by all files, and only the ones
+    not seen before are parsed, in one call with an explicit format. Values that
+    are not strings, such as the datetime cells of an Excel file, are converted
+    directly.
+
+    Args:
+        values: dates to parse
+        date_format: format of the date strings, e.g. "%Y-%m-%d". Defaults to None,
+            which detects the format from a sample of the strings, and falls back
+            to pandas inference if no format matches.
+
+    Returns:
+        pd.DatetimeIndex: parsed dates
+    """
+
+    values = pd.Index(values)
+
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return pd.DatetimeIndex(pd.to_datetime(values))
+
+    codes, uniques = pd.factorize(values)
+
+    if date_format is None:
+        date_format = detect_date_format(uniques)
+
+    # look up all unique strings in the cache at once
+    cache = _date_cache.get(date_format, pd.Series(dtype="datetime64[ns]"))
+    position = cache.index.get_indexer(uniques)
+    found = position >= 0
+
+    parsed = np.empty(len(uniques), dtype="datetime64[ns]")
+    parsed[found] = cache.values[position[found]]
+
+    if not found.all():
+
+        missing = uniques[~found]
+        new = pd.to_datetime(missing, format=date_format).values
+        parsed[~found] = new
+
+        with _date_cache_lock:
+
+            # another thread may have added some of the strings since the lookup
+            cache = _date_cache.get(date_format, cache)
+            added = ~missing.isin(cache.index)
+
+            if len(cache.index) + len(missing) > _date_cache_size:
+                cache = cache.iloc[:0]
+
+            _date_cache[date_format] = pd.concat(
+                [cache, pd.Series(new[added], index=missing[added])]
+            )
+
+    # missing values have code -1
+    dates = np.where(codes >= 0, parsed[codes], np.datetime64("NaT"))
+
+    return pd.DatetimeIndex(dates)
+
+
+def set_col_as_datetime_index(
+    df: pd.DataFrame, col: str, date_format: Optional[str] = None
+) -> pd.DataFrame:
     """Sets a column in the DataFrame as its datetime index, and name
     the index "datetime"
 
     Args:
         df: dataframe to set datetime index
         col: column to set as the datetime index for the DataFrame
+        date_format: format of the dates, e.g. "%Y-%m-%d". Defaults to None, which
+            detects the format from a sample of the dates.
 
     Raises:
         ValueError: when column cannot be converted to datetime index
@@ -18,8 +151,30 @@ def set_col_as_datetime_index(df: pd.DataFrame, col: str) -> pd.DataFrame:
 
     try:
         df = df.set_index(col)
-        df.index = pd.to_datetime(df.index)
+        df.index = parse_dates(df.index, date_format)
         df.index.name = "datetime"
         return df
     except Exception as err:
         raise ValueError(f"Error converting '{col}' to index: {err}")
+
+
+def set_date_index(df: pd.DataFrame, date_format: Optional[str] = None) -> pd.DataFrame:
+    """Sets the 'datetime' or 'date' column of a file as datetime index, parsing
+    it with date_format.
+
+    Args:
+        df: dataframe read from a file
+        date_format: format of the dates, e.g. "%Y-%m-%d". Defaults to None, which
+            detects the format from a sample of the dates.
+
+    Returns:
+        pd.DataFrame: a pandas dataframe with datetime index, or df unchanged if it
+            has neither column
+    """
+
+    # datetime column is preferred, same as TimeSeries
+    for col in ["datetime", "date"]:
+        if col in df:
+            return set_col_as_datetime_index(df, col, date_format)
+
+    return df
@@ -0,0 +1,117 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+# state of a fingerprint: combined hash, multiplier of the next row, number of rows
+FingerprintState = Tuple[int, int, int]
+
+_MASK = (1 << 64) - 1
+
+# odd multiplier, so the combined hash depends on the order of rows
+_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """Scrambles 64 bit values with the splitmix64 finalizer."""
+
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+    return x ^ (x >> np.uint64(31))
+
+
+def _as_words(values: pd.Series) -> np.ndarray:
+    """Reinterprets a column as 64 bit words, without copying numeric data."""
+
+    array = values.to_numpy()
+
+    if array.dtype.kind in "fiumM" and array.dtype.itemsize == 8:
+        return np.ascontiguousarray(array).view(np.uint64)
+
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Hashes each row of a time indexed DataFrame, from the raw buffers of its
+    index and columns.
+
+    Args:
+        df: a time indexed pandas dataframe
+
+    Returns:
+        np.ndarray: one uint64 hash per row
+    """
+
+    with np.errstate(over="ignore"):
+
+        hashes = _mix(df.index.asi8.view(np.uint64))
+
+        for col in df.columns:
+            hashes = _mix(hashes ^ _mix(_as_words(df[col])))
+
+    return hashes
+
+
+def new_fingerprint(df: pd.DataFrame) -> FingerprintState:
+    """Computes the fingerprint of a time indexed DataFrame.
+
+    Column names and data types seed the fingerprint, and rows are combined in
+    order with ``update_fingerprint``.
+
+    Args:
+        df: a time indexed pandas dataframe
+
+    Returns:
+        FingerprintState: state of the fingerprint
+    """
+
+    columns = repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()])
+    seed = hashlib.blake2b(columns.encode(), digest_size=8).digest()
+
+    return update_fingerprint((int.from_bytes(seed, "little"), 1, 0), df)
+
+
+def update_fingerprint(state: FingerprintState, df: pd.DataFrame) -> FingerprintState:
+    """Updates a fingerprint with rows appended to the data, in O(rows appended).
+
+    The combined hash is ``seed + sum(hash[i] * multiplier ** i)``, modulo 2 ** 64,
+    so updating with rows in parts gives the same fingerprint as computing it
+    over all rows at once.
+
+    Args:
+        state: state of the fingerprint
+        df: rows appended
+
+    Returns:
+        FingerprintState: state of the fingerprint, including the rows
+    """
+
+    value, power, count = state
+    n = len(df.index)
+
+    if n == 0:
+        return state
+
+    with np.errstate(over="ignore"):
+        powers = np.full(n, _MULTIPLIER, dtype=np.uint64)
+        powers[0] = power
+        powers = np.cumprod(powers, dtype=np.uint64)
+        value = (value + int(np.sum(row_hashes(df) * powers, dtype=np.uint64))) & _MASK
+
+    power = (int(powers[-1]) * _MULTIPLIER) & _MASK
+
+    return value, power, count + n
+
+
+def format_fingerprint(state: FingerprintState) -> str:
+    """Formats a fingerprint as a string, of the combined hash and number of rows.
+
+    Args:
+        state: state of the fingerprint
+
+    Returns:
+        str: fingerprint
+    """
+
+    return f"{state[0]:016x}-{state[2]}"
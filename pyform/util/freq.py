@@ -1,5 +1,31 @@
+import numpy as np
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import BusinessDay
+from pyform.config import get_option
+
+# date frequencies are measured from, a Monday
+_REFERENCE_DATE = pd.Timestamp("2001-01-01")
+
+# nanoseconds in a day, sessions are counted on the int64 timestamps
+_DAY_NANOS = 86_400 * 10 ** 9
+
+# nanoseconds in a year of 365.25 days, as used by calc_timedelta_in_years
+_YEAR_NANOS = pd.to_timedelta(365.25, unit="D").value
+
+
+def _freq_days(freq: str) -> float:
+    """Computes the average length of a period of a frequency, in days.
+
+    The length is measured over 12 periods from a fixed date, so anchored and
+    multiple frequencies such as "W-FRI", "Q-JUN" or "15T" are supported.
+    """
+
+    offset = to_offset(freq)
+    start = offset.rollforward(_REFERENCE_DATE)
+
+    return ((start + offset * 12) - start) / pd.Timedelta(days=1) / 12
 
 
 def is_lower_freq(freq1: str, freq2: str) -> bool:
@@ -7,6 +33,10 @@ def is_lower_freq(freq1: str, freq2: str) -> bool:
     Lower frequencies cannot be converted to higher frequencies
     due to lower resolution.
 
+    Frequencies are compared by the average length of their periods, so any
+    pandas offset alias is supported, from seconds ("S") and minutes ("T") to
+    years ("Y").
+
     Args:
         freq1: frequency 1
         freq2: frequency 2
@@ -15,10 +45,21 @@ def is_lower_freq(freq1: str, freq2: str) -> bool:
         bool: frequency 1 is lower than or euqal to frequency 2
     """
 
-    freq = ["H", "D", "B", "W", "M", "Q", "Y"]
-    freq = dict(zip(freq, [*range(0, len(freq))]))
+    return _freq_days(freq1) >= _freq_days(freq2)
+
+
+def is_intraday(freq: str) -> bool:
+    """Tests freq is a frequency of more than one period per day, e.g. "H",
+    "5T" or "S".
+
+    Args:
+        freq: frequency
+
+    Returns:
+        bool: whether the frequency is intraday
+    """
 
-    return freq[freq1] >= freq[freq2]
+    return _freq_days(freq) < 1
 
 
 def infer_freq(series: pd.DataFrame, use: Optional[int] = 50) -> str:
@@ -75,8 +116,9 @@ def infer_freq(series: pd.DataFrame, use: Optional[int] = 50) -> str:
 
 def calc_timedelta_in_years(start, end) -> float:
     """Computes timedelta between start and end dates, in years
-        To use this function, start and end dates should come
-        from a series of daily frequency.
+
+    Both dates count as whole days, so the time of day of intraday timestamps
+    does not change the result.
 
     Args:
         start: start date
@@ -90,6 +132,8 @@ def calc_timedelta_in_years(start, end) -> float:
     one_year = pd.to_timedelta(365.25, unit="D")
     one_day = pd.to_timedelta(1, unit="D")
 
+    start, end = start.normalize(), end.normalize()
+
     # Compute the duration of the series in terms of number of years
     years = (end - start + one_day) / one_year
 
@@ -114,3 +158,102 @@ def calc_samples_per_year(num_samples: int, start, end) -> float:
     samples_per_year = num_samples / years
 
     return samples_per_year
+
+
+def count_sessions(index: pd.DatetimeIndex) -> int:
+    """Counts the number of days with data, i.e. trading sessions, in a sorted
+    index, in one pass over its int64 timestamps.
+
+    Args:
+        index: sorted datetime index
+
+    Returns:
+        int: number of distinct days
+    """
+
+    if len(index) == 0:
+        return 0
+
+    days = index.asi8 // _DAY_NANOS
+
+    return int(np.count_nonzero(np.diff(days))) + 1
+
+
+def calc_index_samples_per_year(index: pd.DatetimeIndex, start, end) -> float:
+    """Computes number of data points per year of a series, given its index.
+
+    Intraday series only have data during trading sessions, so they are
+    annualized by session: the average number of samples per session times
+    the ``sessions_per_year`` option. Other series are annualized by calendar
+    time, see ``calc_samples_per_year``.
+
+    Args:
+        index: sorted datetime index of the samples
+        start: start date of samples
+        end: end date of samples
+
+    Returns:
+        float: average number of samples per year
+    """
+
+    sessions = count_sessions(index)
+
+    if sessions < len(index):
+        return len(index) / sessions * get_option("sessions_per_year")
+
+    return calc_samples_per_year(len(index), start, end)
+
+
+def calc_period_bounds(
+    index: pd.DatetimeIndex, freq: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Computes the first day of each period of a series converted to freq, and
+    the day after its last day, as int64 nanoseconds.
+
+    Daily and intraday periods are the day of their label. Lower frequency
+    periods run from the day after the previous label to their label, e.g. a
+    monthly return labelled 2020-02-29 covers 2020-02-01 to 2020-02-29.
+
+    Args:
+        index: consecutive period labels, as returned by ``to_period``
+        freq: frequency of the periods
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: start and end of each period
+    """
+
+    days = index.normalize()
+    ends = (days + pd.Timedelta(days=1)).asi8
+
+    offset = to_offset(freq)
+
+    if len(days) == 0 or _freq_days(freq) <= 1 or isinstance(offset, BusinessDay):
+        return days.asi8, ends
+
+    first = (days[0] - offset).value + _DAY_NANOS
+
+    return np.concatenate([[first], ends[:-1]]), ends
+
+
+def calc_rolling_years(starts: np.ndarray, ends: np.ndarray, window: int) -> np.ndarray:
+    """Computes the number of years covered by each rolling window of periods,
+    from the first day of its first period to the last day of its last period,
+    the same way as ``calc_timedelta_in_years``.
+
+    Args:
+        starts: first day of each period, as int64 nanoseconds
+        ends: day after the last day of each period, as int64 nanoseconds
+        window: number of periods in the rolling window
+
+    Returns:
+        np.ndarray: years of each window. The first ``window - 1`` are NaN.
+    """
+
+    years = np.full(len(ends), np.nan)
+
+    if len(ends) >= window:
+        years[window - 1 :] = (
+            ends[window - 1 :] - starts[: len(starts) - window + 1]
+        ) / (_YEAR_NANOS)
+
+    return years
@@ -0,0 +1,72 @@
+import weakref
+import numpy as np
+import pandas as pd
+
+# Interned indexes, keyed by length, first and last value, and a hash of all
+# values. Indexes are held weakly, so an index is dropped from the registry once
+# no series uses it anymore.
+_registry = weakref.WeakValueDictionary()
+
+
+def _index_key(index: pd.DatetimeIndex) -> tuple:
+    """Computes the registry key of an index: cheap checks first, then a hash of
+    all values.
+    """
+
+    values = index.asi8
+
+    return (
+        len(values),
+        int(values[0]),
+        int(values[-1]),
+        str(index.dtype),
+        index.freqstr,
+        index.name,
+        hash(values.tobytes()),
+    )
+
+
+def intern_index(index: pd.Index) -> pd.Index:
+    """Gets the shared index object equal to index.
+
+    Series with equal indexes, e.g. funds priced on the same calendar, then hold
+    one index object between them, and alignment can check for the same calendar
+    with ``is`` rather than comparing values.
+
+    Args:
+        index: index to intern. Only non-empty DatetimeIndex are interned, other
+            indexes are returned as is.
+
+    Returns:
+        pd.Index: the interned index, which is index itself the first time an
+            equal index is interned
+    """
+
+    if not isinstance(index, pd.DatetimeIndex) or len(index) == 0:
+        return index
+
+    key = _index_key(index)
+    interned = _registry.get(key)
+
+    # equal hashes are confirmed by comparing values
+    if interned is not None and np.array_equal(interned.asi8, index.asi8):
+        return interned
+
+    _registry[key] = index
+
+    return index
+
+
+def intern_frame_index(df: pd.DataFrame) -> pd.DataFrame:
+    """Replaces the index of a DataFrame, in place, with the interned index.
+
+    Args:
+        df: a time indexed pandas DataFrame
+
+    Returns:
+        pd.DataFrame: df, for chaining
+    """
+
+    df.index = intern_index(df.index)
+
+    return df
@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pyform import ReturnPanel, ReturnSeries
+from pyform.analysis import rank_peers
+
+rng = np.random.RandomState(0)
+metric = pd.DataFrame(
+    np.round(rng.normal(size=(50, 12)), 1),
+    index=pd.date_range("2015-01-31", periods=50, freq="M"),
+    columns=[f"fund{i}" for i in range(12)],
+)
+metric.iloc[rng.rand(50, 12) < 0.1] = np.nan
+groups = pd.Series(list("aaaabbbbcccc"), index=metric.columns)
+
+
+def expected_ranks(metric, groups, **kwargs):
+
+    expected = pd.DataFrame(np.nan, index=metric.index, columns=metric.columns)
+
+    for _, funds in groups.dropna().groupby(groups.dropna()):
+        expected[funds.index] = metric[funds.index].rank(axis=1, **kwargs)
+
+    return expected
+
+
+@pytest.mark.parametrize("method", ["average", "min"])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("pct", [True, False])
+def test_rank_peers(method, ascending, pct):
+
+    ranks = rank_peers(metric, groups, ascending, method, pct, chunksize=7)
+    expected = expected_ranks(
+        metric, groups, ascending=ascending, method=method, pct=pct
+    )
+
+    pd.testing.assert_frame_equal(ranks, expected, check_exact=False)
+
+
+def test_rank_peers_groups():
+
+    # one group
+    ranks = rank_peers(metric)
+    pd.testing.assert_frame_equal(ranks, metric.rank(axis=1, ascending=False))
+
+    # funds without a group are not ranked, labels may be given per column
+    labels = ["a"] * 6 + [None] * 6
+    ranks = rank_peers(metric, labels)
+    assert ranks.iloc[:, 6:].isna().all().all()
+    assert ranks.iloc[:, :6].max().max() <= 6
+
+    # or as a dict, with funds missing from it not ranked
+    ranks = rank_peers(metric, {"fund0": "a", "fund1": "a"}, pct=True)
+    assert ranks.iloc[:, 2:].isna().all().all()
+    assert set(ranks["fund0"].dropna()) <= {0.5, 0.75, 1.0}
+
+    with pytest.raises(ValueError):
+        rank_peers(metric, ["a", "b"])
+
+    with pytest.raises(ValueError):
+        rank_peers(metric, method="dense")
+
+
+def test_rank_peers_panel():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+    qqq = ReturnSeries.read_csv("tests/unit/data/qqq_returns.csv")
+    panel = ReturnPanel.from_series([returns, spy, qqq])
+
+    # rank rolling value at risk, the least negative first
+    var = panel.get_rolling_var(window=60, freq="W")
+    ranks = rank_peers(var, {"TWTR": "equity", "SPY": "equity", "QQQ": "equity"})
+
+    assert (ranks.dropna()["TWTR"] == 3).all()
@@ -1,5 +1,7 @@
+import pytest
+import numpy as np
 from pyform.analysis import table_calendar_return
-from pyform import ReturnSeries
+from pyform import ReturnSeries, Calendar
 
 returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
 
@@ -28,3 +30,22 @@ def test_calendar_return():
     ).all()
 
     assert calendar_return.iloc[0, 0] == 2013
+
+
+def test_calendar_return_calendar():
+
+    calendar = Calendar.from_freq("M", returns.start, returns.end)
+    calendar_return = table_calendar_return(returns, calendar=calendar)
+    expected = table_calendar_return(returns, use_month_abbr=False)
+
+    assert calendar_return.columns.tolist() == expected.columns.tolist()
+    assert np.allclose(calendar_return, expected, equal_nan=True)
+
+    # fiscal years are named by the year they end in
+    calendar = Calendar.from_freq("M", returns.start, returns.end, year_end="JUN")
+    calendar_return = table_calendar_return(returns, calendar=calendar)
+    assert calendar_return.iloc[0, 0] == 2014
+    assert calendar_return.iloc[0, 5] == pytest.approx(expected.iloc[0, 11])
+
+    with pytest.raises(ValueError):
+        table_calendar_return(returns, calendar=calendar.years)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from pyform.returns.bootstrap import (
+    bootstrap_indices,
+    calc_bootstrap_stats,
+    calc_bootstrap_ci,
+)
+from pyform.returns.metrics import calc_ann_vol
+from pyform.returnseries import ReturnSeries
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+monthly = returns.to_month().iloc[:, 0].to_numpy()
+
+
+def test_bootstrap_indices():
+
+    indices = bootstrap_indices(100, 50, block_size=5, method="block", seed=0)
+    assert indices.shape == (50, 100)
+    assert indices.min() >= 0 and indices.max() < 100
+
+    # fixed blocks of consecutive periods
+    blocks = indices[:, :100].reshape(50, 20, 5)
+    assert (np.diff(blocks, axis=2) == 1).all()
+
+    indices = bootstrap_indices(100, 50, block_size=5, seed=0)
+    assert indices.shape == (50, 100)
+    assert indices.min() >= 0 and indices.max() < 100
+
+    # blocks continue with the next period, wrapping around the end
+    steps = np.diff(indices, axis=1) % 100
+    assert 0.6 < (steps == 1).mean() < 0.95
+
+    # seeded resamples are reproducible
+    assert (bootstrap_indices(100, 50, 5, seed=0) == indices).all()
+
+    with pytest.raises(ValueError):
+        bootstrap_indices(100, 50, method="iid")
+
+
+def test_calc_bootstrap_stats():
+
+    indices = np.arange(len(monthly))[np.newaxis]
+    stats = calc_bootstrap_stats(monthly, indices, 12)
+
+    expected = calc_ann_vol(returns.to_month(), "sample", samples_per_year=12)
+    assert stats["annualized volatility"][0] == pytest.approx(expected)
+
+    years = len(monthly) / 12
+    expected = np.prod(1 + monthly) ** (1 / years) - 1
+    assert stats["annualized return"][0] == pytest.approx(expected)
+    assert stats["sharpe ratio"][0] == pytest.approx(
+        stats["annualized return"][0] / stats["annualized volatility"][0]
+    )
+
+
+def test_calc_bootstrap_ci():
+
+    ci = calc_bootstrap_ci(monthly, 12, samples=500, seed=0, chunk_size=200)
+
+    assert ci.index.tolist() == [
+        "annualized return",
+        "annualized volatility",
+        "sharpe ratio",
+    ]
+    assert (ci["lower"] < ci["value"]).all()
+    assert (ci["value"] < ci["upper"]).all()
+
+    # chunks computed across processes give the same intervals
+    parallel = calc_bootstrap_ci(
+        monthly, 12, samples=500, seed=0, chunk_size=200, workers=2
+    )
+    assert np.allclose(parallel.to_numpy(), ci.to_numpy())
+
+    # wider confidence, wider intervals
+    wide = calc_bootstrap_ci(monthly, 12, samples=500, seed=0, confidence=0.99)
+    assert (wide["upper"] - wide["lower"] > ci["upper"] - ci["lower"]).all()
@@ -0,0 +1,160 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pyform.returns.chunked import (
+    iter_csv_chunks,
+    iter_chunks,
+    csv_to_store,
+    iter_store_chunks,
+    chunked_ret_to_period,
+    calc_chunked_stats,
+)
+from pyform.returns.compound import ret_to_period
+from pyform.returnseries import ReturnSeries
+
+path = "tests/unit/data/twitter_returns.csv"
+returns = ReturnSeries.read_csv(path)
+
+# 30 minute bars of trading sessions, 9:30 to 16:00
+days = pd.bdate_range("2020-01-01", periods=60)
+intraday = pd.DataFrame(
+    {"pnl": np.random.RandomState(0).normal(0, 1e-3, len(days) * 13)},
+    index=pd.DatetimeIndex(
+        [day + pd.Timedelta(minutes=570 + 30 * i) for day in days for i in range(13)],
+        name="datetime",
+    ),
+)
+intraday_returns = ReturnSeries(intraday)
+
+
+def assert_period_equal(result, expected):
+    """Compares converted series, with returns equal up to rounding."""
+
+    assert result.index.equals(expected.index)
+    assert result.columns.equals(expected.columns)
+    np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-15)
+
+
+def test_iter_csv_chunks():
+
+    chunks = list(iter_csv_chunks(path, chunksize=500))
+
+    assert len(chunks) == int(np.ceil(len(returns.series.index) / 500))
+    assert pd.concat(chunks).equals(returns.series)
+
+
+@pytest.mark.parametrize("method", ["geometric", "arithmetic", "continuous"])
+@pytest.mark.parametrize("freq", ["W", "M", "Q"])
+def test_chunked_ret_to_period(freq, method):
+
+    expected = ret_to_period(returns.series, freq, method)
+
+    # chunk boundaries fall in the middle of periods
+    for chunksize in [13, 250, 10_000]:
+        result = chunked_ret_to_period(path, freq, method, chunksize=chunksize)
+        assert_period_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "series, freq",
+    [(returns, "B"), (returns, "D"), (intraday_returns, "D"), (intraday_returns, "H")],
+)
+def test_chunked_ret_to_period_series(series, freq):
+
+    # converted the same way as ReturnSeries.to_period
+    expected = series.to_period(freq, "geometric")
+    df = series.series
+
+    for chunksize in [7, 250, 10_000]:
+        chunks = [
+            df.iloc[i : i + chunksize] for i in range(0, len(df.index), chunksize)
+        ]
+        result = chunked_ret_to_period(chunks, freq, "geometric")
+        assert_period_equal(result, expected)
+
+
+def test_chunked_ret_to_period_gap():
+
+    # periods without returns between chunks are kept, same as in memory
+    df = returns.series.iloc[:300].drop(returns.series.index[40:120])
+    chunks = [df.iloc[:40], df.iloc[40:]]
+
+    assert_period_equal(
+        chunked_ret_to_period(chunks, "M", "geometric"),
+        ret_to_period(df, "M", "geometric"),
+    )
+
+
+def test_chunked_ret_to_period_long_period():
+
+    # one period spans every chunk, only its partial return is carried
+    chunks = [returns.series.iloc[i : i + 7] for i in range(0, 350, 7)]
+    df = returns.series.iloc[:350]
+
+    for method in ["geometric", "arithmetic", "continuous"]:
+        assert_period_equal(
+            chunked_ret_to_period(chunks, "Y", method), ret_to_period(df, "Y", method)
+        )
+
+
+def test_iter_chunks_order():
+
+    df = returns.series.iloc[:100]
+
+    with pytest.raises(ValueError):
+        list(iter_chunks([df.iloc[50:], df.iloc[:50]]))
+
+
+def test_csv_to_store(tmp_path):
+
+    out = str(tmp_path / "twitter.npy")
+    store = csv_to_store(path, out, chunksize=300)
+
+    assert store.shape == (len(returns.series.index),)
+
+    chunks = list(iter_store_chunks(out, chunksize=250))
+    assert len(chunks) == int(np.ceil(len(returns.series.index) / 250))
+    assert pd.concat(chunks).equals(returns.series)
+
+    assert_period_equal(
+        chunked_ret_to_period(out, "M", "geometric", chunksize=250),
+        ret_to_period(returns.series, "M", "geometric"),
+    )
+
+
+def test_calc_chunked_stats():
+
+    stats = calc_chunked_stats(path, freq="M", chunksize=250)
+
+    assert stats.index.tolist() == ["TWTR"]
+
+    tot_ret = returns.get_tot_ret()
+    ann_ret = returns.get_ann_ret()
+    ann_vol = returns.get_ann_vol(freq="M")
+
+    assert stats.at["TWTR", "total return"] == pytest.approx(
+        tot_ret["value"][0], rel=1e-12
+    )
+    assert stats.at["TWTR", "annualized return"] == pytest.approx(
+        ann_ret["value"][0], rel=1e-12
+    )
+    assert stats.at["TWTR", "annualized volatility"] == pytest.approx(
+        ann_vol["value"][0], rel=1e-12
+    )
+
+
+@pytest.mark.parametrize(
+    "series, freq",
+    [(returns, "B"), (returns, "D"), (intraday_returns, "D"), (intraday_returns, "H")],
+)
+def test_calc_chunked_stats_series(series, freq):
+
+    df = series.series
+    chunks = [df.iloc[i : i + 100] for i in range(0, len(df.index), 100)]
+
+    stats = calc_chunked_stats(chunks, freq=freq)
+    ann_vol = series.get_ann_vol(freq=freq)
+
+    assert stats.iloc[0]["annualized volatility"] == pytest.approx(
+        ann_vol["value"][0], rel=1e-12
+    )
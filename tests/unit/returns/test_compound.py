@@ -1,6 +1,10 @@
 import pytest
+import numpy as np
 import pandas as pd
+import pyform
 from pyform.returns.compound import (
+    compound_values,
+    cumseries_values,
     compound_geometric,
     compound_arithmetic,
     compound_continuous,
@@ -9,6 +13,11 @@ from pyform.returns.compound import (
     cumseries_arithmetic,
     cumseries_continuous,
     cumseries,
+    cumseries_frame,
+    ret_to_period,
+    bars_to_period,
+    panel_to_period,
+    rolling_compound,
 )
 
 
@@ -28,9 +37,9 @@ def test_compound_methods():
         [0.030011999999999997, -0.02331, 0.016706000000000002, 0.049061, -0.015887]
     )
 
-    assert compound_geometric(returns) == 0.055942142480424284
+    assert compound_geometric(returns) == pytest.approx(0.055942142480424284)
     assert compound_arithmetic(returns) == 0.05658200000000001
-    assert compound_continuous(returns) == 0.05821338474015869
+    assert compound_continuous(returns) == 0.05821338474015861
 
 
 def test_cumseries():
@@ -49,6 +58,178 @@ def test_cumseries_methods():
         [0.030011999999999997, -0.02331, 0.016706000000000002, 0.049061, -0.015887]
     )
 
-    assert cumseries_geometric(returns).iloc[-1] == 0.055942142480424284
+    assert cumseries_geometric(returns).iloc[-1] == pytest.approx(0.055942142480424284)
     assert cumseries_arithmetic(returns).iloc[-1] == 0.05658200000000001
-    assert cumseries_continuous(returns).iloc[-1] == 0.05821338474015869
+    assert cumseries_continuous(returns).iloc[-1] == 0.05821338474015861
+
+
+def test_cumseries_frame():
+
+    df = pd.DataFrame(
+        data={
+            "a": [0.030011999999999997, -0.02331, 0.016706000000000002, 0.049061],
+            "b": [None, -0.02331, 0.016706000000000002, 0.049061],
+        },
+        index=pd.date_range("2020-01-01", periods=4),
+    )
+
+    result = cumseries_frame(df, "geometric")
+    assert result["a"].equals(cumseries_geometric(df["a"]))
+    assert pd.isna(result["b"].iloc[0])
+    assert result["b"].iloc[-1] == compound_geometric(df["b"])
+
+    result = cumseries_frame(df, "continuous")
+    assert result["a"].equals(cumseries_continuous(df["a"]))
+
+    # every other point, last point is always kept
+    result = cumseries_frame(df, "arithmetic", step=2)
+    assert result.index.tolist() == df.index[[0, 2, 3]].tolist()
+
+    with pytest.raises(ValueError):
+        cumseries_frame(df, "contnuuous")
+
+
+def test_compound_values():
+
+    returns = [0.030011999999999997, -0.02331, 0.016706000000000002, 0.049061]
+    df = pd.DataFrame(data={"a": returns, "b": [np.nan, *returns[1:]]})
+    total_a = compound_geometric(df["a"])
+    total_b = compound_geometric(df["b"])
+
+    # 1-d input gives a float
+    assert compound_values(np.array(returns), "geometric") == total_a
+    assert compound_values(df["a"], "geometric") == total_a
+
+    # 2-d input compounds along axis
+    result = compound_values(df.to_numpy(), "geometric")
+    np.testing.assert_array_equal(result, [total_a, total_b])
+    result = compound_values(df.to_numpy().T, "geometric", axis=1)
+    np.testing.assert_array_equal(result, [total_a, total_b])
+
+    # DataFrame input is labelled
+    result = compound_values(df, "arithmetic")
+    assert result.index.tolist() == ["a", "b"]
+    assert result["b"] == pytest.approx(sum(returns[1:]))
+    result = compound_values(df, "continuous", axis=1)
+    assert result.index.tolist() == df.index.tolist()
+    assert result[0] == pytest.approx(np.expm1(returns[0]))
+
+    # missing values
+    result = compound_values(df, "geometric", skipna=False)
+    assert result["a"] == total_a
+    assert np.isnan(result["b"])
+
+    with pytest.raises(ValueError):
+        compound_values(df, "contnuuous")
+
+    with pytest.raises(ValueError):
+        compound_values(df, "geometric", axis=2)
+
+    with pytest.raises(ValueError):
+        compound_values(np.zeros((2, 2, 2)), "geometric")
+
+
+def test_compound_values_precision():
+
+    # 100 years of daily returns, compounding in log space keeps the precision
+    returns = np.full(25200, 0.0001)
+    expected = np.expm1(25200 * np.log1p(0.0001))
+    assert compound_values(returns, "geometric") == pytest.approx(expected, rel=1e-14)
+
+
+def test_cumseries_values():
+
+    returns = [0.030011999999999997, -0.02331, 0.016706000000000002, 0.049061]
+    df = pd.DataFrame(data={"a": returns, "b": [returns[0], np.nan, *returns[2:]]})
+
+    result = cumseries_values(df, "geometric")
+    assert isinstance(result, pd.DataFrame)
+    assert result["a"].iloc[-1] == compound_geometric(df["a"])
+    assert np.isnan(result["b"][1])
+    assert result["b"].iloc[-1] == compound_geometric(df["b"])
+
+    result = cumseries_values(df.to_numpy().T, "arithmetic", axis=1)
+    assert result.shape == (2, 4)
+    assert result[0, -1] == compound_arithmetic(df["a"])
+
+    result = cumseries_values(df["a"].to_numpy(), "continuous")
+    assert result.shape == (4,)
+
+    # missing values stop compounding
+    result = cumseries_values(df, "geometric", skipna=False)
+    assert result["b"].isna().tolist() == [False, True, True, True]
+
+
+def test_compound_total_loss():
+
+    # returns at or below -100%, e.g. of a leveraged or short position
+    returns = pd.Series(
+        [0.1, -1.5, 0.2, np.nan, -1.0, 0.3],
+        index=pd.date_range("2020-01-01", periods=6, freq="D"),
+    )
+    growth = np.cumprod(1 + returns.fillna(0).to_numpy()) - 1
+
+    assert compound_geometric(returns[:3]) == pytest.approx(-1.66)
+    assert compound_geometric(returns) == -1
+
+    result = cumseries_geometric(returns)
+    assert result.iloc[[0, 1, 2, 4, 5]].tolist() == pytest.approx(
+        growth[[0, 1, 2, 4, 5]]
+    )
+    assert np.isnan(result.iloc[3])
+
+    result = rolling_compound(returns.to_frame(), 2, "geometric").iloc[:, 0]
+    expected = (1 + returns).rolling(2).apply(np.prod, raw=True) - 1
+    np.testing.assert_allclose(result, expected)
+
+    expected = ret_to_period(returns.to_frame(), "2D", "geometric")
+    np.testing.assert_allclose(
+        panel_to_period(returns.to_frame(), "2D", "geometric"), expected
+    )
+    np.testing.assert_allclose(
+        bars_to_period(returns.to_frame(), "2D", "geometric"), expected
+    )
+    np.testing.assert_allclose(expected.iloc[:, 0], [-1.55, 0.2, -1])
+
+
+def test_compound_values_numba():
+
+    pytest.importorskip("numba")
+
+    df = pd.DataFrame(data={"a": [0.1, -0.2, 0.05], "b": [0.2, np.nan, -0.1]})
+
+    expected = compound_values(df, "geometric")
+    expected_cum = cumseries_values(df, "geometric")
+
+    pyform.set_option("backend", "numba")
+    try:
+        result = compound_values(df, "geometric")
+        result_cum = cumseries_values(df, "geometric")
+    finally:
+        pyform.set_option("backend", "numpy")
+
+    np.testing.assert_allclose(result, expected)
+    np.testing.assert_allclose(result_cum, expected_cum)
+
+
+@pytest.mark.parametrize("freq", ["5T", "H", "D", "B", "W"])
+def test_bars_to_period(freq):
+
+    days = pd.bdate_range("2020-01-01", periods=15)
+    index = pd.DatetimeIndex(
+        [day + pd.Timedelta(minutes=570 + i) for day in days for i in range(390)],
+        name="datetime",
+    )
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"a": rng.normal(0, 1e-3, len(index))}, index=index)
+    df.iloc[100:200, 0] = np.nan
+
+    # ret_to_period also has bars of 0 outside of sessions, which are not returned
+    rows = df.resample(freq).size()
+
+    for method in ["geometric", "arithmetic", "continuous"]:
+        result = bars_to_period(df, freq, method)
+        expected = ret_to_period(df, freq, method)
+        expected = expected[rows.reindex(expected.index).to_numpy() > 0]
+        assert result.index.equals(expected.index)
+        assert np.allclose(result, expected, rtol=0, atol=1e-15)
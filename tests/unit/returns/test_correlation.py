@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pyform.returns.correlation import calc_blocked_matrix
+
+rng = np.random.RandomState(0)
+panel = pd.DataFrame(rng.normal(0.01, 0.05, size=(120, 7)))
+panel.iloc[:30, 2] = np.nan  # later inception
+panel.iloc[90:, 5] = np.nan  # earlier termination
+panel.iloc[[3, 50, 77], 0] = np.nan
+
+
+def test_blocked_matrix():
+
+    corr = calc_blocked_matrix(panel, block_size=3)
+    assert np.allclose(corr, panel.corr().to_numpy())
+
+    cov = calc_blocked_matrix(panel, kind="covariance", block_size=3)
+    assert np.allclose(cov, panel.cov().to_numpy())
+
+    # block size does not change the result
+    assert np.allclose(calc_blocked_matrix(panel, block_size=100), corr)
+
+    with pytest.raises(ValueError):
+        calc_blocked_matrix(panel, kind="spearman")
+
+
+def test_blocked_matrix_min_periods():
+
+    df = panel.copy()
+    df.iloc[:118, 6] = np.nan
+
+    corr = calc_blocked_matrix(df, block_size=3, min_periods=5)
+    assert np.isnan(corr[6, :]).all()
+    assert np.isnan(corr[:, 6]).all()
+    assert not np.isnan(corr[:6, :6]).any()
+
+
+def test_blocked_matrix_workers(tmp_path):
+
+    expected = panel.corr().to_numpy()
+
+    corr = calc_blocked_matrix(panel, block_size=2, workers=2)
+    assert np.allclose(corr, expected)
+
+    path = str(tmp_path / "corr.npy")
+    corr = calc_blocked_matrix(panel, block_size=2, out=path)
+    assert isinstance(corr, np.memmap)
+    assert np.allclose(np.load(path), expected)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from pyform.returns.drawdown import (
+    calc_drawdown,
+    calc_max_drawdown,
+    calc_rolling_max_drawdown,
+)
+from pyform.returnseries import ReturnSeries
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+
+
+def brute_max_drawdown(values):
+
+    wealth = np.concatenate([[1.0], np.cumprod(1 + values)])
+    worst = 0.0
+    for a in range(len(wealth)):
+        for b in range(a, len(wealth)):
+            worst = min(worst, wealth[b] / wealth[a] - 1)
+    return worst
+
+
+def test_drawdown():
+
+    df = pd.DataFrame(
+        data={"returns": [0.1, -0.5, 0.2, 1.0, -0.1]},
+        index=pd.date_range("2020-01-01", periods=5),
+    )
+
+    drawdown = calc_drawdown(df)
+    np.testing.assert_allclose(drawdown["returns"], [0.0, -0.5, -0.4, 0.0, -0.1])
+
+    max_dd = calc_max_drawdown(df).loc["returns"]
+    assert max_dd["max drawdown"] == -0.5
+    assert max_dd["peak"] == pd.Timestamp("2020-01-01")
+    assert max_dd["trough"] == pd.Timestamp("2020-01-02")
+    assert max_dd["recovery"] == pd.Timestamp("2020-01-04")
+    assert max_dd["periods"] == 3
+
+    # loss on first return, never recovered
+    max_dd = calc_max_drawdown(df["returns"] - 0.3).loc["returns"]
+    assert max_dd["peak"] == pd.Timestamp("2020-01-01")
+    assert max_dd["trough"] == pd.Timestamp("2020-01-03")
+    assert max_dd["recovery"] is pd.NaT
+    assert max_dd["periods"] == 5
+
+    # no drawdown
+    max_dd = calc_max_drawdown(df["returns"].abs()).loc["returns"]
+    assert max_dd["max drawdown"] == 0
+    assert max_dd["periods"] == 0
+
+    # no returns
+    max_dd = calc_max_drawdown(df.iloc[:0]).loc["returns"]
+    assert np.isnan(max_dd["max drawdown"])
+    assert max_dd["peak"] is pd.NaT
+    assert max_dd["recovery"] is pd.NaT
+
+
+def test_rolling_max_drawdown():
+
+    values = returns.series.iloc[:300, 0]
+
+    for window in [1, 5, 36, 299, 300]:
+        rolling = calc_rolling_max_drawdown(values, window)["TWTR"].to_numpy()
+        assert np.isnan(rolling[: window - 1]).all()
+        expected = [
+            brute_max_drawdown(values.to_numpy()[i - window + 1 : i + 1])
+            for i in range(window - 1, len(values), 37)
+        ]
+        np.testing.assert_allclose(rolling[window - 1 :: 37], expected)
+
+
+def test_panel():
+
+    # series with different inception dates
+    panel = pd.concat([returns.series, spy.series], axis=1)
+
+    max_dd = calc_max_drawdown(panel)
+    assert (
+        max_dd.loc["TWTR", "max drawdown"]
+        == calc_max_drawdown(returns.series).loc["TWTR", "max drawdown"]
+    )
+    assert max_dd.loc["SPY", "peak"] < returns.start
+
+    rolling = calc_rolling_max_drawdown(panel, 252)
+    assert rolling["TWTR"].first_valid_index() == returns.series.index[251]
+    assert rolling["SPY"].first_valid_index() == spy.series.index[251]
@@ -0,0 +1,154 @@
+import pytest
+import numpy as np
+from pyform.returns.kernels import KERNELS, _LOOP_KERNELS, as_float_array, get_kernel
+from pyform.returnseries import ReturnSeries
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+values = as_float_array(returns.series)
+
+# same returns, with a few missing values
+values_nan = values.copy()
+values_nan[[3, 100, 101]] = np.nan
+
+# same returns, with losses of -100% and more
+values_loss = values.copy()
+values_loss[[50, 400]] = [-1.0, -1.5]
+
+
+def loop_kernels(backend):
+    """Gets the loop kernels, as plain python or compiled by numba."""
+
+    if backend == "numba":
+        pytest.importorskip("numba")
+        return KERNELS["numba"]
+
+    return _LOOP_KERNELS
+
+
+def test_get_kernel():
+
+    assert (
+        get_kernel("compound_geometric", "numpy")
+        is KERNELS["numpy"]["compound_geometric"]
+    )
+
+    # unknown backend falls back to numpy
+    assert get_kernel("rolling_std", "cython") is KERNELS["numpy"]["rolling_std"]
+
+    with pytest.raises(ValueError):
+        get_kernel("not-exist")
+
+
+@pytest.mark.parametrize("backend", ["loop", "numba"])
+@pytest.mark.parametrize("data", [values, values_nan, values_loss])
+@pytest.mark.parametrize("method", ["geometric", "arithmetic", "continuous"])
+def test_kernel_parity(backend, data, method):
+
+    numpy_kernels, kernels = KERNELS["numpy"], loop_kernels(backend)
+
+    name = f"compound_{method}"
+    assert kernels[name](data) == pytest.approx(numpy_kernels[name](data))
+
+    name = f"cumseries_{method}"
+    np.testing.assert_allclose(
+        kernels[name](data), numpy_kernels[name](data), rtol=1e-12
+    )
+
+    # running sums accumulate rounding differences in the order of machine epsilon
+    name = f"rolling_{method}"
+    np.testing.assert_allclose(
+        kernels[name](data, 252),
+        numpy_kernels[name](data, 252),
+        rtol=1e-12,
+        atol=1e-12,
+    )
+
+    for ddof in [0, 1]:
+        np.testing.assert_allclose(
+            kernels["rolling_std"](data, 36, ddof),
+            numpy_kernels["rolling_std"](data, 36, ddof),
+            rtol=1e-12,
+        )
+
+
+@pytest.mark.parametrize("backend", ["loop", "numba"])
+@pytest.mark.parametrize("data", [values, values_nan, np.round(values, 3)])
+def test_tail_kernel_parity(backend, data):
+
+    numpy_kernels, kernels = KERNELS["numpy"], loop_kernels(backend)
+
+    for window, q in [(20, 0.05), (252, 0.01), (5, 0.5)]:
+        np.testing.assert_allclose(
+            kernels["rolling_tail"](data, window, q),
+            numpy_kernels["rolling_tail"](data, window, q),
+            rtol=1e-12,
+            atol=1e-15,
+        )
+
+    # running tail sums match sorting every window
+    result = numpy_kernels["rolling_tail"](data, 20, 0.25)
+    for i in range(19, len(data), 97):
+        window = data[i - 19 : i + 1]
+        if not np.isnan(window).any():
+            tail = np.sort(window)[:5].mean()
+            assert result[i, 1] == pytest.approx(tail, rel=1e-12)
+
+
+def test_kernel_nan():
+
+    kernel = get_kernel("cumseries_geometric", "numpy")
+    result = kernel(np.array([0.1, np.nan, 0.1]))
+    assert np.isnan(result[1])
+    assert result[2] == pytest.approx(0.21)
+
+    # a window containing missing value is missing
+    kernel = get_kernel("rolling_arithmetic", "numpy")
+    result = kernel(np.array([0.1, np.nan, 0.1, 0.2]), 2)
+    assert np.isnan(result[:3]).all()
+    assert result[3] == pytest.approx(0.3)
+
+
+@pytest.mark.parametrize("compensated", [False, True])
+def test_rolling_comoments(compensated):
+
+    x, y = values_nan, values[::-1].copy()
+
+    kernel = get_kernel("rolling_comoments", "numpy")
+    result = kernel(x, y, 20, compensated)
+
+    # windows are the sums of x, y, x^2, y^2 and xy, skipped when x is missing
+    window = slice(200, 220)
+    expected = [
+        x[window].sum(),
+        y[window].sum(),
+        (x[window] ** 2).sum(),
+        (y[window] ** 2).sum(),
+        (x[window] * y[window]).sum(),
+    ]
+    np.testing.assert_allclose(result[219], expected, rtol=1e-9)
+    assert np.isnan(result[:19]).all()
+    assert np.isnan(result[100:120]).all()
+
+    for backend in ["loop", "numba"]:
+        np.testing.assert_allclose(
+            loop_kernels(backend)["rolling_comoments"](x, y, 20, compensated),
+            result,
+            rtol=1e-9,
+            atol=1e-12,
+        )
+
+
+def test_rolling_comoments_precision():
+
+    # large values early on leave rounding error in prefix sums of later windows
+    x = np.concatenate([np.full(1000, 1e6), values[:500]])
+    y = x[::-1].copy()
+
+    kernel = get_kernel("rolling_comoments", "numpy")
+    result = kernel(x, y, 20, True)
+
+    expected = [x[-20:].sum(), y[-20:].sum(), (x[-20:] ** 2).sum()]
+    np.testing.assert_allclose(result[-1, [0, 1, 2]], expected, rtol=1e-12)
+
+    result = kernel(x, y, 20, False)
+    assert abs(result[-1, 2] / expected[2] - 1) > 1e-6
@@ -1,4 +1,15 @@
-from pyform.returns.metrics import calc_ann_vol
+import pytest
+import numpy as np
+import pandas as pd
+from pyform.returns.metrics import (
+    calc_ann_vol,
+    calc_ann_ret,
+    calc_pairwise_moments,
+    calc_bm_stats,
+    calc_rolling_bm_stats,
+    calc_expanding_ann_ret,
+    calc_expanding_ann_vol,
+)
 from pyform.returnseries import ReturnSeries
 
 returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
@@ -11,3 +22,78 @@ def test_calc_ann_vol():
         calc_ann_vol(returns.series, "population", samples_per_year=252)
         == 0.5454208266167264
     )
+
+
+def test_calc_pairwise_moments():
+
+    spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+
+    # series with different inception dates
+    df = pd.concat([returns.series, spy.series], axis=1)
+    moments = calc_pairwise_moments(df)
+
+    np.testing.assert_allclose(moments["cov"], df.cov())
+    assert moments["count"][0, 1] == len(returns.series.index)
+    assert moments["count"][1, 1] == len(spy.series.index)
+
+    overlap = df.dropna()
+    assert moments["mean"][1, 0] == pytest.approx(overlap["SPY"].mean())
+    assert moments["var"][1, 0] == pytest.approx(overlap["SPY"].var())
+    assert moments["var"][1, 1] == pytest.approx(df["SPY"].var())
+
+
+def test_calc_bm_stats():
+
+    df = pd.DataFrame(data={"fund": [0.02, -0.01, 0.03], "bm": [0.01, -0.02, 0.02]})
+    stats = calc_bm_stats(calc_pairwise_moments(df), 12).iloc[0]
+
+    assert stats["beta"] == pytest.approx(1)
+    assert stats["tracking error"] == pytest.approx(0)
+    assert stats["alpha"] == pytest.approx(0.12)
+    assert stats["used"] == 3
+
+
+def test_calc_rolling_bm_stats():
+
+    spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+    df = pd.concat([returns.series, spy.series], axis=1)
+
+    # windows with missing values are NaN, like pandas
+    expected = df["TWTR"].rolling(60).corr(df["SPY"])
+    corr = calc_rolling_bm_stats(df, 60, "correlation")
+    np.testing.assert_allclose(corr["SPY"], expected, rtol=1e-9)
+
+    expected = df["TWTR"].rolling(60).cov(df["SPY"]) / df["SPY"].rolling(60).var()
+    beta = calc_rolling_bm_stats(df, 60, "beta")
+    np.testing.assert_allclose(beta["SPY"], expected, rtol=1e-9)
+
+    compensated = calc_rolling_bm_stats(df, 60, "beta", compensated=True)
+    np.testing.assert_allclose(compensated["SPY"], expected, rtol=1e-9)
+
+    with pytest.raises(ValueError):
+        calc_rolling_bm_stats(df, 60, "alpha")
+
+
+def test_calc_expanding_ann_ret():
+
+    dates = returns.series.index[[10, 500, -1]]
+    stats = calc_expanding_ann_ret(returns.series, dates, "geometric")
+
+    for date in dates:
+        expected = calc_ann_ret(returns.series.loc[:date], "geometric")
+        assert stats.loc[date, "annualized return"] == pytest.approx(expected)
+
+    # dates before the first return are missing
+    before = returns.series.index[:1] - pd.Timedelta(days=1)
+    assert calc_expanding_ann_ret(returns.series, before, "geometric").isna().all(None)
+
+
+def test_calc_expanding_ann_vol():
+
+    ret = returns.series.iloc[:, 0]
+    vol = calc_expanding_ann_vol(ret, "sample", ret.index[0], ret.index)
+
+    assert np.isnan(vol[0])
+    for n in [2, 100, len(ret)]:
+        expected = calc_ann_vol(ret.iloc[:n], "sample")
+        assert vol[n - 1] == pytest.approx(expected)
@@ -0,0 +1,92 @@
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+from pyform.returns.moments import Moments
+
+rng = np.random.RandomState(0)
+values = rng.standard_t(5, size=(1000, 3)) * 0.01 + 0.001
+values[:20, 1] = np.nan
+
+
+def test_moments():
+
+    df = pd.DataFrame(values)
+    moments = Moments.from_values(values)
+
+    assert moments.count.tolist() == [1000, 980, 1000]
+    assert np.allclose(moments.mean, df.mean())
+    assert np.allclose(moments.std(), df.std(), rtol=1e-14, atol=0)
+    assert np.allclose(moments.std("population"), df.std(ddof=0), rtol=1e-14, atol=0)
+    assert np.allclose(moments.skew(), df.skew(), rtol=1e-12, atol=0)
+    assert np.allclose(moments.kurtosis(), df.kurt(), rtol=1e-12, atol=0)
+
+    # a single series gives floats
+    series = Moments.from_values(values[:, 0])
+    assert series.std() == df[0].std()
+    assert series.skew() == pytest.approx(df[0].skew(), rel=1e-12)
+
+    for order in range(1, 5):
+        assert np.allclose(
+            series.raw_moment(order), np.mean(values[:, 0] ** order), rtol=1e-12
+        )
+
+    with pytest.raises(ValueError):
+        series.raw_moment(5)
+
+
+def test_downside_deviation():
+
+    moments = Moments.from_values(values[:, 0], threshold=0.002)
+    shortfall = np.minimum(values[:, 0] - 0.002, 0)
+
+    assert moments.lower_count == np.sum(shortfall < 0)
+    assert moments.downside_deviation() == pytest.approx(
+        np.sqrt(np.mean(shortfall ** 2)), rel=1e-14
+    )
+
+
+def test_moments_merge():
+
+    expected = Moments.from_values(values, threshold=0.001)
+
+    # uneven chunks, including empty ones, in one process or pickled from others
+    merged = Moments(threshold=0.001)
+    for chunk in np.array_split(values, [0, 7, 300, 300, 999]):
+        merged = merged + pickle.loads(
+            pickle.dumps(Moments.from_values(chunk, threshold=0.001))
+        )
+
+    updated = Moments(threshold=0.001)
+    for chunk in np.array_split(values, 9):
+        updated.update(chunk)
+
+    for moments in [merged, updated]:
+        assert moments.count.tolist() == expected.count.tolist()
+        assert moments.lower_count.tolist() == expected.lower_count.tolist()
+        assert np.allclose(moments.mean, expected.mean, rtol=1e-12, atol=0)
+        assert np.allclose(moments.std(), expected.std(), rtol=1e-12, atol=0)
+        assert np.allclose(moments.skew(), expected.skew(), rtol=1e-10, atol=0)
+        assert np.allclose(moments.kurtosis(), expected.kurtosis(), rtol=1e-10)
+        assert np.allclose(
+            moments.downside_deviation(), expected.downside_deviation(), rtol=1e-12
+        )
+
+    with pytest.raises(ValueError):
+        Moments(threshold=0.0) + Moments(threshold=0.01)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 4, 5])
+def test_moments_short(n):
+
+    # too few values are NaN, also without variance, the same as pandas
+    df = pd.DataFrame({"a": values[:n, 0], "b": np.full(n, 0.01)})
+    moments = Moments.from_values(df.to_numpy())
+
+    np.testing.assert_allclose(moments.skew(), df.skew(), rtol=1e-12)
+    np.testing.assert_allclose(moments.kurtosis(), df.kurt(), rtol=1e-12)
+
+    # population moments need a single value
+    population = Moments.from_values(df["b"].to_numpy())
+    assert np.isnan(population.skew("population")) == (n == 0)
+    assert np.isnan(population.kurtosis("population")) == (n == 0)
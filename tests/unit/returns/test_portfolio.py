@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pyform import Calendar
+from pyform.returns.portfolio import calc_portfolio
+from pyform.returnseries import ReturnSeries
+
+spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+qqq = ReturnSeries.read_csv("tests/unit/data/qqq_returns.csv")
+df = pd.concat([spy.series, qqq.series], axis=1, sort=True).loc["2015":"2017"]
+
+
+def naive_portfolio(df, targets, rebalance):
+
+    # one day at a time: returns from the weights held, which then drift
+    held, period, result = None, None, []
+
+    for date, ret in zip(df.index, np.nan_to_num(df.to_numpy())):
+        target = targets.loc[:date].iloc[-1].to_numpy()
+        if held is None or date in targets.index or rebalance(date) != period:
+            held = target.copy()
+        period = rebalance(date)
+        portfolio = held @ ret
+        result.append(portfolio)
+        held = held * (1 + ret) / (1 + portfolio)
+
+    return np.array(result)
+
+
+def test_calc_portfolio():
+
+    weights = {"SPY": 0.6, "QQQ": 0.4}
+    targets = pd.DataFrame([weights], index=df.index[:1])
+
+    # buy and hold, weights drift with performance
+    returns, held = calc_portfolio(df, weights)
+    growth = (1 + df).prod()
+    total = 0.6 * growth["SPY"] + 0.4 * growth["QQQ"] - 1
+    assert (1 + returns).prod() - 1 == pytest.approx(total, rel=1e-12)
+    assert held.iloc[0].tolist() == [0.6, 0.4]
+    assert held.iloc[-1]["QQQ"] > 0.4
+    assert np.allclose(held.sum(axis=1), 1)
+
+    for freq, period in [("M", lambda d: d.month), ("Q", lambda d: d.quarter)]:
+        returns, held = calc_portfolio(df, weights, freq)
+        expected = naive_portfolio(df, targets, lambda d: (d.year, period(d)))
+        np.testing.assert_allclose(returns, expected, rtol=1e-12, atol=1e-16)
+
+    # reset on the first date of each quarter, and drift in between
+    quarter_start = df.index.to_series().groupby(df.index.to_period("Q")).min()
+    assert np.allclose(held.loc[quarter_start], [0.6, 0.4])
+    assert not np.allclose(held.drop(quarter_start), [0.6, 0.4])
+
+    # a calendar gives the same result as its frequency
+    calendar = Calendar.from_freq("Q", "2015-01-01", "2017-12-31")
+    np.testing.assert_allclose(calc_portfolio(df, weights, calendar)[0], returns)
+
+
+def test_calc_portfolio_schedule():
+
+    schedule = pd.DataFrame(
+        {"SPY": [1.0, 0.5], "QQQ": [0.0, 0.5]},
+        index=pd.to_datetime(["2016-01-01", "2016-07-01"]),
+    )
+
+    returns, held = calc_portfolio(df, schedule, "Y")
+    assert returns.index[0] == pd.Timestamp("2016-01-04")
+
+    # only SPY is held until the model changes
+    first_half = returns.loc[:"2016-06-30"]
+    assert np.allclose(first_half, df["SPY"].loc[first_half.index])
+
+    expected = naive_portfolio(df.loc["2016":], schedule, lambda d: d.year)
+    np.testing.assert_allclose(returns, expected, rtol=1e-12, atol=1e-16)
+
+
+def test_calc_portfolio_weights():
+
+    with pytest.raises(ValueError):
+        calc_portfolio(df, {"SPY": 0.6, "QQQ": 0.3})
+
+    with pytest.raises(ValueError):
+        calc_portfolio(df, {"SPY": 0.6, "IWM": 0.4})
+
+    # components without weights are not held
+    returns, held = calc_portfolio(df, pd.Series({"SPY": 1.0}))
+    assert np.allclose(returns, df["SPY"])
+    assert (held["QQQ"] == 0).all()
@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pyform.returns.tail import (
+    calc_var,
+    calc_cvar,
+    calc_rolling_var,
+    calc_rolling_cvar,
+)
+from pyform.returnseries import ReturnSeries
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+
+
+def test_calc_var():
+
+    series = returns.series["TWTR"]
+
+    for level in [0.9, 0.95, 0.99]:
+        assert calc_var(series, level) == pytest.approx(
+            series.quantile(1 - level), rel=1e-14
+        )
+
+    # one value per column, with missing values skipped
+    df = returns.series.assign(half=series.where(series.index.day > 15))
+    var = calc_var(df)
+    assert var.index.tolist() == ["TWTR", "half"]
+    assert var["half"] == pytest.approx(df["half"].quantile(0.05), rel=1e-14)
+
+    with pytest.raises(ValueError):
+        calc_var(series, 95)
+
+
+def test_calc_cvar():
+
+    series = returns.series["TWTR"]
+    cvar = calc_cvar(series, 0.95)
+
+    # average of the returns ranked at or below the value at risk
+    ordered = np.sort(series.to_numpy())
+    rank = int(np.floor((len(ordered) - 1) * 0.05))
+    assert cvar == pytest.approx(ordered[: rank + 1].mean(), rel=1e-12)
+    assert cvar < calc_var(series, 0.95)
+
+    assert np.isnan(calc_cvar(pd.Series([np.nan, np.nan])))
+
+
+@pytest.mark.parametrize("backend", ["numpy", "numba"])
+def test_calc_rolling_tail(backend):
+
+    if backend == "numba":
+        pytest.importorskip("numba")
+
+    from pyform import set_option
+
+    df = returns.series.copy()
+    df.iloc[[10, 500], 0] = np.nan
+
+    set_option("backend", backend)
+    try:
+        var = calc_rolling_var(df, 60, 0.95)
+        cvar = calc_rolling_cvar(df, 60, 0.95)
+    finally:
+        set_option("backend", "numpy")
+
+    expected = df.rolling(60).quantile(0.05)
+    np.testing.assert_allclose(var, expected, rtol=1e-14)
+
+    # windows containing missing values are missing
+    assert var["TWTR"].isna().sum() == expected["TWTR"].isna().sum()
+
+    for i in [100, 700, len(df.index) - 1]:
+        window = df["TWTR"].iloc[i - 59 : i + 1]
+        assert cvar["TWTR"].iloc[i] == pytest.approx(calc_cvar(window), rel=1e-12)
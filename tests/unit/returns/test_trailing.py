@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pyform.returns.metrics import calc_ann_ret
+from pyform.returns.compound import compound_geometric
+from pyform.returns.trailing import (
+    Horizon,
+    resolve_horizons,
+    calc_trailing_returns,
+)
+from pyform.returnseries import ReturnSeries
+from pyform.util.freq import calc_timedelta_in_years
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+
+
+def test_resolve_horizons():
+
+    horizons = resolve_horizons(["3M", "YTD", "3Y", "ITD"], "2020-06-30")
+
+    assert horizons[0] == Horizon("3M", pd.Timestamp("2020-03-31"), False)
+    assert horizons[1] == Horizon("YTD", pd.Timestamp("2019-12-31"), False)
+    assert horizons[2] == Horizon("3Y", pd.Timestamp("2017-06-30"), True)
+    assert horizons[3].annualize is None
+
+    # not a month end
+    horizons = resolve_horizons(["1M", "2W"], "2020-06-15")
+    assert horizons[0].after == pd.Timestamp("2020-05-15")
+    assert horizons[1].after == pd.Timestamp("2020-06-01")
+
+    # resolved horizons are reused as is
+    assert resolve_horizons(horizons, "2019-01-01") == horizons
+
+    with pytest.raises(ValueError):
+        resolve_horizons(["3X"], "2020-06-30")
+
+
+def test_calc_trailing_returns():
+
+    df = pd.concat([returns.series, spy.series], axis=1)
+    table = calc_trailing_returns(df, "2019-12-31", ["3M", "YTD", "3Y", "10Y", "ITD"])
+
+    twtr = returns.series.iloc[:, 0]
+    expected = compound_geometric(twtr.loc["2019-10-01":"2019-12-31"])
+    assert table.loc["TWTR", "3M"] == pytest.approx(expected)
+
+    expected = compound_geometric(twtr.loc["2019-01-01":"2019-12-31"])
+    assert table.loc["TWTR", "YTD"] == pytest.approx(expected)
+
+    # annualized over the horizon, not from the first business day in it
+    years = calc_timedelta_in_years(
+        pd.Timestamp("2017-01-01"), pd.Timestamp("2019-12-31")
+    )
+    expected = calc_ann_ret(twtr.loc["2017-01-01":"2019-12-31"], "geometric", years)
+    assert table.loc["TWTR", "3Y"] == pytest.approx(expected)
+
+    expected = calc_ann_ret(twtr.loc[:"2019-12-31"], "geometric")
+    assert table.loc["TWTR", "ITD"] == pytest.approx(expected)
+
+    # series started after the horizon
+    assert np.isnan(table.loc["TWTR", "10Y"])
+    assert not np.isnan(table.loc["SPY", "10Y"])
+
+    arithmetic = calc_trailing_returns(twtr, "2019-12-31", ["YTD"], "arithmetic")
+    expected = twtr.loc["2019-01-01":"2019-12-31"].sum()
+    assert arithmetic.loc["TWTR", "YTD"] == pytest.approx(expected)
+
+    # returns at or below -100% compound through the sign of their growth
+    loss = twtr.loc["2019-01-01":"2019-12-31"].copy()
+    loss.iloc[[10, 20]] = [-1.5, -1.2]
+    table = calc_trailing_returns(loss, "2019-12-31", ["YTD"])
+    expected = np.prod(1 + loss.to_numpy()) - 1
+    assert table.loc["TWTR", "YTD"] == pytest.approx(expected)
+
+    with pytest.raises(ValueError):
+        calc_trailing_returns(df, "2019-12-31", method="simple")
+
+
+def test_calc_trailing_returns_freq():
+
+    # monthly and daily returns are annualized over the same years
+    horizons = ["1Y", "3Y", "5Y"]
+    daily = calc_trailing_returns(returns.series, "2019-12-31", horizons)
+    monthly = calc_trailing_returns(returns.to_month(), "2019-12-31", horizons)
+
+    np.testing.assert_allclose(monthly, daily, rtol=1e-12)
+
+    years = calc_timedelta_in_years(
+        pd.Timestamp("2015-01-01"), pd.Timestamp("2019-12-31")
+    )
+    expected = calc_ann_ret(
+        returns.series.loc["2015-01-01":"2019-12-31"], "geometric", years
+    )
+    assert monthly.at["TWTR", "5Y"] == pytest.approx(expected)
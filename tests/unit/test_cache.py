@@ -0,0 +1,135 @@
+import pytest
+import sqlite3
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pyform import ReturnSeries, set_option
+from pyform.cache import ResultCache, get_cache
+from pyform.result import ResultTable
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+
+
+@pytest.fixture
+def cache(tmp_path):
+
+    set_option("cache", str(tmp_path / "cache.sqlite"))
+    yield get_cache()
+    set_option("cache", None)
+
+
+def test_result_cache(tmp_path):
+
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_size=1000)
+
+    assert cache.get("a") == (False, None)
+
+    cache.put("a", b"x" * 400)
+    cache.put("b", b"x" * 400)
+    assert cache.get("a") == (True, b"x" * 400)
+
+    # b is the least recently used, and is evicted
+    cache.put("c", b"x" * 400)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a")[0] and cache.get("c")[0]
+
+    # too large to store
+    cache.put("d", b"x" * 2000)
+    assert not cache.get("d")[0]
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 3
+    assert stats["size"] <= 1000
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+
+
+def test_result_cache_read(tmp_path):
+
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_size=1000)
+    cache.put("a", b"x" * 400)
+
+    # lookups do not wait for a writer holding the lock
+    writer = sqlite3.connect(cache.path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    cache._connect().execute("PRAGMA busy_timeout = 0")
+    assert cache.get("a") == (True, b"x" * 400)
+    assert cache.get("b") == (False, None)
+    writer.execute("COMMIT")
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_result(cache):
+
+    series = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    series.add_bm(spy)
+
+    expected = series.get_ann_ret()
+    assert cache.stats()["misses"] == 1
+
+    pd.testing.assert_frame_equal(series.get_ann_ret(), expected)
+    assert cache.stats()["hits"] == 1
+
+    # arguments, including defaults passed explicitly, are part of the key
+    series.get_ann_ret(method="geometric")
+    assert cache.stats()["hits"] == 2
+    series.get_ann_ret(method="arithmetic")
+    assert cache.stats()["misses"] == 2
+
+    # a different window is a different result
+    series.set_daterange(start="2015-01-01")
+    result = series.get_ann_ret()
+    assert cache.stats()["misses"] == 3
+    assert result["value"][0] != expected["value"][0]
+
+    # so is a different benchmark
+    series.reset()
+    series.add_bm(returns, "TWTR")
+    series.get_ann_ret()
+    assert cache.stats()["misses"] == 4
+
+    # unseeded bootstrap is random and is not cached
+    series.get_bootstrap_ci(samples=10)
+    assert cache.stats()["misses"] == 4
+
+    # results of another type are a different result
+    set_option("result_type", "table")
+    try:
+        assert isinstance(series.get_ann_ret(), ResultTable)
+    finally:
+        set_option("result_type", "frame")
+    assert cache.stats()["misses"] == 5
+
+    # and so are results annualized with another number of sessions
+    set_option("sessions_per_year", 365)
+    try:
+        series.get_ann_ret()
+    finally:
+        set_option("sessions_per_year", 252)
+    assert cache.stats()["misses"] == 6
+
+
+def _compute(path):
+
+    set_option("cache", path)
+    series = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+
+    return series.get_ann_vol()["value"][0]
+
+
+def test_cache_processes(cache):
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        values = list(executor.map(_compute, [cache.path] * 4))
+
+    assert len(set(values)) == 1
+
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 4
+    assert stats["entries"] == 1
@@ -0,0 +1,23 @@
+import pytest
+import pyform
+from pyform.config import get_option, set_option
+
+
+def test_option():
+
+    assert pyform.get_option("backend") == "numpy"
+
+    set_option("backend", "numba")
+    assert get_option("backend") == "numba"
+    set_option("backend", "numpy")
+
+    # option does not exist
+    with pytest.raises(KeyError):
+        get_option("not-exist")
+
+    with pytest.raises(KeyError):
+        set_option("not-exist", 0)
+
+    # value is not allowed
+    with pytest.raises(ValueError):
+        set_option("backend", "cython")
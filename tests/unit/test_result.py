@@ -0,0 +1,123 @@
+import pytest
+import inspect
+import numpy as np
+import pandas as pd
+from pyform import ReturnSeries, set_option
+from pyform.result import ResultTable
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+qqq = ReturnSeries.read_csv("tests/unit/data/qqq_returns.csv")
+returns.add_bm(spy)
+returns.add_bm(qqq)
+
+
+def test_result_table():
+
+    table = ResultTable({"name": ["a", "b"], "field": "beta", "value": [1.0, 0.5]})
+
+    assert len(table) == 2
+    assert table.columns == ["name", "field", "value"]
+    assert table.column("field").tolist() == ["beta", "beta"]
+
+    expected = pd.DataFrame(
+        data={"name": ["a", "b"], "field": "beta", "value": [1.0, 0.5]}
+    )
+    pd.testing.assert_frame_equal(table.to_frame(), expected)
+
+    with pytest.raises(ValueError):
+        ResultTable({"name": ["a", "b"], "value": [1.0]})
+
+
+def test_result_table_concat():
+
+    a = ResultTable({"name": ["a"], "field": "beta", "value": [1.0], "freq": "M"})
+    b = ResultTable({"name": ["b", "c"], "field": "beta", "value": [0.5, 0.2]})
+    c = ResultTable({"name": ["d"], "field": "alpha", "value": [0.1]})
+
+    table = ResultTable.concat([a, b, c])
+
+    assert len(table) == 4
+    assert table.columns == ["name", "field", "value", "freq"]
+    assert table.column("name").tolist() == ["a", "b", "c", "d"]
+    assert table.column("field").tolist() == ["beta"] * 3 + ["alpha"]
+
+    # shared scalars stay scalar
+    assert ResultTable.concat([a, b])._columns["field"] == "beta"
+
+    # same as concatenating the frames
+    expected = pd.concat(
+        [a.to_frame(), b.to_frame(), c.to_frame()], ignore_index=True, sort=False
+    )
+    pd.testing.assert_frame_equal(table.to_frame(), expected, check_dtype=False)
+
+    assert len(ResultTable.concat([])) == 0
+
+
+@pytest.mark.parametrize("meta", [False, True])
+def test_result_type(meta):
+
+    expected = [
+        returns.get_tot_ret(meta=meta),
+        returns.get_ann_vol(meta=meta),
+        returns.get_beta(meta=meta),
+        returns.get_max_dd(meta=meta),
+    ]
+
+    set_option("result_type", "table")
+
+    try:
+        results = [
+            returns.get_tot_ret(meta=meta),
+            returns.get_ann_vol(meta=meta),
+            returns.get_beta(meta=meta),
+            returns.get_max_dd(meta=meta),
+        ]
+    finally:
+        set_option("result_type", "frame")
+
+    for result, frame in zip(results, expected):
+        assert isinstance(result, ResultTable)
+        pd.testing.assert_frame_equal(result.to_frame(), frame)
+
+    table = ResultTable.concat(results)
+    assert len(table) == sum(len(frame.index) for frame in expected)
+    assert np.array_equal(
+        table.column("value").astype(float),
+        pd.concat(expected, ignore_index=True)["value"].to_numpy(dtype=float),
+        equal_nan=True,
+    )
+
+
+@pytest.mark.parametrize("meta", [False, True])
+@pytest.mark.parametrize(
+    "method", sorted(name for name in dir(ReturnSeries) if name.startswith("get_")),
+)
+def test_result_type_methods(method, meta):
+
+    kwargs = {"seed": 0, "samples": 200} if method == "get_bootstrap_ci" else {}
+
+    # meta data of the long format results
+    if "meta" in inspect.signature(getattr(ReturnSeries, method)).parameters:
+        kwargs["meta"] = meta
+    elif meta:
+        pytest.skip("no meta data")
+    expected = getattr(returns, method)(**kwargs)
+
+    set_option("result_type", "table")
+
+    try:
+        result = getattr(returns, method)(**kwargs)
+    finally:
+        set_option("result_type", "frame")
+
+    # rolling statistics are dictionaries of frames, one per series
+    if not isinstance(expected, dict):
+        result, expected = {"result": result}, {"result": expected}
+
+    assert result.keys() == expected.keys()
+
+    for key, frame in expected.items():
+        if isinstance(result[key], ResultTable):
+            result[key] = result[key].to_frame()
+        pd.testing.assert_frame_equal(result[key], frame)
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from pyform import ReturnPanel, ReturnSeries
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+qqq = ReturnSeries.read_csv("tests/unit/data/qqq_returns.csv")
+
+panel = ReturnPanel.from_series([returns, spy, qqq])
+
+
+def test_from_series():
+
+    assert panel.names == ["TWTR", "SPY", "QQQ"]
+    assert panel.freq == "B"
+
+    twtr = panel.get_series("TWTR")
+    assert twtr.series.equals(returns.series)
+
+
+def test_to_period():
+
+    monthly = panel.to_period("M", "geometric")
+    expected = returns.to_month()
+
+    assert np.allclose(monthly["TWTR"].dropna(), expected.iloc[:, 0])
+
+    # months before inception are missing rather than 0
+    assert np.isnan(monthly["TWTR"].iloc[0])
+    assert not np.isnan(monthly["SPY"].iloc[0])
+
+    with pytest.raises(ValueError):
+        panel.to_period("H", "geometric")
+
+
+def test_corr_matrix():
+
+    corr = panel.get_corr_matrix()
+    monthly = panel.to_period("M", "geometric")
+
+    assert corr.index.tolist() == panel.names
+    assert np.allclose(corr, monthly.corr())
+    assert np.allclose(np.diag(corr), 1)
+
+    cov = panel.get_cov_matrix(freq="Q", block_size=2)
+    assert np.allclose(cov, panel.to_period("Q", "geometric").cov())
+
+
+def test_trailing_table():
+
+    table = panel.get_trailing_table(as_of="2019-12-31", horizons=["YTD", "10Y"])
+
+    assert table.index.tolist() == panel.names
+    assert table.loc["TWTR", "YTD"] == pytest.approx(
+        returns.series.loc["2019"].add(1).prod().iloc[0] - 1
+    )
+
+    # series started after the horizon
+    assert np.isnan(table.loc["TWTR", "10Y"])
+    assert not np.isnan(table.loc["SPY", "10Y"])
+
+
+def test_from_files():
+
+    paths = "tests/unit/data/*_returns.csv"
+    panel = ReturnPanel.from_files(paths, workers=2)
+
+    assert sorted(panel.names) == ["LIBOR_1M", "QQQ", "SPY", "TWTR"]
+    assert panel.get_series("SPY").series.equals(spy.series)
+
+
+def test_tail_risk():
+
+    var = panel.get_var()
+    assert var.name == "value at risk"
+    assert var.index.tolist() == ["TWTR", "SPY", "QQQ"]
+    assert var["SPY"] == pytest.approx(spy.series["SPY"].quantile(0.05))
+
+    cvar = panel.get_cvar(freq="M")
+    assert (cvar < panel.get_var(freq="M")).all()
+
+    roll_var = panel.get_rolling_var(window=60)
+    assert roll_var.columns.tolist() == ["TWTR", "SPY", "QQQ"]
+    twtr = returns.get_rolling_var(window=60)["TWTR"]
+    assert np.allclose(roll_var["TWTR"].dropna(), twtr["TWTR"])
+
+    roll_cvar = panel.get_rolling_cvar(window=60)
+    assert (roll_cvar.dropna() <= roll_var.dropna()).all().all()
+
+
+def test_get_portfolio():
+
+    portfolio = panel.get_portfolio({"SPY": 0.5, "QQQ": 0.5}, rebalance="M")
+    expected = ReturnSeries.from_portfolio(
+        [spy, qqq], {"SPY": 0.5, "QQQ": 0.5}, rebalance="M"
+    )
+
+    assert portfolio.name == "portfolio"
+    assert portfolio.start == panel.start
+    assert np.allclose(portfolio.series, expected.series)
@@ -1,7 +1,11 @@
+import copy
 import datetime
 import pytest
+import numpy as np
 import pandas as pd
-from pyform import ReturnSeries, CashSeries
+from pyform import ReturnSeries, CashSeries, Calendar, set_option
+from pyform.returns.metrics import calc_ann_ret
+from pyform.util.freq import calc_timedelta_in_years
 
 returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
 spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
@@ -9,6 +13,13 @@ qqq = ReturnSeries.read_csv("tests/unit/data/qqq_returns.csv")
 libor1m = ReturnSeries.read_csv("tests/unit/data/libor1m_returns.csv")
 
 
+def assert_result_equal(result, expected):
+    """Compares results, with values equal up to rounding."""
+
+    assert result.drop(columns="value").equals(expected.drop(columns="value"))
+    assert result["value"].tolist() == pytest.approx(expected["value"].tolist())
+
+
 def test_init():
 
     df = pd.read_csv("tests/unit/data/twitter_returns.csv")
@@ -17,10 +28,10 @@ def test_init():
 
 def test_to_period():
 
-    assert returns.to_week().iloc[1, 0] == 0.055942142480424284
-    assert returns.to_month().iloc[1, 0] == 0.5311520760874386
-    assert returns.to_quarter().iloc[1, 0] == -0.2667730077753935
-    assert returns.to_year().iloc[1, 0] == -0.4364528678695403
+    assert returns.to_week().iloc[1, 0] == pytest.approx(0.055942142480424284)
+    assert returns.to_month().iloc[1, 0] == pytest.approx(0.5311520760874386)
+    assert returns.to_quarter().iloc[1, 0] == pytest.approx(-0.2667730077753935)
+    assert returns.to_year().iloc[1, 0] == pytest.approx(-0.4364528678695403)
 
     with pytest.raises(ValueError):
         returns.to_period("H", "geometric")  # converting data to higher frequency
@@ -59,7 +70,7 @@ def test_corr():
     expected_output = pd.DataFrame(
         data={"name": ["SPY"], "field": "correlation", "value": [0.21224719919904408]}
     )
-    assert corr.equals(expected_output)
+    assert_result_equal(corr, expected_output)
 
     corr = returns.get_corr(meta=True)
     expected_output = pd.DataFrame(
@@ -75,7 +86,7 @@ def test_corr():
             "used": 80,
         }
     )
-    assert corr.equals(expected_output)
+    assert_result_equal(corr, expected_output)
 
     # test multiple benchmarks
     returns.add_bm(qqq)
@@ -87,7 +98,7 @@ def test_corr():
             "value": [0.21224719919904408, 0.27249109347246325],
         }
     )
-    assert corr.equals(expected_output)
+    assert_result_equal(corr, expected_output)
 
 
 def test_total_return():
@@ -103,7 +114,7 @@ def test_total_return():
             "value": [-0.35300922502128473],
         }
     )
-    assert total_return.equals(expected_output)
+    assert_result_equal(total_return, expected_output)
 
     # with single benchmark
     returns.add_bm(spy)
@@ -115,7 +126,7 @@ def test_total_return():
             "value": [-0.35300922502128473, 0.6935467657365115],
         }
     )
-    assert total_return.equals(expected_output)
+    assert_result_equal(total_return, expected_output)
 
     # meta=True
     total_return = returns.get_tot_ret(meta=True)
@@ -129,7 +140,7 @@ def test_total_return():
             "end": datetime.datetime.strptime("2020-06-26", "%Y-%m-%d"),
         }
     )
-    assert total_return.equals(expected_output)
+    assert_result_equal(total_return, expected_output)
 
     # has benchmark, but include_bm=False
     total_return = returns.get_tot_ret(include_bm=False)
@@ -140,7 +151,7 @@ def test_total_return():
             "value": [-0.35300922502128473],
         }
     )
-    assert total_return.equals(expected_output)
+    assert_result_equal(total_return, expected_output)
 
     # test multiple benchmarks
     returns.add_bm(qqq)
@@ -152,7 +163,7 @@ def test_total_return():
             "value": [-0.35300922502128473, 0.6935467657365115, 1.894217403555647],
         }
     )
-    assert total_return.equals(expected_output)
+    assert_result_equal(total_return, expected_output)
 
 
 def test_annualized_return():
@@ -168,30 +179,30 @@ def test_annualized_return():
             "value": [-0.06350385733729014],
         }
     )
-    assert ann_return.equals(expected_output)
+    assert_result_equal(ann_return, expected_output)
 
     ann_return = returns.get_ann_ret(method="arithmetic", meta=True)
     expected_output = pd.DataFrame(
         data={
             "name": ["TWTR"],
             "field": "annualized return",
-            "value": [0.0855005949876238],
+            "value": [0.08550059498762376],
             "method": "arithmetic",
             "start": datetime.datetime.strptime("2013-11-07", "%Y-%m-%d"),
             "end": datetime.datetime.strptime("2020-06-26", "%Y-%m-%d"),
         }
     )
-    assert ann_return.equals(expected_output)
+    assert_result_equal(ann_return, expected_output)
 
     ann_return = returns.get_ann_ret(method="continuous")
     expected_output = pd.DataFrame(
         data={
             "name": ["TWTR"],
             "field": "annualized return",
-            "value": [0.0855005949876238],
+            "value": [0.08550059498762377],
         }
     )
-    assert ann_return.equals(expected_output)
+    assert_result_equal(ann_return, expected_output)
 
     # with single benchmark
     returns.add_bm(spy)
@@ -203,7 +214,7 @@ def test_annualized_return():
             "value": [-0.06350385733729014, 0.08261818990205616],
         }
     )
-    assert ann_return.equals(expected_output)
+    assert_result_equal(ann_return, expected_output)
 
     # meta=True
     ann_return = returns.get_ann_ret(meta=True)
@@ -217,7 +228,7 @@ def test_annualized_return():
             "end": datetime.datetime.strptime("2020-06-26", "%Y-%m-%d"),
         }
     )
-    assert ann_return.equals(expected_output)
+    assert_result_equal(ann_return, expected_output)
 
     # has benchmark, but include_bm=False
     ann_return = returns.get_ann_ret(include_bm=False)
@@ -228,7 +239,7 @@ def test_annualized_return():
             "value": [-0.06350385733729014],
         }
     )
-    assert ann_return.equals(expected_output)
+    assert_result_equal(ann_return, expected_output)
 
 
 def test_annualized_volatility():
@@ -244,7 +255,7 @@ def test_annualized_volatility():
             "value": [0.5199859200287252],
         }
     )
-    assert ann_vol.equals(expected_output)
+    assert_result_equal(ann_vol, expected_output)
 
     # daily volatility
     ann_vol = returns.get_ann_vol(freq="D", meta=True)
@@ -259,7 +270,7 @@ def test_annualized_volatility():
             "end": datetime.datetime.strptime("2020-06-26", "%Y-%m-%d"),
         }
     )
-    assert ann_vol.equals(expected_output)
+    assert_result_equal(ann_vol, expected_output)
 
     # population standard deviation
     ann_vol = returns.get_ann_vol(method="population", meta=True)
@@ -274,7 +285,7 @@ def test_annualized_volatility():
             "end": datetime.datetime.strptime("2020-06-26", "%Y-%m-%d"),
         }
     )
-    assert ann_vol.equals(expected_output)
+    assert_result_equal(ann_vol, expected_output)
 
     # with single benchmark
     returns.add_bm(spy)
@@ -286,7 +297,7 @@ def test_annualized_volatility():
             "value": [0.5199859200287252, 0.13606427329407125],
         }
     )
-    assert ann_vol.equals(expected_output)
+    assert_result_equal(ann_vol, expected_output)
 
     # daily volatility
     ann_vol = returns.get_ann_vol(freq="D", meta=True)
@@ -301,7 +312,7 @@ def test_annualized_volatility():
             "end": datetime.datetime.strptime("2020-06-26", "%Y-%m-%d"),
         }
     )
-    assert ann_vol.equals(expected_output)
+    assert_result_equal(ann_vol, expected_output)
 
     # has benchmark, but include_bm=False
     ann_vol = returns.get_ann_vol(include_bm=False)
@@ -312,7 +323,7 @@ def test_annualized_volatility():
             "value": [0.5199859200287252],
         }
     )
-    assert ann_vol.equals(expected_output)
+    assert_result_equal(ann_vol, expected_output)
 
 
 def test_sharpe_ratio():
@@ -324,7 +335,7 @@ def test_sharpe_ratio():
     expected_output = pd.DataFrame(
         data={"name": ["SPY"], "field": "sharpe ratio", "value": [0.5319128667616774]}
     )
-    assert sharpe_ratio.equals(expected_output)
+    assert_result_equal(sharpe_ratio, expected_output)
 
     # daily
     sharpe_ratio = returns.get_sharpe(freq="D", meta=True)
@@ -339,7 +350,7 @@ def test_sharpe_ratio():
             "end": datetime.datetime.strptime("2020-06-26", "%Y-%m-%d"),
         }
     )
-    assert sharpe_ratio.equals(expected_output)
+    assert_result_equal(sharpe_ratio, expected_output)
 
     # use libor for risk free rate
     returns.add_rf(libor1m, "libor")
@@ -355,7 +366,7 @@ def test_sharpe_ratio():
             "end": datetime.datetime.strptime("2020-06-19", "%Y-%m-%d"),
         }
     )
-    assert sharpe_ratio.equals(expected_output)
+    assert_result_equal(sharpe_ratio, expected_output)
 
     # with benchmark
     returns.add_bm(qqq)
@@ -371,7 +382,7 @@ def test_sharpe_ratio():
             "end": datetime.datetime.strptime("2020-06-26", "%Y-%m-%d"),
         }
     )
-    assert sharpe_ratio.equals(expected_output)
+    assert_result_equal(sharpe_ratio, expected_output)
 
     # wrong key
     with pytest.raises(ValueError):
@@ -390,22 +401,22 @@ def test_rolling_tot_ret():
     roll_tot_ret = returns.get_rolling_tot_ret()
     roll_twtr = roll_tot_ret["TWTR"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == -0.6002237318946346
+    assert roll_twtr["TWTR"][0] == pytest.approx(-0.6002237318946346)
 
     # Daily, rolling 252 days
     roll_tot_ret = returns.get_rolling_tot_ret(window=252, freq="D")
     roll_twtr = roll_tot_ret["TWTR"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2014-11-06", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == -0.09043080731969699
+    assert roll_twtr["TWTR"][0] == pytest.approx(-0.09043080731969699)
 
     returns.add_bm(spy)
     roll_tot_ret = returns.get_rolling_tot_ret()
     roll_twtr = roll_tot_ret["TWTR"]
     roll_spy = roll_tot_ret["SPY"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == -0.6002237318946346
+    assert roll_twtr["TWTR"][0] == pytest.approx(-0.6002237318946346)
     assert roll_spy.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_spy["SPY"][0] == 0.1996927920869329
+    assert roll_spy["SPY"][0] == pytest.approx(0.1996927920869329)
 
 
 def test_rolling_ann_vol():
@@ -416,22 +427,22 @@ def test_rolling_ann_vol():
     roll_ann_vol = returns.get_rolling_ann_vol()
     roll_twtr = roll_ann_vol["TWTR"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == 0.5725024779205684
+    assert roll_twtr["TWTR"][0] == pytest.approx(0.5725024779205684)
 
     # Daily, rolling 252 days
     roll_ann_vol = returns.get_rolling_ann_vol(window=252, freq="D")
     roll_twtr = roll_ann_vol["TWTR"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2014-11-06", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == 0.6376491116934246
+    assert roll_twtr["TWTR"][0] == pytest.approx(0.6376491116934246)
 
     returns.add_bm(spy)
     roll_ann_vol = returns.get_rolling_ann_vol()
     roll_twtr = roll_ann_vol["TWTR"]
     roll_spy = roll_ann_vol["SPY"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == 0.5725024779205684
+    assert roll_twtr["TWTR"][0] == pytest.approx(0.5725024779205684)
     assert roll_spy.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_spy["SPY"][0] == 0.10810183559733508
+    assert roll_spy["SPY"][0] == pytest.approx(0.10810183559733508)
 
 
 def test_index_series():
@@ -444,7 +455,7 @@ def test_index_series():
     assert index_twitter.index[-1] == datetime.datetime.strptime(
         "2020-06-30", "%Y-%m-%d"
     )
-    assert index_twitter["TWTR"][-1] == -0.35300922502128296
+    assert index_twitter["TWTR"][-1] == pytest.approx(-0.35300922502128296)
 
     # Daily
     index_series = returns.get_index_series(freq="D")
@@ -452,7 +463,7 @@ def test_index_series():
     assert index_twitter.index[-1] == datetime.datetime.strptime(
         "2020-06-26", "%Y-%m-%d"
     )
-    assert index_twitter["TWTR"][-1] == -0.35300922502128473
+    assert index_twitter["TWTR"][-1] == pytest.approx(-0.35300922502128473)
 
     returns.add_bm(spy)
     index_series = returns.get_index_series()
@@ -462,8 +473,17 @@ def test_index_series():
         "2020-06-30", "%Y-%m-%d"
     )
     assert index_spy.index[-1] == datetime.datetime.strptime("2020-06-30", "%Y-%m-%d")
-    assert index_twitter["TWTR"][-1] == -0.35300922502128296
-    assert index_spy["SPY"][-1] == 0.6935467657365093
+    assert index_twitter["TWTR"][-1] == pytest.approx(-0.35300922502128296)
+    assert index_spy["SPY"][-1] == pytest.approx(0.6935467657365093)
+
+    # one wide frame, keeping every 12th month
+    index_series = returns.get_index_series(wide=True, step=12)
+    assert index_series.columns.tolist() == ["TWTR", "SPY"]
+    assert len(index_series.index) == 8
+    assert index_series.index[-1] == datetime.datetime.strptime(
+        "2020-06-30", "%Y-%m-%d"
+    )
+    assert index_series["TWTR"][-1] == pytest.approx(-0.35300922502128296)
 
 
 def test_rolling_ann_return():
@@ -474,24 +494,461 @@ def test_rolling_ann_return():
     roll_ann_ret = returns.get_rolling_ann_ret()
     roll_twtr = roll_ann_ret["TWTR"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == -0.2633310984499173
+    assert roll_twtr["TWTR"][0] == pytest.approx(-0.263279742109755)
 
     # Daily, rolling 252 days
     roll_ann_ret = returns.get_rolling_ann_ret(window=252, freq="D")
     roll_twtr = roll_ann_ret["TWTR"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2014-11-06", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == -0.09048985526180642
+    assert roll_twtr["TWTR"][0] == pytest.approx(-0.09048985526180642)
 
     returns.add_bm(spy)
     roll_ann_ret = returns.get_rolling_ann_ret()
     roll_twtr = roll_ann_ret["TWTR"]
     roll_spy = roll_ann_ret["SPY"]
     assert roll_twtr.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_twtr["TWTR"][0] == -0.2633310984499173
+    assert roll_twtr["TWTR"][0] == pytest.approx(-0.263279742109755)
     assert roll_spy.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
-    assert roll_spy["SPY"][0] == 0.06256787890936222
+    assert roll_spy["SPY"][0] == pytest.approx(0.06255316969162661)
+
+
+@pytest.mark.parametrize("freq", ["M", "Q", "W-FRI", "B"])
+def test_rolling_ann_return_exact(freq):
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    window = 6
+
+    roll_twtr = returns.get_rolling_ann_ret(window=window, freq=freq)["TWTR"]
+    ret = returns.to_period(freq, "geometric")
+
+    # each window is annualized over the days its periods cover
+    for i in [0, 10, len(roll_twtr.index) - 1]:
+        end = roll_twtr.index[i]
+        data = ret.loc[:end].iloc[-window:]
+        if freq == "B":
+            start = data.index[0]
+        else:
+            previous = data.index[0] - pd.tseries.frequencies.to_offset(freq)
+            start = previous + pd.Timedelta(days=1)
+        years = calc_timedelta_in_years(start, end)
+        expected = calc_ann_ret(data, "geometric", years)
+        assert roll_twtr["TWTR"][i] == pytest.approx(expected, rel=1e-12)
+
+    # the same with a calendar of the same periods
+    if freq in ["M", "Q"]:
+        calendar = Calendar.from_freq(freq, "2013-01-01", "2021-01-01")
+        roll_calendar = returns.get_rolling_ann_ret(window=window, freq=calendar)
+        assert np.allclose(roll_calendar["TWTR"], roll_twtr, rtol=1e-12, atol=0)
+
+
+def test_moment_stats():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(spy)
+
+    ret = returns.to_period("M", "geometric")
+    aligned = copy.deepcopy(spy)
+    aligned.set_daterange(returns.start, returns.end)
+    spy_ret = aligned.to_period("M", "geometric")
+
+    skew = returns.get_skew(meta=True)
+    assert skew["name"].tolist() == ["TWTR", "SPY"]
+    assert skew["field"][0] == "skewness"
+    assert skew["value"][0] == pytest.approx(ret["TWTR"].skew(), rel=1e-12)
+    assert skew["value"][1] == pytest.approx(spy_ret["SPY"].skew(), rel=1e-12)
+    assert skew["method"][0] == "sample"
+
+    kurt = returns.get_kurtosis(freq="D", method="population", include_bm=False)
+    daily = returns.series["TWTR"]
+    expected = ((daily - daily.mean()) ** 4).mean() / daily.var(ddof=0) ** 2 - 3
+    assert kurt["field"][0] == "kurtosis"
+    assert kurt["value"][0] == pytest.approx(expected, rel=1e-10)
+
+    # moments are computed once per frequency and date range
+    assert len(returns._moments) == 2
+    returns.get_ann_vol(freq="D")
+    assert len(returns._moments) == 2
+
+
+def test_sortino_ratio():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+
+    sortino = returns.get_sortino(meta=True)
+    assert sortino["field"][0] == "sortino ratio"
+    assert sortino["risk_free"][0] == "cash_0: 0.0%"
+
+    ann_ret = returns.get_ann_ret()["value"][0]
+    ret = returns.to_period("M", "geometric")["SPY"]
+    downside = np.sqrt((np.minimum(ret, 0) ** 2).mean() * 12)
+    assert sortino["value"][0] == pytest.approx(ann_ret / downside, rel=1e-3)
+
+    # only downside volatility is penalized
+    sharpe = returns.get_sharpe()["value"][0]
+    assert sortino["value"][0] > sharpe
+
+    returns.add_rf(libor1m, "libor")
+    assert returns.get_sortino(risk_free="libor")["value"][0] < sortino["value"][0]
+
+
+def test_tail_risk():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(spy)
+
+    var = returns.get_var(meta=True)
+    assert var["name"].tolist() == ["TWTR", "SPY"]
+    assert var["field"][0] == "value at risk"
+    assert var["value"][0] == pytest.approx(returns.series["TWTR"].quantile(0.05))
+    assert var["level"][0] == 0.95
+    assert var["start"][1] == returns.start
+
+    cvar = returns.get_cvar(freq="M", level=0.9, include_bm=False)
+    assert cvar["field"][0] == "conditional value at risk"
+    monthly = returns.to_period("M", "geometric")["TWTR"]
+    assert cvar["value"][0] < monthly.quantile(0.1)
+
+    roll_var = returns.get_rolling_var(window=60)
+    assert list(roll_var.keys()) == ["TWTR", "SPY"]
+    roll_twtr = roll_var["TWTR"]
+    assert roll_twtr.index[0] == returns.series.index[59]
+    assert roll_twtr["TWTR"].iloc[-1] == pytest.approx(
+        returns.series["TWTR"].iloc[-60:].quantile(0.05)
+    )
+
+    roll_cvar = returns.get_rolling_cvar(window=12, freq="M", include_bm=False)
+    assert (roll_cvar["TWTR"]["TWTR"] <= roll_twtr["TWTR"].max()).all()
+
+
+def test_from_portfolio():
+
+    qqq = ReturnSeries.read_csv("tests/unit/data/qqq_returns.csv")
+
+    portfolio = ReturnSeries.from_portfolio(
+        [spy, qqq], {"SPY": 0.6, "QQQ": 0.4}, rebalance="Q", name="60/40"
+    )
+
+    assert portfolio.name == "60/40"
+    assert portfolio.freq == "B"
+    assert portfolio.start == spy.start
+
+    # works with all metrics
+    portfolio.add_bm(spy)
+    beta = portfolio.get_beta()["value"][0]
+    assert 0.6 < beta < 1.4
+    ann_vol = portfolio.get_ann_vol()["value"]
+    assert ann_vol[0] > ann_vol[1]
 
 
 def test_libor_fred():
 
     CashSeries.read_fred_libor_1m()
+
+
+def test_max_drawdown():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(spy)
+
+    max_dd = returns.get_max_dd(meta=True)
+    assert max_dd["name"].tolist() == ["TWTR", "SPY"]
+    assert max_dd["field"][0] == "max drawdown"
+    assert max_dd["value"][0] == max_dd["value"].min()
+    assert max_dd["value"][0] < -0.7
+    assert max_dd["trough"][0] > max_dd["peak"][0]
+    assert max_dd["start"][1] == returns.start
+
+    # monthly drawdown is milder, as intra-month moves are smoothed out
+    max_dd_monthly = returns.get_max_dd(freq="M", include_bm=False)
+    assert max_dd_monthly["value"][0] > max_dd["value"][0]
+
+    drawdown = returns.get_drawdown_series()
+    assert drawdown["TWTR"]["TWTR"].min() == max_dd["value"][0]
+    assert drawdown["SPY"].index[0] == returns.start
+
+
+def test_rolling_max_drawdown():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(spy)
+
+    roll_max_dd = returns.get_rolling_max_dd()
+    roll_twtr = roll_max_dd["TWTR"]
+    roll_spy = roll_max_dd["SPY"]
+    assert roll_twtr.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
+    assert roll_spy.index[0] == datetime.datetime.strptime("2016-10-31", "%Y-%m-%d")
+    assert (roll_twtr["TWTR"] <= 0).all()
+
+
+def test_bm_stats():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+
+    # no benchmark should raise ValueError
+    with pytest.raises(ValueError):
+        returns.get_beta()
+
+    returns.add_bm(spy)
+    returns.add_bm(qqq)
+
+    # reference values from the joined monthly returns
+    bm = copy.deepcopy(spy)
+    bm.set_daterange(returns.start, returns.end)
+    df = returns.to_month().join(bm.to_month(), how="inner")
+    cov = df.cov().iloc[0, 1]
+    samples_per_year = returns.get_ann_vol()["value"][0] / df["TWTR"].std()
+    samples_per_year **= 2
+
+    beta = returns.get_beta()
+    assert beta["name"].tolist() == ["SPY", "QQQ"]
+    assert beta["field"][0] == "beta"
+    assert beta["value"][0] == pytest.approx(cov / df["SPY"].var())
+
+    alpha = returns.get_alpha()
+    expected = df["TWTR"].mean() - beta["value"][0] * df["SPY"].mean()
+    assert alpha["value"][0] == pytest.approx(expected * samples_per_year)
+
+    # risk free rate lowers benchmark excess return more than series excess return
+    alpha_rf = returns.get_alpha(risk_free=0.02)
+    assert alpha_rf["value"][0] < alpha["value"][0]
+
+    tracking_error = returns.get_tracking_error(meta=True)
+    active = df["TWTR"] - df["SPY"]
+    expected = active.std() * samples_per_year ** 0.5
+    assert tracking_error["value"][0] == pytest.approx(expected)
+    assert tracking_error["used"][0] == 80
+    assert tracking_error["start"][0] == returns.start
+
+    info_ratio = returns.get_info_ratio()
+    expected = active.mean() * samples_per_year / tracking_error["value"][0]
+    assert info_ratio["value"][0] == pytest.approx(expected)
+
+    # covariance matrix is computed once for all statistics
+    assert len(returns._bm_moments) == 1
+    returns.get_beta(freq="D")
+    assert len(returns._bm_moments) == 2
+
+    # non pearson correlation is still supported
+    corr = returns.get_corr(method="spearman")
+    assert corr["name"].tolist() == ["SPY", "QQQ"]
+
+    # moments follow data appended to a benchmark
+    partial = ReturnSeries(spy.series.loc[:"2018-12-31"])
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(partial)
+    before = returns.get_beta()["value"][0]
+    returns.benchmark["SPY"].append(spy.series.loc["2019-01-01":])
+    after = returns.get_beta()["value"][0]
+    assert after != pytest.approx(before)
+    assert after == pytest.approx(beta["value"][0])
+
+
+def test_alpha_common_periods():
+
+    # benchmark covers part of the series, risk free rate is averaged over the
+    # same months as the series and benchmark are
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(ReturnSeries(spy.series.loc["2016-01-01":"2017-12-31"]))
+    returns.add_rf(libor1m, "libor")
+
+    rf = copy.deepcopy(libor1m)
+    rf.set_daterange(returns.start, returns.end)
+    df = returns.to_month().join(
+        [
+            returns.benchmark["SPY"].to_month(),
+            rf.to_month().rename(columns={"LIBOR_1M": "rf"}),
+        ],
+        how="inner",
+    )
+    excess = df[["TWTR", "SPY"]].sub(df["rf"], axis=0)
+
+    beta = returns.get_beta()["value"][0]
+    alpha = returns.get_alpha(risk_free="libor")["value"][0]
+    samples_per_year = returns._get_bm_moments("M", "geometric")["samples_per_year"]
+
+    expected = excess["TWTR"].mean() - beta * excess["SPY"].mean()
+    assert alpha == pytest.approx(expected * samples_per_year, rel=1e-12)
+
+
+def test_rolling_bm_stats():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+
+    # no benchmark should raise ValueError
+    with pytest.raises(ValueError):
+        returns.get_rolling_corr()
+
+    returns.add_bm(spy)
+    returns.add_bm(qqq)
+
+    bm = copy.deepcopy(spy)
+    bm.set_daterange(returns.start, returns.end)
+    df = returns.to_month().join(bm.to_month(), how="inner")
+
+    roll_corr = returns.get_rolling_corr()
+    assert list(roll_corr.keys()) == ["SPY", "QQQ"]
+
+    expected = df["TWTR"].rolling(36).corr(df["SPY"]).dropna()
+    assert roll_corr["SPY"].index.equals(expected.index)
+    assert roll_corr["SPY"]["SPY"].to_numpy() == pytest.approx(expected.to_numpy())
+
+    roll_beta = returns.get_rolling_beta(window=24, wide=True)
+    assert roll_beta.columns.tolist() == ["SPY", "QQQ"]
+
+    expected = df["TWTR"].rolling(24).cov(df["SPY"]) / df["SPY"].rolling(24).var()
+    assert roll_beta["SPY"].dropna().to_numpy() == pytest.approx(
+        expected.dropna().to_numpy()
+    )
+
+
+def test_expanding_stats():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(spy)
+
+    stats = returns.get_expanding_stats(risk_free=0.02)
+    assert list(stats.keys()) == ["TWTR", "SPY"]
+    assert stats["TWTR"].columns.tolist() == [
+        "total return",
+        "annualized return",
+        "annualized volatility",
+        "sharpe ratio",
+    ]
+
+    # same as computing each statistic with the series ending on that date
+    for date in ["2015-06-30", "2019-12-31"]:
+
+        series = copy.deepcopy(returns)
+        series.set_daterange(end=date)
+        expected = [
+            series.get_tot_ret(include_bm=False)["value"][0],
+            series.get_ann_ret(include_bm=False)["value"][0],
+            series.get_ann_vol(include_bm=False)["value"][0],
+            series.get_sharpe(risk_free=0.02, include_bm=False)["value"][0],
+        ]
+        assert stats["TWTR"].loc[date].tolist() == pytest.approx(expected)
+
+    assert stats["TWTR"]["total return"][-1] == pytest.approx(
+        returns.get_tot_ret(include_bm=False)["value"][0]
+    )
+
+
+def test_trailing_table():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(spy)
+
+    table = returns.get_trailing_table(as_of="2019-12-31")
+    assert table.index.tolist() == ["TWTR", "SPY"]
+    assert table.columns.tolist() == ["1M", "3M", "YTD", "1Y", "3Y", "5Y", "10Y", "ITD"]
+
+    # same as the total return over the horizon, annualized over its years
+    series = copy.deepcopy(returns)
+    series.set_daterange(start="2015-01-01", end="2019-12-31")
+    tot_ret = series.get_tot_ret()["value"].to_numpy()
+    years = calc_timedelta_in_years(
+        pd.Timestamp("2015-01-01"), pd.Timestamp("2019-12-31")
+    )
+    ann_ret = (1 + tot_ret) ** (1 / years) - 1
+    assert table["5Y"].tolist() == pytest.approx(ann_ret.tolist())
+
+    # benchmarks are aligned with the series
+    table = returns.get_trailing_table(horizons=["ITD"])
+    assert table["ITD"].tolist() == pytest.approx(
+        returns.get_ann_ret()["value"].tolist()
+    )
+
+
+def test_shared_calendar():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    same = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(same, "Same")
+
+    # converted series on the same calendar share one index, and are not joined
+    assert returns.to_month().index is same.to_month().index
+
+    corr = returns.get_corr(method="spearman")
+    assert corr["value"][0] == pytest.approx(1)
+
+
+def test_bootstrap_ci():
+
+    returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    returns.add_bm(spy)
+
+    ci = returns.get_bootstrap_ci(risk_free=0.02, samples=200, seed=0)
+    assert ci["name"].tolist() == ["TWTR"] * 3 + ["SPY"] * 3
+    assert ci.columns.tolist() == ["name", "field", "value", "lower", "upper"]
+
+    # point estimates are the statistics of the series
+    ann_ret = returns.get_ann_ret()["value"].tolist()
+    ann_vol = returns.get_ann_vol()["value"].tolist()
+    sharpe = returns.get_sharpe(risk_free=0.02)["value"].tolist()
+    for field, expected in zip(
+        ["annualized return", "annualized volatility", "sharpe ratio"],
+        [ann_ret, ann_vol, sharpe],
+    ):
+        value = ci[ci["field"] == field]["value"].tolist()
+        assert value == pytest.approx(expected)
+
+    assert (ci["lower"] <= ci["value"]).all()
+    assert (ci["value"] <= ci["upper"]).all()
+
+    # seeded intervals are reproducible
+    again = returns.get_bootstrap_ci(risk_free=0.02, samples=200, seed=0)
+    assert again.equals(ci)
+
+    # risk free returns on dates without returns are accrued, as in get_sharpe
+    returns.add_rf(libor1m)
+    ci = returns.get_bootstrap_ci(
+        freq="D", risk_free="LIBOR_1M", include_bm=False, samples=50, seed=0
+    )
+    sharpe = returns.get_sharpe(freq="D", risk_free="LIBOR_1M", include_bm=False)
+    assert ci["value"][2] == pytest.approx(sharpe["value"][0])
+
+    # returns are resampled in the frequency of the series
+    native = returns.get_bootstrap_ci(
+        freq=None, risk_free="LIBOR_1M", include_bm=False, samples=50, seed=0
+    )
+    pd.testing.assert_frame_equal(native, ci)
+
+
+def test_intraday():
+
+    days = pd.bdate_range("2020-01-01", periods=20)
+    index = pd.DatetimeIndex(
+        [day + pd.Timedelta(minutes=570 + i) for day in days for i in range(390)]
+    )
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({"pnl": rng.normal(0, 1e-4, len(index))}, index=index)
+
+    series = ReturnSeries(df)
+    assert series.freq == "T"
+
+    # daily returns from minute bars
+    daily = series.to_period("D", "geometric")
+    assert daily.index.equals(days.rename("datetime"))
+
+    with pytest.raises(ValueError):
+        ReturnSeries(daily).to_period("H", "geometric")
+
+    # minute returns are annualized by session
+    vol = series.get_ann_vol(freq="T")["value"][0]
+    expected = df["pnl"].std() * np.sqrt(390 * 252)
+    assert vol == pytest.approx(expected)
+
+    # hourly bars only cover sessions, 7 bars from 9:30 to 16:00
+    hourly = series.to_period("H", "geometric")
+    assert len(hourly.index) == 7 * 20
+    vol = series.get_ann_vol(freq="H")["value"][0]
+    expected = hourly["pnl"].std() * np.sqrt(7 * 252)
+    assert vol == pytest.approx(expected)
+
+    # moments computed before follow the sessions_per_year option
+    set_option("sessions_per_year", 365)
+    try:
+        vol = series.get_ann_vol(freq="H")["value"][0]
+    finally:
+        set_option("sessions_per_year", 252)
+    assert vol == pytest.approx(expected * np.sqrt(365 / 252))
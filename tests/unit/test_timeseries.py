@@ -1,7 +1,10 @@
 from pyform.timeseries import TimeSeries
 
+import copy
+import pickle
 import datetime
 import pytest
+import numpy as np
 import pandas as pd
 
 
@@ -81,6 +84,24 @@ def test_init_from_csv():
     assert ts.series.iloc[0, 0] == 44.9
 
 
+def test_init_from_csv_options():
+    """Validate the read_csv clasmethod passes date format, data types
+    and columns to read
+    """
+
+    ts = TimeSeries.read_csv(
+        "tests/unit/data/twitter.csv",
+        date_format="%Y-%m-%d",
+        dtype={"close": "float32"},
+        usecols=["date", "close"],
+    )
+    assert ts.series.iloc[0, 0] == np.float32(44.9)
+    assert ts.series.dtypes.iloc[0] == np.float32
+
+    with pytest.raises(ValueError):
+        TimeSeries.read_csv("tests/unit/data/twitter.csv", date_format="%d/%m/%Y")
+
+
 def test_init_from_excel():
     """Validate the read_excel clasmethod can initiate
     timeseries objects from excel
@@ -90,6 +111,54 @@ def test_init_from_excel():
     assert ts.series.iloc[0, 0] == 86.04
 
 
+def test_read_many(tmp_path):
+    """Validate the read_many clasmethod reads files concurrently,
+    and skips files that cannot be read
+    """
+
+    paths = ["tests/unit/data/twitter.csv", "tests/unit/data/spy.csv"]
+    broken = tmp_path / "broken.csv"
+    broken.write_text("col1,col2\n1,2\n")
+
+    result = TimeSeries.read_many(paths + [str(broken)], workers=2)
+    assert list(result.keys()) == paths
+    assert result[paths[0]].series.iloc[0, 0] == 44.9
+
+    # glob patterns are expanded, and excel files are read in processes
+    result = TimeSeries.read_many("tests/unit/data/spy.*", workers=2)
+    assert sorted(result.keys()) == [
+        "tests/unit/data/spy.csv",
+        "tests/unit/data/spy.xlsx",
+    ]
+
+    # errors are reported per file as files are read
+    read = list(TimeSeries.iter_read([str(broken)] + paths, workers=1))
+    assert [path for path, _, _ in read] == [str(broken)] + paths
+    assert isinstance(read[0][2], ValueError)
+    assert read[1][1].series.iloc[0, 0] == 44.9
+
+    with pytest.raises(ValueError):
+        list(TimeSeries.iter_read(paths, executor="gpu"))
+
+
+def test_shared_index():
+    """Validate series on the same calendar share one index object
+    """
+
+    ts1 = TimeSeries.read_csv("tests/unit/data/twitter.csv")
+    ts2 = TimeSeries.read_csv("tests/unit/data/twitter.csv")
+
+    assert ts1.series.index is ts1._series.index
+    assert ts1.series.index is ts2.series.index
+
+    ts1.set_daterange(start="2015-01-01")
+    ts2.set_daterange(start="2015-01-01")
+    assert ts1.series.index is ts2.series.index
+
+    ts1.reset()
+    assert ts1.series.index is ts1._series.index
+
+
 def test_init_from_db():
     """Validate the read_db clasmethod can initiate
     timeseries objects from database query
@@ -132,3 +201,49 @@ def test_reset_daterange():
     assert ts.series.index[0] == datetime.datetime.strptime("2013-11-07", "%Y-%m-%d")
     assert ts.end == datetime.datetime.strptime("2020-06-26", "%Y-%m-%d")
     assert ts.series.index[-1] == datetime.datetime.strptime("2020-06-26", "%Y-%m-%d")
+
+
+def test_fingerprint():
+
+    ts = TimeSeries.read_csv("tests/unit/data/spy.csv")
+    same = TimeSeries.read_csv("tests/unit/data/spy.csv")
+
+    assert ts.fingerprint == same.fingerprint
+    assert ts.key == (ts.fingerprint, 0, len(ts.series.index))
+
+    # windows share the fingerprint, and differ by offsets
+    ts.set_daterange(start="2010-01-01", end="2011-01-01")
+    start = ts._series.index.searchsorted(pd.Timestamp("2010-01-01"))
+    assert ts.key == (same.fingerprint, start, start + len(ts.series.index))
+
+    # copies keep the fingerprint
+    assert copy.deepcopy(ts).key == ts.key
+    assert pickle.loads(pickle.dumps(ts)).key == ts.key
+
+
+def test_append():
+
+    full = TimeSeries.read_csv("tests/unit/data/spy.csv")
+    df = full._series
+
+    ts = TimeSeries(df.iloc[:1000])
+    ts.append(df.iloc[1000:1500])
+    ts.append(df.iloc[1500:])
+
+    # same fingerprint as the data read at once, and the range is extended
+    assert ts.fingerprint == full.fingerprint
+    assert ts.key == full.key
+    assert ts.series.equals(full.series)
+
+    # a range ending before the end of the data is kept
+    ts = TimeSeries(df.iloc[:1000])
+    ts.set_daterange(end=df.index[500])
+    ts.append(df.iloc[1000:])
+    assert ts.end == df.index[500]
+    assert ts._end == full._end
+
+    with pytest.raises(ValueError):
+        ts.append(df.iloc[-10:])
+
+    with pytest.raises(ValueError):
+        ts.append(df.iloc[-10:].rename(columns=lambda col: col + "_"))
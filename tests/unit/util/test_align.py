@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pyform.util import align
+from pyform.util.align import align_index, take
+
+left = pd.DatetimeIndex(["2020-01-01", "2020-01-02", "2020-01-03", "2020-01-06"])
+right = pd.DatetimeIndex(["2020-01-02", "2020-01-06", "2020-01-07"])
+
+
+def test_align_index_inner():
+
+    index, left_take, right_take = align_index(left, right, "inner")
+
+    assert index.equals(left.join(right, how="inner"))
+    assert left_take.tolist() == [1, 3]
+    assert right_take.tolist() == [0, 1]
+
+    # alignment is cached per pair of index objects
+    assert align_index(left, right, "inner")[0] is index
+
+    # the same index needs no alignment
+    index, left_take, right_take = align_index(left, left)
+    assert index is left
+    assert left_take.tolist() == [0, 1, 2, 3]
+
+    index, _, _ = align_index(left, right[:0], "inner")
+    assert len(index) == 0
+
+    with pytest.raises(ValueError):
+        align_index(left, right, "left")
+
+
+def test_align_index_outer():
+
+    align._align_cache.clear()
+    index, left_take, right_take = align_index(left, right, "outer")
+
+    assert index.equals(left.join(right, how="outer"))
+    assert left_take.tolist() == [0, 1, 2, 3, -1]
+    assert right_take.tolist() == [-1, 0, -1, 1, 2]
+    assert len(align._align_cache) == 1
+
+
+def test_align_index_tz():
+
+    left_tz = left.tz_localize("America/New_York")
+    right_tz = right.tz_localize("America/New_York")
+
+    for how in ["inner", "outer"]:
+        index, _, _ = align_index(left_tz, right_tz, how)
+        assert index.tz is not None
+        assert index.equals(left_tz.join(right_tz, how=how))
+
+
+def test_take():
+
+    values = np.array([0.1, 0.2, 0.3])
+    result = take(values, np.array([2, -1, 0]))
+
+    assert result[0] == 0.3
+    assert np.isnan(result[1])
+    assert take(values, np.array([-1]), 0)[0] == 0
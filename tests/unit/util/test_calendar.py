@@ -0,0 +1,130 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pyform import ReturnSeries, ReturnPanel
+from pyform.util.calendar import Calendar
+from pyform.returns.compound import ret_to_period
+
+returns = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+spy = ReturnSeries.read_csv("tests/unit/data/spy_returns.csv")
+
+
+def test_calendar():
+
+    calendar = Calendar(["2020-01-01", "2020-02-01", "2020-03-01"])
+
+    assert len(calendar) == 2
+    assert calendar.labels.tolist() == [
+        pd.Timestamp("2020-01-31"),
+        pd.Timestamp("2020-02-29"),
+    ]
+
+    index = pd.DatetimeIndex(["2020-01-01", "2020-01-31 16:00", "2020-02-01"])
+    assert calendar.bucket_ids(index).tolist() == [0, 0, 1]
+
+    # mapped once per index object
+    assert calendar.bucket_ids(index) is calendar.bucket_ids(index)
+
+    with pytest.raises(ValueError):
+        calendar.bucket_ids(pd.DatetimeIndex(["2020-03-01"]))
+
+    with pytest.raises(ValueError):
+        Calendar(["2020-02-01", "2020-01-01"])
+
+    with pytest.raises(ValueError):
+        Calendar(["2020-01-01", "2020-02-01"], labels=["2020-01-31", "2020-02-29"])
+
+
+def test_calendar_repr():
+
+    # cached results are keyed by repr, which covers labels and years too
+    edges = ["2020-01-01", "2020-02-01", "2020-03-01"]
+    calendar = Calendar(edges)
+    years = Calendar(["2020-01-01", "2021-01-01"])
+
+    assert repr(calendar) == repr(Calendar(edges))
+    assert repr(calendar) != repr(Calendar(edges, labels=edges[:2]))
+    assert repr(calendar) != repr(Calendar(edges, years=years))
+    assert repr(Calendar(edges, years=years)) != repr(
+        Calendar(edges, years=Calendar(["2019-12-29", "2021-01-03"]))
+    )
+
+
+@pytest.mark.parametrize("freq", ["W", "M", "Q", "A"])
+def test_from_freq(freq):
+
+    calendar = Calendar.from_freq(freq, returns.start, returns.end)
+    result = calendar.to_period(returns.series, "geometric")
+    expected = ret_to_period(returns.series, freq, "geometric")
+
+    assert result.index.equals(expected.index)
+    assert np.allclose(result.to_numpy(), expected.to_numpy(), rtol=0, atol=1e-15)
+
+
+def test_fiscal_calendar():
+
+    calendar = Calendar.from_freq("M", "2019-08-15", "2020-08-15", year_end="JUN")
+
+    # periods cover whole fiscal years
+    assert calendar.years.labels.tolist() == [
+        pd.Timestamp("2020-06-30"),
+        pd.Timestamp("2021-06-30"),
+    ]
+    assert calendar.edges[0] == calendar.years.edges[0]
+    assert calendar.edges[-1] >= calendar.years.edges[-1]
+
+
+def test_retail_calendar():
+
+    calendar = Calendar.from_retail("2015-01-01", "2016-12-31")
+
+    # periods of 4, 4 and 5 weeks, with the 53rd week in the last period
+    weeks = np.diff(calendar.edges) / pd.Timedelta(weeks=1)
+    years = calendar.years.labels
+    assert weeks[:3].tolist() == [4, 4, 5]
+    assert set(weeks) <= {4, 5, 6}
+    assert len(calendar) == 12 * (len(years))
+    assert (years.dayofweek == 5).all()
+    assert (np.diff(years) / pd.Timedelta(weeks=1) >= 52).all()
+
+    with pytest.raises(ValueError):
+        Calendar.from_retail("2015-01-01", "2016-12-31", pattern=(4, 4, 4))
+
+
+def test_session_calendar():
+
+    sessions = returns.series.index[::2]
+    calendar = Calendar.from_sessions(sessions)
+
+    df = returns.series.loc[: sessions[-1]]
+    result = calendar.to_period(df, "arithmetic")
+
+    assert result.index.equals(sessions.rename("datetime"))
+    assert result.iloc[0, 0] == pytest.approx(df.iloc[0:2, 0].sum())
+
+
+def test_calendar_series():
+
+    calendar = Calendar.from_freq("M", spy.start, spy.end)
+
+    # a calendar is accepted by to_period and the freq argument of get_*
+    series = ReturnSeries.read_csv("tests/unit/data/twitter_returns.csv")
+    series.add_bm(spy)
+
+    assert np.allclose(
+        series.to_period(calendar, "geometric"), series.to_period("M", "geometric")
+    )
+
+    for result, expected in [
+        (series.get_ann_vol(freq=calendar), series.get_ann_vol(freq="M")),
+        (series.get_corr(freq=calendar), series.get_corr(freq="M")),
+        (series.get_beta(freq=calendar), series.get_beta(freq="M")),
+    ]:
+        assert np.allclose(result["value"], expected["value"])
+
+    # panels keep periods without returns as NaN
+    panel = ReturnPanel.from_series([returns, spy])
+    result = panel.to_period(calendar, "geometric")
+    expected = panel.to_period("M", "geometric")
+    assert result.index.equals(expected.index)
+    assert np.allclose(result, expected, equal_nan=True)
@@ -1,6 +1,13 @@
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from pyform.util.dataframe import set_col_as_datetime_index
+from pyform.util import dataframe
+from pyform.util.dataframe import (
+    set_col_as_datetime_index,
+    detect_date_format,
+    parse_dates,
+)
 
 
 def test_set_col_as_datetime_index():
@@ -16,3 +23,65 @@ def test_set_col_as_datetime_index():
 
     assert isinstance(df.index, pd.DatetimeIndex)
     assert df.index[0] == datetime.datetime.strptime("2020-01-01", "%Y-%m-%d")
+
+
+def test_set_col_as_datetime_index_format():
+
+    df = pd.DataFrame(data={"date": ["01/02/2020", "01/03/2020"], "returns": [1, 2]})
+
+    df = set_col_as_datetime_index(df, "date", date_format="%d/%m/%Y")
+    assert df.index[1] == datetime.datetime(2020, 3, 1)
+
+
+def test_detect_date_format():
+
+    assert detect_date_format(["2020-01-31", "2020-02-29"]) == "%Y-%m-%d"
+    assert detect_date_format(["01/02/2020", "01/03/2020"]) == "%m/%d/%Y"
+
+    # a day larger than 12 rules out month first
+    assert detect_date_format(["01/02/2020", "13/02/2020"]) == "%d/%m/%Y"
+
+    assert detect_date_format(["Jan 2020"]) is None
+    assert detect_date_format([]) is None
+
+
+def test_parse_dates():
+
+    dataframe.clear_date_cache()
+
+    dates = parse_dates(["2020-01-02", None, "2020-01-02", "2020-01-03"])
+    expected = pd.DatetimeIndex(["2020-01-02", None, "2020-01-02", "2020-01-03"])
+    assert dates.equals(expected)
+
+    # each unique string is parsed once, and cached for later files
+    assert len(dataframe._date_cache["%Y-%m-%d"]) == 2
+    dates = parse_dates(np.array(["2020-01-03", "2020-01-06"], dtype=object))
+    assert dates[0] == datetime.datetime(2020, 1, 3)
+    assert len(dataframe._date_cache["%Y-%m-%d"]) == 3
+
+    # values that are not strings are converted directly
+    dates = parse_dates([datetime.datetime(2020, 1, 2)])
+    assert dates[0] == datetime.datetime(2020, 1, 2)
+
+    # formats that are not detected fall back to pandas inference
+    dates = parse_dates(["2 Jan 2020", "3 Jan 2020"])
+    assert dates[1] == datetime.datetime(2020, 1, 3)
+
+
+def test_parse_dates_threads():
+
+    dataframe.clear_date_cache()
+
+    days = pd.date_range("2000-01-01", periods=2000).strftime("%Y-%m-%d")
+    chunks = [days[i : i + 300] for i in range(0, 2000, 100)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        parsed = list(executor.map(parse_dates, chunks))
+
+    for chunk, dates in zip(chunks, parsed):
+        assert dates.equals(pd.DatetimeIndex(chunk))
+
+    # strings parsed by several threads are cached once
+    cache = dataframe._date_cache["%Y-%m-%d"]
+    assert cache.index.is_unique
+    assert len(cache) == 2000
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from pyform.util.fingerprint import (
+    new_fingerprint,
+    update_fingerprint,
+    format_fingerprint,
+    row_hashes,
+)
+
+df = pd.DataFrame(
+    {"a": np.arange(10, dtype=float), "b": list("abcdefghij")},
+    index=pd.date_range("2020-01-01", periods=10),
+)
+
+
+def test_row_hashes():
+
+    hashes = row_hashes(df)
+
+    assert hashes.dtype == np.uint64
+    assert len(np.unique(hashes)) == 10
+
+    # same rows hash the same, whatever frame they are in
+    assert np.array_equal(row_hashes(df.iloc[3:6]), hashes[3:6])
+
+
+def test_fingerprint():
+
+    state = new_fingerprint(df)
+    assert state[2] == 10
+
+    # updating in parts is the same as computing over all rows
+    parts = new_fingerprint(df.iloc[:4])
+    parts = update_fingerprint(parts, df.iloc[4:7])
+    parts = update_fingerprint(parts, df.iloc[7:])
+    assert parts == state
+
+    assert update_fingerprint(state, df.iloc[:0]) == state
+
+    # any change in values, order, dates or columns changes the fingerprint
+    changed = df.copy()
+    changed.iloc[5, 0] = 5.000001
+    assert new_fingerprint(changed) != state
+    assert new_fingerprint(df.iloc[::-1]) != state
+    assert new_fingerprint(df.shift(1, freq="D")) != state
+    assert new_fingerprint(df.rename(columns={"a": "c"})) != state
+
+    assert format_fingerprint(state) == f"{state[0]:016x}-10"
@@ -1,6 +1,14 @@
 import pytest
 import pandas as pd
-from pyform.util.freq import is_lower_freq, infer_freq
+from pyform.util.freq import (
+    is_lower_freq,
+    is_intraday,
+    infer_freq,
+    count_sessions,
+    calc_samples_per_year,
+    calc_index_samples_per_year,
+    calc_timedelta_in_years,
+)
 from pyform.util.dataframe import set_col_as_datetime_index
 
 
@@ -67,3 +75,39 @@ def test_infer_freq():
     )
     with pytest.raises(ValueError):
         infer_freq(set_col_as_datetime_index(df, "date"))
+
+
+def test_freq_compare_intraday():
+
+    assert is_lower_freq("T", "S")
+    assert is_lower_freq("H", "15min")
+    assert is_lower_freq("B", "D")
+    assert is_lower_freq("Q-JUN", "W-FRI")
+    assert not is_lower_freq("5T", "H")
+
+    assert is_intraday("5T")
+    assert is_intraday("H")
+    assert not is_intraday("D")
+    assert not is_intraday("M")
+
+
+def test_sessions():
+
+    days = pd.bdate_range("2020-01-01", periods=10)
+    index = pd.DatetimeIndex(
+        [day + pd.Timedelta(minutes=570 + i) for day in days for i in range(390)]
+    )
+
+    assert count_sessions(index) == 10
+    assert count_sessions(index[:0]) == 0
+
+    # intraday samples are annualized by session
+    assert calc_index_samples_per_year(index, index[0], index[-1]) == 390 * 252
+
+    # daily samples by calendar time, whatever the time of day
+    assert calc_index_samples_per_year(days, days[0], days[-1]) == (
+        calc_samples_per_year(10, days[0], days[-1])
+    )
+    assert calc_timedelta_in_years(index[0], index[-1]) == calc_timedelta_in_years(
+        days[0], days[-1]
+    )
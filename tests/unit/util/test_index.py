@@ -0,0 +1,35 @@
+import pandas as pd
+from pyform.util.index import intern_index, intern_frame_index
+
+
+def test_intern_index():
+
+    index = pd.date_range("2020-01-01", periods=100, freq="B", name="datetime")
+    equal = pd.DatetimeIndex(index.copy(deep=True))
+
+    assert equal is not index
+    assert intern_index(index) is index
+    assert intern_index(equal) is index
+
+    # same length and ends, but different values
+    different = index.delete(50).insert(50, index[50] + pd.Timedelta(hours=1))
+    assert intern_index(different) is different
+
+    # different name
+    renamed = index.rename("date")
+    assert intern_index(renamed) is renamed
+
+    # other indexes are not interned
+    range_index = pd.RangeIndex(10)
+    assert intern_index(range_index) is range_index
+
+
+def test_intern_frame_index():
+
+    index = pd.date_range("2019-01-01", periods=10, name="datetime")
+    df1 = pd.DataFrame({"a": range(10)}, index=index)
+    df2 = pd.DataFrame({"b": range(10)}, index=index.copy(deep=True))
+
+    intern_frame_index(df1)
+    intern_frame_index(df2)
+    assert df1.index is df2.index